@@ -1 +1 @@
-from motdplayer_applications.admin import core, included, custom
+from motdplayer_applications.admin import core, included, custom, metrics
@@ -16,6 +16,25 @@ MAX_BAN_DURATION = 315360000  # 10 years. For a permanent ban use -1
 MIN_BAN_DURATION = -1
 
 
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _get_bans_request(data):
+    after_id = data.get('afterId')
+
+    if after_id is not None:
+        if not isinstance(after_id, int):
+            return None
+
+        if not (-MAX_BAN_ID_ABS_VALUE <= after_id <= MAX_BAN_ID_ABS_VALUE):
+            return None
+
+    return {
+        'action': "get-bans",
+        'afterId': after_id,
+    }
+
+
 # =============================================================================
 # >> WEB REQUEST PROCESSORS
 # =============================================================================
@@ -24,6 +43,8 @@ ban_steamid_page = WebRequestProcessor(
     'included', 'admin_kick_ban', 'ban_steamid')
 ban_ip_address_page = WebRequestProcessor(
     'included', 'admin_kick_ban', 'ban_ip_address')
+ban_ip_range_page = WebRequestProcessor(
+    'included', 'admin_kick_ban', 'ban_ip_range')
 lift_steamid_page = WebRequestProcessor(
     'included', 'admin_kick_ban', 'lift_steamid')
 lift_ip_address_page = WebRequestProcessor(
@@ -91,6 +112,24 @@ def callback(data):
     pass
 
 
+# ban_ip_range_page
+@ban_ip_range_page.register_regular_callback
+def callback(ex_data_func):
+    return "admin/included/admin_kick_ban/ban_ip_range.html", dict()
+
+
+@ban_ip_range_page.register_ajax_callback
+@player_based_feature_page_ajax_wrap
+def callback(ex_data_func, data):
+    pass
+
+
+@ban_ip_range_page.register_ws_callback
+@player_based_feature_page_ws_wrap
+def callback(data):
+    pass
+
+
 # lift_steamid_page
 @lift_steamid_page.register_regular_callback
 def callback(ex_data_func):
@@ -128,9 +167,11 @@ def callback(ex_data_func, data):
         })
 
     if data['action'] == "get-bans":
-        return ex_data_func({
-            'action': "get-bans",
-        })
+        request = _get_bans_request(data)
+        if request is None:
+            return
+
+        return ex_data_func(request)
 
 
 @lift_steamid_page.register_ws_callback
@@ -157,9 +198,7 @@ def callback(data):
         }
 
     if data['action'] == "get-bans":
-        return {
-            'action': "get-bans",
-        }
+        return _get_bans_request(data)
 
 
 # review_steamid_page
@@ -224,6 +263,13 @@ def callback(ex_data_func, data):
             'action': "get-ban-data",
         })
 
+    if data['action'] == "get-bans":
+        request = _get_bans_request(data)
+        if request is None:
+            return
+
+        return ex_data_func(request)
+
 
 @review_steamid_page.register_ws_callback
 @review_ip_address_page.register_ws_callback
@@ -273,3 +319,6 @@ def callback(data):
         return {
             'action': "get-ban-data",
         }
+
+    if data['action'] == "get-bans":
+        return _get_bans_request(data)
@@ -0,0 +1,103 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+import re
+from time import time
+
+# Flask
+from flask import Response
+
+# Flask-MOTDPlayer
+from motdplayer import app
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Path to the JSON file the game server dumps its metrics to, see
+# [metrics] snapshot_path in the server's admin/config.ini
+SNAPSHOT_PATH_CONFIG_KEY = "ADMIN_METRICS_SNAPSHOT_PATH"
+
+METRIC_NAME_PREFIX = "spa_"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _format_name(name):
+    return METRIC_NAME_PREFIX + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _format_value(value):
+    return repr(float(value))
+
+
+def render_prometheus_text(snapshot):
+    """Render the metrics snapshot in Prometheus text exposition format.
+
+    :param dict snapshot: Snapshot as written by the game server.
+    :rtype: str
+    """
+    lines = []
+
+    name = _format_name("snapshot_age_seconds")
+    lines.append("# TYPE {} gauge".format(name))
+    lines.append("{} {}".format(
+        name, _format_value(max(0.0, time() - snapshot['time']))))
+
+    # TYPE lines have to name the samples exactly, suffix included
+    for metric_name, value in sorted(snapshot['counters'].items()):
+        name = _format_name(metric_name) + "_total"
+        lines.append("# TYPE {} counter".format(name))
+        lines.append("{} {}".format(name, _format_value(value)))
+
+    for metric_name, value in sorted(snapshot['gauges'].items()):
+        name = _format_name(metric_name)
+        lines.append("# TYPE {} gauge".format(name))
+        lines.append("{} {}".format(name, _format_value(value)))
+
+    for metric_name, histogram in sorted(snapshot['histograms'].items()):
+        name = _format_name(metric_name)
+        lines.append("# TYPE {} summary".format(name))
+
+        for percent, value in sorted(
+                histogram['percentiles'].items(),
+                key=lambda item: float(item[0])):
+
+            lines.append('{}{{quantile="{}"}} {}'.format(
+                name, float(percent) / 100, _format_value(value)))
+
+        lines.append("{}_sum {}".format(name, _format_value(histogram['sum'])))
+        lines.append("{}_count {}".format(
+            name, _format_value(histogram['count'])))
+
+    return "\n".join(lines) + "\n"
+
+
+# =============================================================================
+# >> ROUTES
+# =============================================================================
+@app.route('/metrics')
+def metrics():
+    # The game server writes the snapshot on its own schedule, so scraping
+    # never waits for (or interrupts) the game thread
+    path = app.config.get(SNAPSHOT_PATH_CONFIG_KEY)
+    if path is None:
+        return Response(
+            "{} is not configured\n".format(SNAPSHOT_PATH_CONFIG_KEY),
+            status=503, content_type="text/plain; charset=utf-8")
+
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return Response(
+            "Metrics snapshot is not available\n",
+            status=503, content_type="text/plain; charset=utf-8")
+
+    return Response(
+        render_prometheus_text(snapshot),
+        content_type=PROMETHEUS_CONTENT_TYPE)
@@ -58,6 +58,7 @@ var PLUGIN = function () {
                 val.destroyNoDelay();
             });
             banEntries = [];
+            setNextAfterId(null);
         };
         var addBan = function (uniqueid, banId, name) {
             removeBanId(banId);
@@ -77,6 +78,25 @@ var PLUGIN = function () {
             });
         };
 
+        var moreNode;
+        var setNextAfterId = function (nextAfterId) {
+            if (moreNode) {
+                moreNode.parentNode.removeChild(moreNode);
+                moreNode = undefined;
+            }
+
+            if (nextAfterId === null || nextAfterId === undefined)
+                return;
+
+            moreNode = tableNode.appendChild(document.createElement('div'));
+            moreNode.classList.add('ban-table-line');
+            moreNode.classList.add('ban-table-more');
+            moreNode.appendChild(document.createTextNode("Load more bans..."));
+            moreNode.addEventListener('click', function (e) {
+                requestBans(nextAfterId);
+            });
+        };
+
         var mode = 'unknown';
         this.tryWS = function (wsSuccessCallback, wsMessageCallback, wsCloseCallback, wsErrorCallback) {
             MOTDPlayer.openWSConnection(function () {
@@ -90,6 +110,7 @@ var PLUGIN = function () {
                         data['bans'].forEach(function (val, i, arr) {
                             addBan(val['uniqueid'], val['banId'], val['name']);
                         });
+                        setNextAfterId(data['nextAfterId']);
                         break;
                     case 'remove-ban-id':
                         removeBanId(data['banId']);
@@ -111,16 +132,19 @@ var PLUGIN = function () {
             });
         };
 
-        var requestBans = function () {
+        var requestBans = function (afterId) {
             switch (mode) {
                 case 'ajax':
                     MOTDPlayer.post({
                         action: 'get-bans',
+                        afterId: afterId,
                     }, function (data) {
-                        clearBans();
+                        if (afterId === undefined)
+                            clearBans();
                         data['bans'].forEach(function (val, i, arr) {
                             addBan(val['uniqueid'], val['banId'], val['name']);
                         });
+                        setNextAfterId(data['nextAfterId']);
                     }, function (err) {
                         // TODO: Display error
                     });
@@ -129,6 +153,7 @@ var PLUGIN = function () {
                 case 'ws':
                     MOTDPlayer.sendWSData({
                         action: 'get-bans',
+                        afterId: afterId,
                     });
                     break;
             }
@@ -61,6 +61,7 @@ var PLUGIN = function () {
                 val.destroyNoDelay();
             });
             banEntries = [];
+            setNextAfterId(null);
         };
         var addBan = function (uniqueid, banId, name) {
             removeBanId(banId);
@@ -98,6 +99,25 @@ var PLUGIN = function () {
         };
         stockBanReasons = [];
 
+        var moreNode;
+        var setNextAfterId = function (nextAfterId) {
+            if (moreNode) {
+                moreNode.parentNode.removeChild(moreNode);
+                moreNode = undefined;
+            }
+
+            if (nextAfterId === null || nextAfterId === undefined)
+                return;
+
+            moreNode = banTableNode.appendChild(document.createElement('div'));
+            moreNode.classList.add('ban-table-line');
+            moreNode.classList.add('ban-table-more');
+            moreNode.appendChild(document.createTextNode("Load more bans..."));
+            moreNode.addEventListener('click', function (e) {
+                requestBans(nextAfterId);
+            });
+        };
+
         var mode = 'unknown';
         this.tryWS = function (wsSuccessCallback, wsMessageCallback, wsCloseCallback, wsErrorCallback) {
             MOTDPlayer.openWSConnection(function () {
@@ -117,6 +137,13 @@ var PLUGIN = function () {
                         data['durations'].forEach(function (val, i, arr) {
                             stockBanDurations.push(new StockBanDuration(val['value'], val['title']));
                         });
+                        setNextAfterId(data['nextAfterId']);
+                        break;
+                    case 'bans':
+                        data['bans'].forEach(function (val, i, arr) {
+                            addBan(val['uniqueid'], val['banId'], val['name']);
+                        });
+                        setNextAfterId(data['nextAfterId']);
                         break;
                     case 'remove-ban-id':
                         removeBanId(data['banId']);
@@ -156,6 +183,7 @@ var PLUGIN = function () {
                         data['durations'].forEach(function (val, i, arr) {
                             stockBanDurations.push(new StockBanDuration(val['value'], val['title']));
                         });
+                        setNextAfterId(data['nextAfterId']);
                     }, function (err) {
                         // TODO: Display error
                     });
@@ -169,6 +197,31 @@ var PLUGIN = function () {
             }
         };
 
+        var requestBans = function (afterId) {
+            switch (mode) {
+                case 'ajax':
+                    MOTDPlayer.post({
+                        action: 'get-bans',
+                        afterId: afterId,
+                    }, function (data) {
+                        data['bans'].forEach(function (val, i, arr) {
+                            addBan(val['uniqueid'], val['banId'], val['name']);
+                        });
+                        setNextAfterId(data['nextAfterId']);
+                    }, function (err) {
+                        // TODO: Display error
+                    });
+                    break;
+
+                case 'ws':
+                    MOTDPlayer.sendWSData({
+                        action: 'get-bans',
+                        afterId: afterId,
+                    });
+                    break;
+            }
+        };
+
         var execute = function (banId, reason, duration) {
             switch (mode) {
                 case 'ajax':
@@ -10,21 +10,24 @@ from commands.typed import TypedClientCommand, TypedSayCommand
 from .core import models
 from .core.clients import clients
 from .core.events.storage import admin_resource_list
+from .core.executor import executor
 from .core.helpers import chat_message
 from .core.listeners import (on_spa_loaded_listener_manager,
                              on_spa_unloaded_listener_manager)
+from .core.migrations import migration_manager
 from .core.frontends.menus import main_menu
 from .core.frontends.motd import MainPage
-from .core.orm import Base, engine
+from .core.orm import Base, database_writer, engine
 from .core.plugins.command import admin_command_manager
 from .core.strings import strings_common
 from .info import info
 
 
 # =============================================================================
-# >> DATABASE CREATION
+# >> DATABASE CREATION & MIGRATION
 # =============================================================================
 Base.metadata.create_all(engine)
+migration_manager.upgrade(engine)
 
 
 # =============================================================================
@@ -38,6 +41,8 @@ def load():
 
 def unload():
     admin_command_manager.unload_all_plugins()
+    executor.stop()
+    database_writer.stop()
     on_spa_unloaded_listener_manager.notify()
     chat_message(strings_common['unload'])
 
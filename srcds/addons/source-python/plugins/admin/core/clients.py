@@ -3,12 +3,19 @@
 # =============================================================================
 # Source.Python
 from auth.manager import auth_manager
+from engines.server import global_vars, server
+from listeners import (
+    OnClientActive, OnClientConnect, OnClientDisconnect,
+    OnNetworkidValidated)
 from listeners.tick import Delay
 from players.dictionary import PlayerDictionary
 from players.entity import Player
+from players.helpers import index_from_edict
 
 # Source.Python Admin
-from .helpers import chat_message
+from .helpers import chat_message, extract_ip_address
+from .profiler import profiled
+from .steamid import get_steamid64
 
 
 # =============================================================================
@@ -85,3 +92,190 @@ class Client(BaseClient):
         return self.player.steamid
 
 clients = PlayerDictionary(Client)
+
+
+class _ConnectedClient:
+    __slots__ = ('index', 'steamid64', 'userid', 'ip_address')
+
+    def __init__(self, index):
+        self.index = index
+        self.steamid64 = None
+        self.userid = None
+        self.ip_address = None
+
+
+class _ConnectedClientRegistry:
+    """Index connected clients by their SteamID64, userid and IP address.
+
+    Clients are added on connect, get their SteamID once it's validated and
+    are removed on disconnect. Clients without a valid SteamID yet are kept
+    in a small pending set that is only checked until they get one.
+    """
+    def __init__(self):
+        self._clients = {}
+        self._pending_indexes = set()
+
+        self._by_steamid64 = {}
+        self._by_userid = {}
+        self._by_ip_address = {}
+
+    def __len__(self):
+        return len(self._clients)
+
+    def __contains__(self, index):
+        return index in self._clients
+
+    def on_client_connect(self, index, ip_address=None):
+        self.on_client_disconnect(index)
+
+        connected_client = _ConnectedClient(index)
+        connected_client.userid = server.get_client(index - 1).userid
+        connected_client.ip_address = ip_address
+
+        self._clients[index] = connected_client
+        self._by_userid[connected_client.userid] = index
+
+        if ip_address is not None:
+            self._by_ip_address.setdefault(ip_address, set()).add(index)
+
+        self._pending_indexes.add(index)
+
+    def on_client_active(self, index):
+        player = Player(index)
+
+        if index not in self._clients:
+            self.on_client_connect(index, extract_ip_address(player.address))
+
+        if player.is_fake_client() or player.is_hltv():
+            self._pending_indexes.discard(index)
+            return
+
+        self._resolve(index)
+
+    def on_client_disconnect(self, index):
+        connected_client = self._clients.pop(index, None)
+        if connected_client is None:
+            return
+
+        self._pending_indexes.discard(index)
+
+        if self._by_steamid64.get(connected_client.steamid64) == index:
+            del self._by_steamid64[connected_client.steamid64]
+
+        if self._by_userid.get(connected_client.userid) == index:
+            del self._by_userid[connected_client.userid]
+
+        indexes = self._by_ip_address.get(connected_client.ip_address)
+        if indexes is not None:
+            indexes.discard(index)
+            if not indexes:
+                del self._by_ip_address[connected_client.ip_address]
+
+    def resolve_pending(self):
+        """Look up SteamIDs of the clients that didn't have a valid one."""
+        for index in tuple(self._pending_indexes):
+            self._resolve(index)
+
+    def _resolve(self, index):
+        try:
+            steamid64 = get_steamid64(server.get_client(index - 1).steamid)
+        except ValueError:
+            return
+
+        self._pending_indexes.discard(index)
+        self._clients[index].steamid64 = steamid64
+        self._by_steamid64[steamid64] = index
+
+    def get_index_by_steamid(self, steamid):
+        """Return the index of the client with the given SteamID.
+
+        :param steamid: SteamID in any form get_steamid64 understands.
+        :return: Client index or None if no such client is connected.
+        :rtype: int
+        """
+        try:
+            steamid64 = get_steamid64(steamid)
+        except ValueError:
+            return None
+
+        # The SteamID might have been validated before our listener was
+        # called, e.g. if another OnNetworkidValidated listener is asking
+        if steamid64 not in self._by_steamid64 and self._pending_indexes:
+            self.resolve_pending()
+
+        return self._by_steamid64.get(steamid64)
+
+    def get_index_by_userid(self, userid):
+        return self._by_userid.get(userid)
+
+    def get_indexes_by_ip_address(self, ip_address):
+        """Return the indexes of all clients connected from the given IP
+        address.
+
+        :rtype: tuple
+        """
+        return tuple(self._by_ip_address.get(ip_address, ()))
+
+    def get_client_by_steamid(self, steamid):
+        """Return the engine client (IClient) with the given SteamID or
+        None."""
+        index = self.get_index_by_steamid(steamid)
+        if index is None:
+            return None
+
+        return server.get_client(index - 1)
+
+    def refresh(self):
+        """Rebuild the registry from the clients that are connected now."""
+        for index in tuple(self._clients):
+            self.on_client_disconnect(index)
+
+        for x in range(global_vars.max_clients):
+            client = server.get_client(x)
+            if not client.is_connected():
+                continue
+
+            if client.is_active():
+                self.on_client_active(x + 1)
+            else:
+                self.on_client_connect(x + 1)
+                self._resolve(x + 1)
+
+# The singleton object of the _ConnectedClientRegistry class.
+connected_clients = _ConnectedClientRegistry()
+connected_clients.refresh()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnClientConnect
+@profiled
+def listener_on_client_connect(
+        allow_connect_ptr, edict, name, address, reject_msg_ptr,
+        max_reject_len):
+
+    # Listeners of plugins loaded before us might have rejected the client
+    if not allow_connect_ptr.get_bool():
+        return
+
+    connected_clients.on_client_connect(
+        index_from_edict(edict), extract_ip_address(address))
+
+
+@OnNetworkidValidated
+@profiled
+def listener_on_networkid_validated(name, steamid):
+    connected_clients.resolve_pending()
+
+
+@OnClientActive
+@profiled
+def listener_on_client_active(index):
+    connected_clients.on_client_active(index)
+
+
+@OnClientDisconnect
+@profiled
+def listener_on_client_disconnect(index):
+    connected_clients.on_client_disconnect(index)
@@ -0,0 +1,173 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from collections import deque
+from concurrent.futures import Future
+from queue import Queue
+from threading import Lock
+from time import perf_counter
+from traceback import format_exc
+
+# Source.Python
+from listeners import OnTick
+from listeners.tick import GameThread
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .metrics import metrics_registry
+from .profiler import profiled
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_executor_logger = admin_core_logger.executor
+
+# Number of worker threads that run blocking tasks (e.g. database reads)
+WORKERS_NUMBER = config.getint('executor', 'workers', fallback=2)
+
+# How much time (in seconds) completion callbacks may take every tick
+TICK_BUDGET = config.getfloat(
+    'executor', 'tick_budget_ms', fallback=2.0) / 1000
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _Executor:
+    """Run blocking tasks on a fixed pool of worker threads and deliver their
+    results back to the game thread.
+
+    Completion callbacks are processed every tick until the tick budget is
+    spent, the rest of them is left for the following ticks.
+    """
+    def __init__(self, workers_number, tick_budget):
+        self.workers_number = workers_number
+        self.tick_budget = tick_budget
+
+        self._tasks = Queue()
+        self._completions = deque()
+        self._threads = []
+        self._lock = Lock()
+
+    def submit(self, target, args=(), kwargs=None, callback=None):
+        """Run the target in one of the worker threads.
+
+        :param target: Callable to run.
+        :param tuple args: Positional arguments to pass to the target.
+        :param dict kwargs: Keyword arguments to pass to the target.
+        :param callback: Callable that will be called in the game thread with
+        the resulting future as its only argument.
+        :return: Future that receives the target's return value (or the
+        exception it has raised).
+        :rtype: concurrent.futures.Future
+        """
+        future = Future()
+
+        if callback is not None:
+            self.add_done_callback(future, callback)
+
+        self._start()
+        self._tasks.put((target, args, kwargs or {}, future))
+
+        return future
+
+    def add_done_callback(self, future, callback):
+        """Call the callback in the game thread once the future is done.
+
+        :param concurrent.futures.Future future: Future to wait for. It
+        doesn't have to be created by this executor.
+        :param callback: Callable that will be called with the future as its
+        only argument.
+        """
+        future.add_done_callback(
+            lambda future_: self.sync_execution(callback, (future_, )))
+
+    def sync_execution(self, callback, args=(), kwargs=None):
+        """Call the callback in the game thread. Safe to call from any thread.
+        """
+        self._completions.append((callback, args, kwargs or {}))
+
+    def process_completions(self):
+        """Call pending completion callbacks until the tick budget is spent.
+        """
+        if not self._completions:
+            return
+
+        deadline = perf_counter() + self.tick_budget
+        while self._completions:
+            callback, args, kwargs = self._completions.popleft()
+
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                admin_executor_logger.log_message(
+                    "Completion callback {} has failed:\n{}".format(
+                        callback, format_exc()))
+
+            if perf_counter() >= deadline:
+                break
+
+    def stop(self):
+        """Let the workers finish the tasks that are already queued, then
+        stop them."""
+        with self._lock:
+            for thread in self._threads:
+                self._tasks.put(None)
+
+            for thread in self._threads:
+                thread.join()
+
+            self._threads.clear()
+
+    @property
+    def queue_size(self):
+        return self._tasks.qsize()
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+
+            for i in range(self.workers_number):
+                thread = GameThread(target=self._work)
+                thread.daemon = True
+                thread.start()
+
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+
+            target, args, kwargs, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = target(*args, **kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+# The singleton object of the _Executor class.
+executor = _Executor(WORKERS_NUMBER, TICK_BUDGET)
+
+metrics_registry.gauge(
+    "executor.queue_size", lambda: executor.queue_size)
+metrics_registry.gauge(
+    "executor.completions_size", lambda: len(executor._completions))
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+@profiled
+def listener_on_tick():
+    executor.process_completions()
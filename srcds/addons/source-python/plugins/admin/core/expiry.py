@@ -0,0 +1,164 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import time
+from traceback import format_exc
+
+# Source.Python
+from listeners.tick import Delay
+
+# Source.Python Admin
+from . import admin_core_logger
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_expiry_logger = admin_core_logger.expiry
+
+# Expiration timestamps are stored in whole seconds and are considered
+# passed only when the current time is strictly greater than them
+EXPIRY_MARGIN = 0.1
+
+# The heap is rebuilt without the cancelled entries once they make up more
+# than this fraction of it (and there's at least COMPACT_MIN_SIZE entries)
+COMPACT_RATIO = 0.5
+COMPACT_MIN_SIZE = 64
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _ExpiryEntry:
+    """Represent a single scheduled expiration."""
+    __slots__ = ('expires_at', 'callback', 'args', 'cancelled', 'scheduler')
+
+    def __init__(self, expires_at, callback, args, scheduler):
+        self.expires_at = expires_at
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.scheduler = scheduler
+
+    def cancel(self):
+        """Make sure the callback won't be called."""
+        if self.cancelled:
+            return
+
+        self.cancelled = True
+        self.scheduler._on_entry_cancelled()
+
+
+class _ExpiryScheduler:
+    """Call expiration callbacks when their timestamps pass.
+
+    Entries are kept in a min-heap, and a single Delay is pending for the
+    earliest of them. Cancelled entries stay in the heap and are skipped
+    once they reach its top, unless there's so many of them that the heap
+    gets compacted.
+    """
+    def __init__(self):
+        self._heap = []
+        self._cancelled_number = 0
+        self._counter = count()
+        self._delay = None
+        self._delay_expires_at = None
+
+    def schedule(self, expires_at, callback, args=()):
+        """Call the callback once the given timestamp has passed.
+
+        :param int expires_at: Timestamp (in seconds since the epoch).
+        :param callback: Callable to call. It's called exactly once unless
+        the entry is cancelled.
+        :param tuple args: Arguments to pass to the callback.
+        :return: Entry that can be cancelled.
+        :rtype: _ExpiryEntry
+        """
+        entry = _ExpiryEntry(expires_at, callback, args, self)
+        heappush(self._heap, (expires_at, next(self._counter), entry))
+
+        self._reschedule()
+        return entry
+
+    def cancel(self, entry):
+        """Cancel the given entry."""
+        entry.cancel()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _on_entry_cancelled(self):
+        self._cancelled_number += 1
+
+        heap_size = len(self._heap)
+        if (
+                heap_size >= COMPACT_MIN_SIZE and
+                self._cancelled_number > heap_size * COMPACT_RATIO):
+
+            self._compact()
+
+    def _compact(self):
+        self._heap = [item for item in self._heap if not item[2].cancelled]
+        heapify(self._heap)
+
+        self._cancelled_number = 0
+
+    def _reschedule(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heappop(self._heap)
+            self._cancelled_number -= 1
+
+        if not self._heap:
+            self._cancel_delay()
+            return
+
+        expires_at = self._heap[0][0]
+        if (
+                self._delay is not None and
+                self._delay.running and
+                self._delay_expires_at <= expires_at):
+
+            return
+
+        self._cancel_delay()
+
+        self._delay = Delay(
+            max(0, expires_at - time()) + EXPIRY_MARGIN, self._expire)
+
+        self._delay_expires_at = expires_at
+
+    def _cancel_delay(self):
+        if self._delay is not None and self._delay.running:
+            self._delay.cancel()
+
+        self._delay = None
+        self._delay_expires_at = None
+
+    def _expire(self):
+        self._delay = None
+        self._delay_expires_at = None
+
+        current_time = time()
+        while self._heap and self._heap[0][0] < current_time:
+            entry = heappop(self._heap)[2]
+            if entry.cancelled:
+                self._cancelled_number -= 1
+                continue
+
+            # The entry has already left the heap, so it's not counted
+            entry.cancelled = True
+
+            try:
+                entry.callback(*entry.args)
+            except Exception:
+                admin_expiry_logger.log_message(
+                    "Expiration callback {} has failed:\n{}".format(
+                        entry.callback, format_exc()))
+
+        self._reschedule()
+
+# The singleton object of the _ExpiryScheduler class.
+expiry_scheduler = _ExpiryScheduler()
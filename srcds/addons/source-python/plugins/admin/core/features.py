@@ -1,7 +1,44 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from functools import wraps
+from time import perf_counter
+
+# Source.Python Admin
 from .clients import clients
+from .config import config
+from .metrics import metrics_registry
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Count calls and measure latency of execute/execute_many/filter methods of
+# all features
+FEATURE_METRICS_ENABLED = config.getboolean(
+    'metrics', 'features', fallback=False)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _measure_feature_method(method, flag, method_name):
+    name = "feature.{}.{}".format(flag, method_name)
+    counter = metrics_registry.counter(name + ".calls")
+    histogram = metrics_registry.histogram(name + ".seconds")
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        started_at = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            histogram.observe(perf_counter() - started_at)
+            counter.increment()
+
+    wrapper.measured = True
+    return wrapper
 
 
 # =============================================================================
@@ -23,6 +60,22 @@ class FeatureMeta(type):
             raise ValueError("Class '{}' has its 'flag' "
                              "attribute set to None".format(cls))
 
+        if not FEATURE_METRICS_ENABLED:
+            return
+
+        for method_name in ('execute', 'execute_many', 'filter'):
+            method = getattr(cls, method_name, None)
+            if method is None:
+                continue
+
+            # Methods inherited from another feature are measured under its
+            # flag, measure the original method under our own flag instead
+            if getattr(method, 'measured', False):
+                method = method.__wrapped__
+
+            setattr(cls, method_name, _measure_feature_method(
+                method, cls.flag, method_name))
+
 
 class BaseFeature(metaclass=FeatureMeta):
     feature_abstract = True
@@ -9,6 +9,7 @@ from filters.players import PlayerIter
 
 # Source.Python Admin
 from admin.core.clients import clients
+from admin.core.profiler import profiled
 
 
 # =============================================================================
@@ -83,9 +84,16 @@ class BaseFeatureCommand(AutoUnload):
             ['spa', ] + commands, feature.flag
         )
 
-        self._public_chat_command(self._get_public_chat_callback())
-        self._private_chat_command(self._get_private_chat_callback())
-        self._client_command(self._get_client_callback())
+        # Attribute the time spent in command callbacks to the feature's
+        # plugin
+        feature_module = type(feature).__module__
+
+        self._public_chat_command(profiled(
+            self._get_public_chat_callback(), feature_module))
+        self._private_chat_command(profiled(
+            self._get_private_chat_callback(), feature_module))
+        self._client_command(profiled(
+            self._get_client_callback(), feature_module))
 
     def _get_public_chat_callback(self):
         raise NotImplementedError
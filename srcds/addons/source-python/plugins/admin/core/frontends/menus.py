@@ -10,6 +10,7 @@ from translations.strings import LangStrings
 from ..clients import clients
 from ..config import config
 from ..helpers import format_player_name
+from ..profiler import profiled
 from ..strings import strings_common
 
 
@@ -65,10 +66,12 @@ class MenuSection(MenuEntry, list):
             self.popup.parent_menu = parent.popup
 
         @self.popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             option.value.select(clients[index])
 
         @self.popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             client = clients[index]
             popup.clear()
@@ -251,8 +254,12 @@ class BasePlayerBasedMenuCommand(MenuCommand):
         if parent is not None:
             self.popup.parent_menu = parent.popup
 
+        # Attribute the time spent in popup callbacks to the feature's plugin
+        feature_module = type(feature).__module__
+
         if self.allow_multiple_choices:
             @self.popup.register_select_callback
+            @profiled(module=feature_module)
             def select_callback(popup, index, option):
 
                 # Obtain PlayerBasedSelectionFrame instance from selected
@@ -403,6 +410,7 @@ class BasePlayerBasedMenuCommand(MenuCommand):
 
         else:
             @self.popup.register_select_callback
+            @profiled(module=feature_module)
             def select_callback(popup, index, option):
 
                 # Obtain PlayerBasedSelectionFrame instance from selected
@@ -416,6 +424,7 @@ class BasePlayerBasedMenuCommand(MenuCommand):
                 self._player_select(client, frame.player_ids)
 
         @self.popup.register_build_callback
+        @profiled(module=feature_module)
         def build_callback(popup, index):
 
             # Clear the popup
@@ -16,6 +16,8 @@ from players.helpers import get_client_language
 from ...info import info
 from .. import admin_core_logger
 from ..clients import clients
+from ..metrics import metrics_registry
+from ..profiler import profiled
 from ..strings import strings_common
 
 # Custom Package
@@ -109,6 +111,16 @@ else:
         flag = None
         nav_path = None
 
+        def __init__(self, index, page_request_type):
+            super().__init__(index, page_request_type)
+
+            if self.is_websocket:
+                metrics_registry.counter(
+                    "motd.{}.ws_pages".format(self.page_id)).increment()
+            else:
+                metrics_registry.counter(
+                    "motd.{}.pages".format(self.page_id)).increment()
+
         def _extract_nav_data(self, nav, client, language):
             sub_nav_data = []
 
@@ -512,6 +524,7 @@ main_motd = MOTDPageSection(
 # >> LISTENERS
 # =============================================================================
 @OnClientActive
+@profiled
 def listener_on_client_active(index):
     player = Player(index)
     for ws_player_based_page in _ws_player_based_pages:
@@ -522,6 +535,7 @@ def listener_on_client_active(index):
 
 
 @OnClientDisconnect
+@profiled
 def listener_on_client_disconnect(index):
     try:
         player = Player(index)
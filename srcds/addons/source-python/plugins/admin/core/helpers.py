@@ -1,6 +1,9 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from sys import intern
+
 # Source.Python
 from messages import HudDestination, SayText2, TextMsg
 from translations.manager import language_manager
@@ -42,6 +45,15 @@ def format_player_name(player_name):
     return player_name_encoded.decode('utf-8', 'ignore') + THREE_DOTS
 
 
+def intern_nullable(string):
+    """Intern the given string, but let None (NULL in the database) through.
+    """
+    if string is None:
+        return None
+
+    return intern(string)
+
+
 def log_admin_action(message):
     chat_message(message)
     admin_performed_actions_logger.log_message(
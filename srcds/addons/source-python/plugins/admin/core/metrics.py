@@ -0,0 +1,306 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+from math import ceil, log
+import os
+from time import time
+
+# Source.Python
+from listeners.tick import Repeat
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .paths import ADMIN_DATA_PATH
+from .plugins.command import admin_command_manager
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_metrics_logger = admin_core_logger.metrics
+
+# How often (in seconds) to dump all metrics to the snapshot file, so that
+# external processes (e.g. the MOTD web server) can read them without
+# bothering the game server. 0 disables the snapshot file.
+SNAPSHOT_INTERVAL = config.getfloat(
+    'metrics', 'snapshot_interval', fallback=0.0)
+
+SNAPSHOT_PATH = config.get(
+    'metrics', 'snapshot_path',
+    fallback="{admin_data_path}/metrics.json").format(
+        admin_data_path=ADMIN_DATA_PATH)
+
+# Percentiles of every histogram to put into the snapshot
+SNAPSHOT_PERCENTILES = (50, 90, 99)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Histogram:
+    """Count observed values in exponentially growing buckets.
+
+    Memory use doesn't depend on the number of observations. Percentiles
+    are estimated as the upper bound of the bucket they fall into, so they
+    are accurate up to the growth factor.
+    """
+    def __init__(self, min_value=1e-6, growth=1.25, buckets_number=84):
+        """Initialize the histogram.
+
+        :param float min_value: Upper bound of the first bucket.
+        :param float growth: Ratio between upper bounds of adjacent
+        buckets.
+        :param int buckets_number: Number of buckets. Values greater than
+        the upper bound of the last bucket are counted in it.
+        """
+        self.min_value = min_value
+        self.growth = growth
+        self.bounds = tuple(
+            min_value * growth ** i for i in range(buckets_number))
+
+        self.buckets = [0] * buckets_number
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        if value <= self.min_value:
+            i = 0
+        else:
+            i = min(
+                len(self.buckets) - 1,
+                int(ceil(log(value / self.min_value, self.growth))))
+
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += value
+
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """Return the estimated value below which the given percent of
+        observations fall.
+
+        :param float percent: Number from 0 to 100.
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percent / 100
+        seen = 0
+
+        # The last bucket has no upper bound, so it's left to the fallback
+        for bound, bucket in zip(self.bounds[:-1], self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    @property
+    def mean(self):
+        if not self.count:
+            return 0.0
+
+        return self.total / self.count
+
+    def clear(self):
+        self.buckets = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Counter:
+    """Count events, remembering how many happened in the last minute."""
+    def __init__(self):
+        self.value = 0
+        self.created_at = time()
+
+        # Per-second counts for the last minute, indexed by second % 60
+        self._recent_counts = [0] * 60
+        self._recent_seconds = [0] * 60
+
+    def increment(self, amount=1):
+        self.value += amount
+
+        second = int(time())
+        i = second % 60
+        if self._recent_seconds[i] != second:
+            self._recent_seconds[i] = second
+            self._recent_counts[i] = 0
+
+        self._recent_counts[i] += amount
+
+    @property
+    def last_minute(self):
+        """Number of events in the last 60 seconds."""
+        second = int(time())
+        return sum(
+            count for count, count_second in zip(
+                self._recent_counts, self._recent_seconds)
+            if second - count_second < 60)
+
+    @property
+    def rate_per_minute(self):
+        """Average number of events per minute since the counter has been
+        created."""
+        return self.value * 60 / max(1.0, time() - self.created_at)
+
+    def clear(self):
+        self.value = 0
+        self.created_at = time()
+        self._recent_counts = [0] * 60
+        self._recent_seconds = [0] * 60
+
+
+class Gauge:
+    """Report a value that is only read on demand, e.g. a queue size."""
+    def __init__(self, getter):
+        """Initialize the gauge.
+
+        :param getter: Callable that returns the current value.
+        """
+        self.getter = getter
+
+    @property
+    def value(self):
+        return self.getter()
+
+    def clear(self):
+        pass
+
+
+class _MetricsRegistry(dict):
+    """Map metric names to Counter and Histogram instances.
+
+    Histograms in the registry hold durations in seconds.
+    """
+    def counter(self, name):
+        """Return the counter with the given name, creating it if needed."""
+        if name not in self:
+            self[name] = Counter()
+
+        return self[name]
+
+    def histogram(self, name):
+        """Return the histogram with the given name, creating it if
+        needed."""
+        if name not in self:
+            self[name] = Histogram()
+
+        return self[name]
+
+    def gauge(self, name, getter):
+        """Register a gauge under the given name, replacing the previous one
+        (e.g. the one registered before the plugin was reloaded).
+
+        :param str name: Name of the gauge.
+        :param getter: Callable that returns the current value.
+        """
+        self[name] = Gauge(getter)
+
+    def clear_all(self):
+        """Reset all metrics without forgetting them."""
+        for metric in self.values():
+            metric.clear()
+
+    def get_snapshot(self):
+        """Return the current values of all metrics as a JSON-serializable
+        dictionary."""
+        counters, gauges, histograms = {}, {}, {}
+        for name, metric in self.items():
+            if isinstance(metric, Counter):
+                counters[name] = metric.value
+
+            elif isinstance(metric, Gauge):
+                gauges[name] = metric.value
+
+            else:
+                histograms[name] = {
+                    'count': metric.count,
+                    'sum': metric.total,
+                    'percentiles': {
+                        str(percent): metric.percentile(percent)
+                        for percent in SNAPSHOT_PERCENTILES
+                    },
+                }
+
+        return {
+            'time': time(),
+            'counters': counters,
+            'gauges': gauges,
+            'histograms': histograms,
+        }
+
+    def write_snapshot(self, path):
+        """Dump all metrics to the given JSON file.
+
+        The file is replaced atomically, so readers never see it half-written.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.get_snapshot(), f)
+
+        os.replace(tmp_path, path)
+
+# The singleton object of the _MetricsRegistry class.
+metrics_registry = _MetricsRegistry()
+
+
+# =============================================================================
+# >> SNAPSHOTS
+# =============================================================================
+def _write_snapshot():
+    try:
+        metrics_registry.write_snapshot(SNAPSHOT_PATH)
+    except OSError as e:
+        admin_metrics_logger.log_message(
+            "Couldn't write metrics snapshot to {}: {}".format(
+                SNAPSHOT_PATH, e))
+
+if SNAPSHOT_INTERVAL > 0:
+    _snapshot_repeat = Repeat(_write_snapshot)
+    _snapshot_repeat.start(SNAPSHOT_INTERVAL)
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@admin_command_manager.server_sub_command(['metrics', 'show'])
+def _admin_metrics_show(command_info, prefix=""):
+    lines = []
+    for name, metric in sorted(metrics_registry.items()):
+        if not name.startswith(prefix):
+            continue
+
+        if isinstance(metric, Gauge):
+            lines.append("{}: {}".format(name, metric.value))
+
+        elif isinstance(metric, Counter):
+            lines.append(
+                "{}: {} total, {} in the last minute, {:.2f}/min on "
+                "average".format(
+                    name, metric.value, metric.last_minute,
+                    metric.rate_per_minute))
+
+        else:
+            lines.append(
+                "{}: {} samples, p50 {:.3f} ms, p99 {:.3f} ms, "
+                "max {:.3f} ms".format(
+                    name, metric.count, metric.percentile(50) * 1000,
+                    metric.percentile(99) * 1000, metric.max * 1000))
+
+    admin_metrics_logger.log_message(
+        "\n".join(lines) if lines else "No metrics have been recorded")
+
+
+@admin_command_manager.server_sub_command(['metrics', 'reset'])
+def _admin_metrics_reset(command_info):
+    metrics_registry.clear_all()
+    admin_metrics_logger.log_message("Metrics have been reset")
@@ -0,0 +1,264 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from importlib import import_module
+
+# Site-Package
+from sqlalchemy import (
+    Column, Index, Integer, MetaData, String, Table, inspect, text)
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .orm import Base, engine
+from .paths import ADMIN_PLUGINS_PATH
+from .plugins.command import admin_command_manager
+from .plugins.valid import valid_plugins
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_migrations_logger = admin_core_logger.migrations
+
+
+# =============================================================================
+# >> MODEL CLASSES
+# =============================================================================
+class SchemaVersion(Base):
+    __tablename__ = config['database']['prefix'] + "schema_version"
+
+    scope = Column(String(64), primary_key=True)
+    version = Column(Integer)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _reflect_table(connection, table_name):
+    return Table(table_name, MetaData(), autoload_with=connection)
+
+
+def create_index(
+        connection, table_name, index_name, *column_names, descending=()):
+    """Create the given index unless it already exists.
+
+    Migrations spell out their indexes instead of taking them from the
+    models, so that every version creates exactly the same indexes no matter
+    how the models look like by the time it runs.
+
+    :param str table_name: Name of the table to create the index on.
+    :param str index_name: Name of the index.
+    :param column_names: Names of the indexed columns.
+    :param descending: Names of the columns that are indexed in descending
+    order.
+    :return: Whether or not the index has been created.
+    :rtype: bool
+    :raise ValueError: If any of the columns doesn't exist in the database.
+    """
+    table = _reflect_table(connection, table_name)
+    if index_name in set(index.name for index in table.indexes):
+        return False
+
+    for column_name in column_names:
+        if column_name not in table.c:
+            raise ValueError(
+                "Can't create index '{}': table '{}' has no column "
+                "'{}'".format(index_name, table_name, column_name))
+
+    Index(index_name, *(
+        table.c[column_name].desc() if column_name in descending
+        else table.c[column_name] for column_name in column_names
+    )).create(connection)
+
+    return True
+
+
+def drop_index(connection, table_name, index_name):
+    """Drop the given index if it exists.
+
+    :return: Whether or not the index has been dropped.
+    :rtype: bool
+    """
+    table = _reflect_table(connection, table_name)
+    for index in table.indexes:
+        if index.name == index_name:
+            index.drop(connection)
+            return True
+
+    return False
+
+
+def add_missing_column(connection, table_name, column):
+    """Add the given column to the database unless it's already there.
+
+    :param str table_name: Name of the table to add the column to.
+    :param Column column: Column to add. Migrations should declare it
+    themselves rather than take it from the model.
+    :return: Whether or not the column has been added.
+    :rtype: bool
+    """
+    inspector = inspect(connection)
+    if column.name in set(
+            column_['name'] for column_ in inspector.get_columns(table_name)):
+
+        return False
+
+    connection.execute(text("ALTER TABLE {} ADD COLUMN {} {}".format(
+        table_name, column.name,
+        column.type.compile(dialect=connection.dialect)
+    )))
+
+    return True
+
+
+def drop_column(connection, table_name, column_name):
+    """Drop the given column and every index in the database that covers
+    it."""
+    table = _reflect_table(connection, table_name)
+    for index in tuple(table.indexes):
+        if column_name in set(column.name for column in index.columns):
+            index.drop(connection)
+
+    connection.execute(text("ALTER TABLE {} DROP COLUMN {}".format(
+        table_name, column_name)))
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Migration:
+    """Base class for a single reversible schema change.
+
+    Migrations are grouped by scope (usually the name of the plugin that
+    owns the tables). Versions within a scope start at 1 and are applied in
+    ascending order.
+    """
+    scope = None
+    version = None
+
+    def upgrade(self, connection):
+        raise NotImplementedError
+
+    def downgrade(self, connection):
+        raise NotImplementedError
+
+
+class _MigrationManager(dict):
+    """Map scopes to their migrations (sorted by version)."""
+    def register(self, migration_class):
+        """Register a migration class. Can be used as a decorator."""
+        migrations = self.setdefault(migration_class.scope, [])
+
+        for migration in migrations:
+            if migration.version == migration_class.version:
+                raise ValueError(
+                    "Migration {} of scope '{}' is already registered".format(
+                        migration_class.version, migration_class.scope))
+
+        migrations.append(migration_class())
+        migrations.sort(key=lambda migration_: migration_.version)
+
+        return migration_class
+
+    def get_version(self, connection, scope):
+        """Return the version of the given scope stored in the database."""
+        table = SchemaVersion.__table__
+        row = connection.execute(
+            table.select().where(table.c.scope == scope)).first()
+
+        return 0 if row is None else row.version
+
+    def upgrade(self, engine):
+        """Apply all pending migrations of every scope."""
+        for scope, migrations in self.items():
+            with engine.begin() as connection:
+                version = self.get_version(connection, scope)
+
+            for migration in migrations:
+                if migration.version <= version:
+                    continue
+
+                admin_migrations_logger.log_message(
+                    "Upgrading '{}' to version {}...".format(
+                        scope, migration.version))
+
+                with engine.begin() as connection:
+                    migration.upgrade(connection)
+                    self._set_version(connection, scope, migration.version)
+
+    def downgrade(self, engine, scope, target_version):
+        """Revert migrations of the given scope down to the target version.
+        """
+        with engine.begin() as connection:
+            version = self.get_version(connection, scope)
+
+        for migration in reversed(self.get(scope, ())):
+            if migration.version > version:
+                continue
+
+            if migration.version <= target_version:
+                break
+
+            admin_migrations_logger.log_message(
+                "Downgrading '{}' from version {}...".format(
+                    scope, migration.version))
+
+            with engine.begin() as connection:
+                migration.downgrade(connection)
+                self._set_version(connection, scope, migration.version - 1)
+
+    @staticmethod
+    def _set_version(connection, scope, version):
+        table = SchemaVersion.__table__
+        result = connection.execute(
+            table.update().where(table.c.scope == scope).values(
+                version=version))
+
+        if not result.rowcount:
+            connection.execute(
+                table.insert().values(scope=scope, version=version))
+
+# The singleton object of the _MigrationManager class.
+migration_manager = _MigrationManager()
+
+
+# =============================================================================
+# >> SUB-PLUGIN MIGRATION REGISTRATION
+# =============================================================================
+for plugin_name in valid_plugins.all:
+    plugin_type = valid_plugins.get_plugin_type(plugin_name)
+    if ADMIN_PLUGINS_PATH.joinpath(
+        plugin_type, plugin_name, 'migrations.py',
+    ).isfile():
+        import_module(
+            'admin.plugins.{plugin_type}.{plugin_name}.migrations'.format(
+                plugin_type=plugin_type,
+                plugin_name=plugin_name,
+            )
+        )
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@admin_command_manager.server_sub_command(['db', 'version'])
+def _admin_db_version(command_info):
+    with engine.begin() as connection:
+        for scope, migrations in sorted(migration_manager.items()):
+            admin_migrations_logger.log_message("{}: {}/{}".format(
+                scope,
+                migration_manager.get_version(connection, scope),
+                migrations[-1].version
+            ))
+
+
+@admin_command_manager.server_sub_command(['db', 'downgrade'])
+def _admin_db_downgrade(command_info, scope, version:int):
+    if scope not in migration_manager:
+        admin_migrations_logger.log_message(
+            "Unknown migration scope: '{}'".format(scope))
+        return
+
+    migration_manager.downgrade(engine, scope, version)
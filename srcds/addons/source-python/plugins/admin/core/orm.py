@@ -1,25 +1,43 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from concurrent.futures import Future
+from queue import Empty, Queue
+from threading import current_thread, Lock
+from time import perf_counter
+from traceback import format_exc
+
+# Source.Python
+from listeners.tick import GameThread
+
 # Site-Package
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Source.Python Admin
+from . import admin_core_logger
 from .config import config
+from .metrics import metrics_registry
 from .paths import ADMIN_DATA_PATH
 
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
+admin_orm_logger = admin_core_logger.orm
+
 engine = create_engine(config['database']['uri'].format(
     admin_data_path=ADMIN_DATA_PATH,
 ))
 Base = declarative_base()
 Session = sessionmaker(bind=engine)
 
+# Maximum number of queued write operations committed in one transaction
+MAX_WRITE_BATCH_SIZE = config.getint(
+    'database', 'write_batch_size', fallback=100)
+
 
 # =============================================================================
 # >> CLASSES
@@ -37,3 +55,173 @@ class SessionContext:
             self.session.rollback()
         self.session.close()
         self.session = None
+
+
+class _WriteOperation:
+    """Represent a single queued database write."""
+    def __init__(self, callback, args, kwargs):
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class _DatabaseWriter:
+    """Perform all database writes from a single long-lived thread.
+
+    Operations are callables that accept a session as their first argument.
+    They must not commit the session themselves. Everything that is queued
+    by the time the writer wakes up is committed in one transaction.
+    """
+    def __init__(self, max_batch_size):
+        self.max_batch_size = max_batch_size
+
+        self._queue = Queue()
+        self._thread = None
+        self._lock = Lock()
+
+        # Only one stop() at a time may wait for the thread
+        self._stop_lock = Lock()
+
+    def submit(self, callback, *args, **kwargs):
+        """Queue a write operation.
+
+        :param callback: Callable that performs the write. It's called with
+        a session as its first argument.
+        :return: Future that receives the callback's return value once the
+        transaction is committed.
+        :rtype: concurrent.futures.Future
+        """
+        operation = _WriteOperation(callback, args, kwargs)
+
+        self._start()
+        self._queue.put(operation)
+
+        return operation.future
+
+    def stop(self):
+        """Commit whatever is left in the queue and stop the thread."""
+        with self._stop_lock:
+            with self._lock:
+                thread = self._thread
+                if thread is None:
+                    return
+
+                self._queue.put(None)
+
+            # The thread resets self._thread under the lock when it exits,
+            # so don't hold it while waiting
+            thread.join()
+
+    @property
+    def queue_size(self):
+        return self._queue.qsize()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = GameThread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self._process_queue()
+        finally:
+            # Let _start() bring up a new thread if this one has died
+            with self._lock:
+                if self._thread is current_thread():
+                    self._thread = None
+
+    def _process_queue(self):
+        while True:
+            operation = self._queue.get()
+            if operation is None:
+                return
+
+            batch = [operation]
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    operation = self._queue.get_nowait()
+                except Empty:
+                    break
+
+                if operation is None:
+                    stopping = True
+                    break
+
+                batch.append(operation)
+
+            started_at = perf_counter()
+            try:
+                self._flush(batch)
+            except Exception as e:
+
+                # The session itself has failed (e.g. the connection to the
+                # database is lost) - fail the batch, but keep the writer
+                admin_orm_logger.log_message(
+                    "Database write batch has failed:\n{}".format(
+                        format_exc()))
+
+                for operation in batch:
+                    if not operation.future.done():
+                        operation.future.set_exception(e)
+
+            metrics_registry.histogram("database.flush.seconds").observe(
+                perf_counter() - started_at)
+
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        # Try committing the whole batch at once
+        results = []
+        with SessionContext() as session:
+            try:
+                for operation in batch:
+                    results.append(operation.callback(
+                        session, *operation.args, **operation.kwargs))
+
+                session.commit()
+            except Exception:
+                session.rollback()
+                results = None
+
+        if results is not None:
+            for operation, result in zip(batch, results):
+                operation.future.set_result(result)
+
+            return
+
+        # One of the operations has failed - don't let it take the others
+        # down, and give each of them a transaction of its own
+        for operation in batch:
+            self._flush_single(operation)
+
+    def _flush_single(self, operation):
+        with SessionContext() as session:
+            try:
+                result = operation.callback(
+                    session, *operation.args, **operation.kwargs)
+
+                session.commit()
+            except Exception as e:
+                session.rollback()
+
+                admin_orm_logger.log_message(
+                    "Database write operation {} has failed:\n{}".format(
+                        operation.callback, format_exc()))
+
+                operation.future.set_exception(e)
+                return
+
+        operation.future.set_result(result)
+
+# The singleton object of the _DatabaseWriter class.
+database_writer = _DatabaseWriter(MAX_WRITE_BATCH_SIZE)
+
+metrics_registry.gauge(
+    "database.write_queue_size", lambda: database_writer.queue_size)
@@ -118,8 +118,8 @@ class _AdminPluginManager(PluginManager):
     def _is_related_module(base_name, module):
         """Check if a plugin's base name is related to a module name."""
         if module.split('.')[~0] in (
-            'commands', 'configuration', 'custom_events', 'info', 'models',
-            'rules', 'settings',
+            'commands', 'configuration', 'custom_events', 'info',
+            'migrations', 'models', 'rules', 'settings',
         ):
             return False
         return PluginManager._is_related_module(base_name, module)
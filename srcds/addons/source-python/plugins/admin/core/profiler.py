@@ -0,0 +1,345 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from cProfile import Profile
+from functools import wraps
+from io import StringIO
+from pstats import Stats
+from threading import get_ident
+from time import perf_counter, strftime, time
+
+# Source.Python
+from listeners import OnTick
+from listeners.tick import Delay
+
+# Source.Python Admin
+from . import admin_core_logger
+from .config import config
+from .metrics import Histogram
+from .paths import ADMIN_LOG_PATH
+from .plugins.command import admin_command_manager
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_profiler_logger = admin_core_logger.profiler
+
+# Callbacks are only wrapped if this is set; otherwise profiled() returns
+# them untouched and there's no overhead at all
+PROFILER_ENABLED = config.getboolean('profiler', 'enabled', fallback=False)
+
+# How many of the most expensive callbacks to list in the report
+REPORT_CALLBACKS_NUMBER = 10
+
+# How many entries of a captured profile to print
+CAPTURE_REPORT_ENTRIES_NUMBER = 25
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_plugin_name(module_name):
+    """Return the name of the sub-plugin the given module belongs to.
+
+    :param str module_name: Full module name, e.g.
+    "admin.plugins.included.admin_kick_ban.bans.base".
+    :return: Sub-plugin name or "core" for everything else.
+    :rtype: str
+    """
+    parts = module_name.split('.')
+    if len(parts) > 3 and parts[:2] == ['admin', 'plugins']:
+        return parts[3]
+
+    return "core"
+
+
+def profiled(callback=None, module=None):
+    """Make the profiler measure the given callback while it's running.
+
+    Can be used as a decorator under the listener/event/filter decorator,
+    either bare or as @profiled(module=...).
+
+    :param callback: Callable to measure.
+    :param str module: Name of the module to attribute the time to.
+    Defaults to the module the callback is defined in.
+    """
+    if callback is None:
+        return lambda callback: profiled(callback, module)
+
+    if not PROFILER_ENABLED:
+        return callback
+
+    return profiler.wrap(callback, module)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _Profiler:
+    """Accumulate time spent in callbacks per tick and per sub-plugin."""
+    def __init__(self):
+        self.running = False
+        self.started_at = None
+        self.ticks = 0
+
+        # Time spent by every plugin during the current tick
+        self._tick_times = {}
+
+        # Plugin name -> Histogram of time spent per tick
+        self._tick_histograms = {}
+
+        # Callback name -> (plugin name, Histogram of time spent per call)
+        self._call_histograms = {}
+
+        # Nested measured calls are only counted once towards tick times
+        self._depth = 0
+
+        # cProfile.Profile of the game thread while a capture is in progress.
+        # Only one thread is profiled: since Python 3.12 just one profiler
+        # may be active at a time
+        self._capture_profile = None
+        self._capture_thread_id = None
+
+        # Whether the capture profile is enabled right now, and the callback
+        # of a capture that has ended meanwhile
+        self._capture_in_flight = False
+        self._capture_callback = None
+
+    def start(self):
+        self.running = True
+        self.started_at = time()
+
+    def stop(self):
+        self.running = False
+        self._tick_times.clear()
+
+    def reset(self):
+        self.ticks = 0
+        self.started_at = time() if self.running else None
+        self._tick_times.clear()
+        self._tick_histograms.clear()
+        self._call_histograms.clear()
+
+    def wrap(self, callback, module=None):
+        plugin_name = get_plugin_name(module or callback.__module__)
+        callback_name = "{}.{}".format(
+            callback.__module__, callback.__qualname__)
+
+        @wraps(callback)
+        def wrapper(*args, **kwargs):
+            if not self.running:
+                if self._capture_profile is None or self._depth:
+                    return callback(*args, **kwargs)
+
+                self._depth += 1
+                try:
+                    return self.call_captured(callback, *args, **kwargs)
+                finally:
+                    self._depth -= 1
+
+            self._depth += 1
+            started_at = perf_counter()
+            try:
+                if self._capture_profile is None or self._depth > 1:
+                    return callback(*args, **kwargs)
+
+                return self.call_captured(callback, *args, **kwargs)
+            finally:
+                self._depth -= 1
+                self._record(
+                    plugin_name, callback_name, perf_counter() - started_at)
+
+        return wrapper
+
+    @property
+    def capturing(self):
+        return self._capture_profile is not None
+
+    def call_captured(self, target, *args, **kwargs):
+        """Call the target, recording its profile if a capture is in
+        progress and this is the thread that has started it.
+        """
+        if (self._capture_profile is None or self._capture_in_flight or
+                get_ident() != self._capture_thread_id):
+
+            return target(*args, **kwargs)
+
+        self._capture_in_flight = True
+        self._capture_profile.enable()
+        try:
+            return target(*args, **kwargs)
+        finally:
+            self._capture_profile.disable()
+            self._capture_in_flight = False
+
+            # The capture has ended while the target was running
+            if self._capture_callback is not None:
+                self._finish_capture(self._capture_callback)
+
+    def start_capture(self, duration, callback):
+        """Capture a cProfile profile of measured callbacks for the given
+        time. Only the calling (game) thread is profiled.
+
+        :param float duration: Number of seconds to capture for.
+        :param callback: Called with the list of captured profiles when
+        the capture is over.
+        """
+        self._capture_profile = Profile()
+        self._capture_thread_id = get_ident()
+        Delay(duration, self._finish_capture, (callback, ))
+
+    def _finish_capture(self, callback):
+        # Stats can't be built while the profile is still enabled, wait
+        # for the captured call to return
+        if self._capture_in_flight:
+            self._capture_callback = callback
+            return
+
+        profile = self._capture_profile
+        self._capture_profile = None
+        self._capture_thread_id = None
+        self._capture_callback = None
+
+        # pstats refuses profiles that haven't recorded anything
+        callback([profile] if profile.getstats() else [])
+
+    def _record(self, plugin_name, callback_name, duration):
+        if callback_name not in self._call_histograms:
+            self._call_histograms[callback_name] = (plugin_name, Histogram())
+
+        self._call_histograms[callback_name][1].observe(duration)
+
+        if self._depth:
+            return
+
+        self._tick_times[plugin_name] = (
+            self._tick_times.get(plugin_name, 0.0) + duration)
+
+    def end_tick(self):
+        if not self.running:
+            return
+
+        self.ticks += 1
+
+        for plugin_name, duration in self._tick_times.items():
+            if plugin_name not in self._tick_histograms:
+                self._tick_histograms[plugin_name] = Histogram()
+
+            self._tick_histograms[plugin_name].observe(duration)
+
+        self._tick_times.clear()
+
+    def iter_report_lines(self):
+        if self.started_at is None:
+            yield "Profiler hasn't been started"
+            return
+
+        yield "Profiled {} ticks over {:.0f} seconds{}".format(
+            self.ticks, time() - self.started_at,
+            "" if self.running else " (stopped)")
+
+        yield "Time per tick in which the plugin ran, ms:"
+        yield "{:<28}{:>8}{:>10}{:>10}{:>10}{:>12}".format(
+            "plugin", "ticks", "p50", "p99", "max", "total")
+
+        for plugin_name, histogram in sorted(
+                self._tick_histograms.items(),
+                key=lambda item: item[1].total, reverse=True):
+
+            yield "{:<28}{:>8}{:>10.3f}{:>10.3f}{:>10.3f}{:>12.1f}".format(
+                plugin_name, histogram.count,
+                histogram.percentile(50) * 1000,
+                histogram.percentile(99) * 1000,
+                histogram.max * 1000, histogram.total * 1000)
+
+        yield "Most expensive callbacks (time per call), ms:"
+        yield "{:<60}{:>8}{:>10}{:>10}{:>12}".format(
+            "callback", "calls", "p99", "max", "total")
+
+        for callback_name, (plugin_name, histogram) in sorted(
+                self._call_histograms.items(),
+                key=lambda item: item[1][1].total,
+                reverse=True)[:REPORT_CALLBACKS_NUMBER]:
+
+            yield "{:<60}{:>8}{:>10.3f}{:>10.3f}{:>12.1f}".format(
+                callback_name[-59:], histogram.count,
+                histogram.percentile(99) * 1000, histogram.max * 1000,
+                histogram.total * 1000)
+
+# The singleton object of the _Profiler class.
+profiler = _Profiler()
+
+
+# =============================================================================
+# >> LISTENERS
+# =============================================================================
+@OnTick
+def listener_on_tick():
+    profiler.end_tick()
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@admin_command_manager.server_sub_command(['profile', 'start'])
+def _admin_profile_start(command_info):
+    if not PROFILER_ENABLED:
+        admin_profiler_logger.log_message(
+            "Profiler is disabled. Set 'enabled=1' in the [profiler] section "
+            "of the config and restart the server.")
+
+        return
+
+    profiler.reset()
+    profiler.start()
+    admin_profiler_logger.log_message("Profiler has been started")
+
+
+@admin_command_manager.server_sub_command(['profile', 'stop'])
+def _admin_profile_stop(command_info):
+    profiler.stop()
+    admin_profiler_logger.log_message("Profiler has been stopped")
+
+
+@admin_command_manager.server_sub_command(['profile', 'report'])
+def _admin_profile_report(command_info):
+    admin_profiler_logger.log_message(
+        "\n".join(profiler.iter_report_lines()))
+
+
+@admin_command_manager.server_sub_command(['profile', 'capture'])
+def _admin_profile_capture(command_info, duration:float):
+    if not PROFILER_ENABLED:
+        admin_profiler_logger.log_message(
+            "Profiler is disabled. Set 'enabled=1' in the [profiler] section "
+            "of the config and restart the server.")
+
+        return
+
+    if profiler.capturing:
+        admin_profiler_logger.log_message(
+            "Another capture is already in progress")
+
+        return
+
+    def on_captured(profiles):
+        path = ADMIN_LOG_PATH / "profile_{}.pstats".format(
+            strftime("%Y%m%d_%H%M%S"))
+
+        stream = StringIO()
+        stats = Stats(*profiles, stream=stream)
+        stats.sort_stats('cumulative').print_stats(
+            CAPTURE_REPORT_ENTRIES_NUMBER)
+
+        ADMIN_LOG_PATH.makedirs_p()
+        stats.dump_stats(path)
+
+        admin_profiler_logger.log_message(
+            "Profile has been saved to {}\n{}".format(
+                path, stream.getvalue()))
+
+    profiler.start_capture(duration, on_captured)
+    admin_profiler_logger.log_message(
+        "Capturing profile for {} seconds...".format(duration))
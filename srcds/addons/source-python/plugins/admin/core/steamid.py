@@ -0,0 +1,57 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from functools import lru_cache
+import re
+
+# Source.Python
+from steam import SteamID
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# SteamID64 of the account with ID 0 in the public universe
+STEAMID64_BASE = 76561197960265728
+
+# How many parsed SteamIDs to remember
+STEAMID_CACHE_SIZE = 4096
+
+_steamid2_regex = re.compile(r'^STEAM_[01]:([01]):(\d+)$')
+_steamid3_regex = re.compile(r'^\[U:1:(\d+)\]$')
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_steamid64(steamid):
+    """Return SteamID64 of the given SteamID.
+
+    :param steamid: SteamID in STEAM_X:Y:Z, [U:1:N] or SteamID64 form (or
+    anything else steam.SteamID.parse can handle).
+    :return: SteamID64.
+    :rtype: int
+    :raise ValueError: If the given SteamID is invalid.
+    """
+    if isinstance(steamid, int):
+        return steamid
+
+    return _parse_steamid(steamid)
+
+
+@lru_cache(maxsize=STEAMID_CACHE_SIZE)
+def _parse_steamid(steamid):
+    match = _steamid2_regex.match(steamid)
+    if match is not None:
+        return STEAMID64_BASE + int(match.group(2)) * 2 + int(match.group(1))
+
+    match = _steamid3_regex.match(steamid)
+    if match is not None:
+        return STEAMID64_BASE + int(match.group(1))
+
+    if steamid.isdigit() and int(steamid) >= STEAMID64_BASE:
+        return int(steamid)
+
+    # Fall back to Source.Python's parser for less common forms
+    return SteamID.parse(steamid).to_uint64()
@@ -65,3 +65,15 @@ menu_section_voice.add_entry(UnblockMyVoiceMenuCommand(
 # =============================================================================
 blocked_chat_user_manager.refresh()
 blocked_voice_user_manager.refresh()
+
+
+# =============================================================================
+# >> UNLOAD FUNCTION
+# =============================================================================
+def unload():
+    # Cancel scheduled block expirations
+    blocked_chat_user_manager.clear()
+    blocked_voice_user_manager.clear()
+
+    # Don't leave anybody muted after we're gone
+    blocked_voice_user_manager.unmute_all()
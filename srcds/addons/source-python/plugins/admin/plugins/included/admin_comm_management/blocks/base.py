@@ -6,21 +6,23 @@ import json
 from time import time
 
 # Source.Python
-from listeners.tick import GameThread
 from menus import PagedMenu, PagedOption
 from players.dictionary import PlayerDictionary
-from steam import SteamID
 
 # Site-Package
 from sqlalchemy.sql.expression import and_, or_
 
 # Source.Python Admin
 from admin.core.clients import clients
+from admin.core.executor import executor
+from admin.core.expiry import expiry_scheduler
 from admin.core.features import BaseFeature
 from admin.core.frontends.menus import MenuCommand, PlayerBasedMenuCommand
-from admin.core.helpers import format_player_name
-from admin.core.orm import SessionContext
+from admin.core.helpers import format_player_name, intern_nullable
+from admin.core.orm import database_writer, SessionContext
 from admin.core.paths import ADMIN_CFG_PATH, get_server_file
+from admin.core.profiler import profiled
+from admin.core.steamid import get_steamid64
 from admin.core.strings import strings_common
 
 # Included Plugin
@@ -69,6 +71,8 @@ def format_block_duration(seconds):
 # >> CLASSES
 # =============================================================================
 class _BlockedCommUserInfo:
+    __slots__ = ('steamid64', 'id', 'name', 'blocked_by', 'expires_at')
+
     def __init__(self, steamid64, id_, name, blocked_by, expires_at):
         self.steamid64 = steamid64
         self.id = id_
@@ -80,8 +84,57 @@ class _BlockedCommUserInfo:
 class BlockedCommUserManager(dict):
     model = None
 
+    def __init__(self):
+        super().__init__()
+
+        # Scheduled expirations of temporary blocks
+        self._expiry_entries = {}
+
+    def __setitem__(self, steamid64, blocked_comm_user_info):
+        super().__setitem__(steamid64, blocked_comm_user_info)
+        self._schedule_expiry(blocked_comm_user_info)
+
+    def __delitem__(self, steamid64):
+        self._cancel_expiry(steamid64)
+        super().__delitem__(steamid64)
+
+    def pop(self, steamid64, *args):
+        self._cancel_expiry(steamid64)
+        return super().pop(steamid64, *args)
+
+    def clear(self):
+        super().clear()
+
+        for expiry_entry in self._expiry_entries.values():
+            expiry_entry.cancel()
+
+        self._expiry_entries.clear()
+
+    def _schedule_expiry(self, blocked_comm_user_info):
+        self._cancel_expiry(blocked_comm_user_info.steamid64)
+
+        if blocked_comm_user_info.expires_at < 0:
+            return
+
+        self._expiry_entries[blocked_comm_user_info.steamid64] = (
+            expiry_scheduler.schedule(
+                blocked_comm_user_info.expires_at, self._on_block_expired,
+                (blocked_comm_user_info.steamid64, )))
+
+    def _cancel_expiry(self, steamid64):
+        expiry_entry = self._expiry_entries.pop(steamid64, None)
+        if expiry_entry is not None:
+            expiry_entry.cancel()
+
+    def _on_block_expired(self, steamid64):
+        if self.pop(steamid64, None) is not None:
+            self._on_change()
+
     def _convert_steamid_to_db_format(self, steamid):
-        return str(SteamID.parse(steamid).to_uint64())
+        return str(get_steamid64(steamid))
+
+    def _convert_steamid_to_key(self, steamid):
+        return get_steamid64(steamid)
 
     def _on_change(self):
         pass
@@ -89,101 +142,178 @@ class BlockedCommUserManager(dict):
     def refresh(self):
         self.clear()
 
-        with SessionContext() as session:
-            blocked_users = session.query(self.model).all()
-
-            current_time = time()
-            for blocked_user in blocked_users:
-                if blocked_user.is_unblocked:
-                    continue
-
-                if 0 <= blocked_user.expires_at < current_time:
-                    continue
+        current_time = int(time())
+        model = self.model
 
-                self[blocked_user.steamid64] = _BlockedCommUserInfo(
-                    blocked_user.steamid64, blocked_user.id, blocked_user.name,
-                    blocked_user.blocked_by, blocked_user.expires_at
+        with SessionContext() as session:
+            query = (
+                session
+                .query(
+                    model.steamid64, model.id, model.name, model.blocked_by,
+                    model.expires_at
                 )
+                .filter_by(is_unblocked=False)
+                .filter(or_(
+                    model.expires_at < 0,
+                    model.expires_at >= current_time
+                ))
+                .yield_per(REFRESH_CHUNK_SIZE)
+            )
+
+            for steamid64, id_, name, blocked_by, expires_at in query:
+                steamid64 = int(steamid64)
+                self[steamid64] = _BlockedCommUserInfo(
+                    steamid64, id_, name, intern_nullable(blocked_by),
+                    expires_at)
 
         self._on_change()
 
     def is_blocked(self, steamid):
-        steamid64 = self._convert_steamid_to_db_format(steamid)
+        # Expired blocks are evicted by the expiry scheduler
+        return self._convert_steamid_to_key(steamid) in self
 
-        if steamid64 not in self:
-            return False
+    def save_block_to_database(self, blocked_by, steamid, name, duration):
+        steamid = self._convert_steamid_to_db_format(steamid)
+        blocked_by = self._convert_steamid_to_db_format(blocked_by)
 
-        if self[steamid64].expires_at < 0:
-            return True
+        future = database_writer.submit(
+            self._insert_block, steamid, name, blocked_by, duration)
 
-        if self[steamid64].expires_at < time():
-            del self[steamid64]
-            return False
+        executor.add_done_callback(future, self._on_block_inserted)
+        return future
 
-        return True
+    def _insert_block(self, session, steamid, name, blocked_by, duration):
+        blocked_user = self.model(steamid, name, blocked_by, duration)
 
-    def save_block_to_database(self, blocked_by, steamid, name, duration):
-        steamid = self._convert_steamid_to_db_format(steamid)
+        session.add(blocked_user)
+        session.flush()
+
+        return _BlockedCommUserInfo(
+            int(steamid), blocked_user.id, name, intern_nullable(blocked_by),
+            blocked_user.expires_at)
+
+    def _on_block_inserted(self, future):
+        if future.exception() is not None:
+            return
+
+        blocked_comm_user_info = future.result()
+        self[blocked_comm_user_info.steamid64] = blocked_comm_user_info
+
+        self._on_change()
+
+    def save_blocks_to_database(self, blocked_by, targets, duration):
+        """Block several users in a single transaction.
+
+        The cache is updated and _on_change is called only once, after all
+        the blocks have been inserted.
+
+        :param blocked_by: SteamID of the admin.
+        :param targets: Iterable of (steamid, name) tuples.
+        :param int duration: Duration of every block in seconds.
+        :return: Future that receives the list of inserted blocks.
+        :rtype: concurrent.futures.Future
+        """
         blocked_by = self._convert_steamid_to_db_format(blocked_by)
+        targets = [
+            (self._convert_steamid_to_db_format(steamid), name)
+            for steamid, name in targets
+        ]
 
-        with SessionContext() as session:
-            blocked_user = self.model(steamid, name, blocked_by, duration)
+        future = database_writer.submit(
+            self._insert_blocks, targets, blocked_by, duration)
 
-            session.add(blocked_user)
-            session.commit()
+        executor.add_done_callback(future, self._on_blocks_inserted)
+        return future
 
-            self[steamid] = _BlockedCommUserInfo(
-                steamid, blocked_user.id, name, blocked_by,
-                blocked_user.expires_at)
+    def _insert_blocks(self, session, targets, blocked_by, duration):
+        return [
+            self._insert_block(session, steamid, name, blocked_by, duration)
+            for steamid, name in targets
+        ]
+
+    def _on_blocks_inserted(self, future):
+        if future.exception() is not None:
+            return
+
+        for blocked_comm_user_info in future.result():
+            self[blocked_comm_user_info.steamid64] = blocked_comm_user_info
 
         self._on_change()
 
-    def get_all_blocks(
-            self, steamid=None, blocked_by=None, expired=None, unblocked=None):
+    def _filter_blocks(self, query, steamid=None, blocked_by=None,
+                       expired=None, unblocked=None):
 
+        if steamid is not None:
+            steamid = self._convert_steamid_to_db_format(steamid)
+            query = query.filter_by(steamid64=steamid)
+
+        if blocked_by is not None:
+            blocked_by = self._convert_steamid_to_db_format(blocked_by)
+            query = query.filter_by(blocked_by=blocked_by)
+
+        if expired is not None:
+            current_time = int(time())
+            if expired:
+                query = query.filter(and_(
+                    self.model.expires_at < current_time,
+                    self.model.expires_at >= 0
+                ))
+            else:
+                query = query.filter(or_(
+                    self.model.expires_at >= current_time,
+                    self.model.expires_at < 0
+                ))
+
+        if unblocked is not None:
+            query = query.filter_by(is_unblocked=unblocked)
+
+        return query
+
+    def get_all_blocks(self, steamid=None, blocked_by=None, expired=None,
+                       unblocked=None, after_id=None, limit=None):
+        """Return blocks stored in the database, ordered by their IDs.
+
+        :param int after_id: Only return blocks with greater IDs. Pass the ID
+        of the last block on the previous page to get the next one.
+        :param int limit: Maximum number of blocks to return.
+        """
         result = []
 
         with SessionContext() as session:
-            query = session.query(self.model)
-
-            if steamid is not None:
-                steamid = self._convert_steamid_to_db_format(steamid)
-                query = query.filter_by(steamid64=steamid)
-
-            if blocked_by is not None:
-                blocked_by = self._convert_steamid_to_db_format(blocked_by)
-                query = query.filter_by(blocked_by=blocked_by)
-
-            if expired is not None:
-                current_time = int(time())
-                if expired:
-                    query = query.filter(and_(
-                        self.model.expires_at < current_time,
-                        self.model.expires_at >= 0
-                    ))
-                else:
-                    query = query.filter(or_(
-                        self.model.expires_at >= current_time,
-                        self.model.expires_at < 0
-                    ))
-
-            if unblocked is not None:
-                query = query.filter_by(is_unblocked=unblocked)
+            query = self._filter_blocks(
+                session.query(self.model), steamid, blocked_by, expired,
+                unblocked)
+
+            if after_id is not None:
+                query = query.filter(self.model.id > after_id)
+
+            query = query.order_by(self.model.id)
+
+            if limit is not None:
+                query = query.limit(limit)
 
             for blocked_user in query.all():
                 result.append(_BlockedCommUserInfo(
-                    blocked_user.steamid64, blocked_user.id, blocked_user.name,
+                    int(blocked_user.steamid64), blocked_user.id,
+                    blocked_user.name,
                     blocked_user.blocked_by, blocked_user.expires_at
                 ))
 
         return result
 
+    def count_all_blocks(self, steamid=None, blocked_by=None, expired=None,
+                         unblocked=None):
+        """Return the number of blocks get_all_blocks would return without
+        a limit."""
+        with SessionContext() as session:
+            return self._filter_blocks(
+                session.query(self.model.id), steamid, blocked_by, expired,
+                unblocked).count()
+
     def get_active_blocks(self, blocked_by=None):
         if blocked_by is not None:
             blocked_by = self._convert_steamid_to_db_format(blocked_by)
 
-        current_time = time()
-
         result = []
         for blocked_comm_user_info in self.values():
             if (
@@ -192,9 +322,6 @@ class BlockedCommUserManager(dict):
 
                 continue
 
-            if blocked_comm_user_info.expires_at < current_time:
-                continue
-
             result.append(blocked_comm_user_info)
 
         return result
@@ -202,15 +329,26 @@ class BlockedCommUserManager(dict):
     def lift_block(self, id_, unblocked_by):
         unblocked_by = self._convert_steamid_to_db_format(unblocked_by)
 
-        with SessionContext() as session:
-            blocked_user = session.query(self.model).filter_by(id=id_).first()
+        future = database_writer.submit(self._lift_block, id_, unblocked_by)
+
+        executor.add_done_callback(future, self._on_block_lifted)
+        return future
+
+    def _lift_block(self, session, id_, unblocked_by):
+        blocked_user = session.query(self.model).filter_by(id=id_).first()
 
-            if blocked_user is None:
-                return
+        if blocked_user is None:
+            return None
 
-            blocked_user.lift_block(unblocked_by)
+        blocked_user.lift_block(unblocked_by)
 
-            session.commit()
+        return id_
+
+    def _on_block_lifted(self, future):
+        if future.exception() is not None or future.result() is None:
+            return
+
+        id_ = future.result()
 
         for steamid64, blocked_comm_user_info in self.items():
             if blocked_comm_user_info.id != id_:
@@ -227,19 +365,32 @@ class BlockCommFeature(BaseFeature):
     blocked_comm_user_manager = None
 
     def execute(self, client, player, duration):
-        if player.is_fake_client() or player.is_hltv():
-            client.tell(plugin_strings['error bot_cannot_block'])
-            return
+        self.execute_many(client, (player, ), duration)
+
+    def execute_many(self, client, players, duration):
+        """Block all the given players at once.
+
+        :param client: Client that performs the action.
+        :param players: Iterable of players to block.
+        :param int duration: Duration of every block in seconds.
+        :return: List of players that are going to be blocked.
+        :rtype: list
+        """
+        blocked_players = []
+        for player in players:
+            if player.is_fake_client() or player.is_hltv():
+                client.tell(plugin_strings['error bot_cannot_block'])
+                continue
 
-        GameThread(
-            target=self.blocked_comm_user_manager.save_block_to_database,
-            args=(
+            blocked_players.append(player)
+
+        if blocked_players:
+            self.blocked_comm_user_manager.save_blocks_to_database(
                 client.steamid,
-                player.steamid,
-                player.name,
-                duration
-            )
-        ).start()
+                [(player.steamid, player.name) for player in blocked_players],
+                duration)
+
+        return blocked_players
 
     def filter(self, client, player):
         if self.blocked_comm_user_manager.is_blocked(player.steamid):
@@ -265,6 +416,7 @@ class BlockCommMenuCommand(PlayerBasedMenuCommand):
             title=plugin_strings['popup_title duration'])
 
         @self.duration_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -275,11 +427,14 @@ class BlockCommMenuCommand(PlayerBasedMenuCommand):
                 ))
 
         @self.duration_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             client = clients[index]
 
-            for player in self._filter_player_ids(client, option.value[0]):
-                self.feature.execute(client, player, option.value[1])
+            # Block everybody in one transaction with a single cache update
+            self.feature.execute_many(
+                client, self._filter_player_ids(client, option.value[0]),
+                option.value[1])
 
     def _player_select(self, client, player_ids):
         index = client.player.index
@@ -293,10 +448,8 @@ class UnblockCommFeature(BaseFeature):
     blocked_comm_user_manager = None
 
     def execute(self, client, blocked_comm_user_info):
-        GameThread(
-            target=self.blocked_comm_user_manager.lift_block,
-            args=(blocked_comm_user_info.id, client.steamid)
-        ).start()
+        self.blocked_comm_user_manager.lift_block(
+            blocked_comm_user_info.id, client.steamid)
 
 
 class _UnblockCommMenuCommand(MenuCommand):
@@ -311,10 +464,12 @@ class _UnblockCommMenuCommand(MenuCommand):
             self.popup.parent_menu = parent.popup
 
         @self.popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             self._blocked_comm_user_info_select(clients[index], option.value)
 
         @self.popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -358,4 +513,7 @@ class UnblockMyCommMenuCommand(_UnblockCommMenuCommand):
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
+# How many active blocks to fetch from the database at once on refresh
+REFRESH_CHUNK_SIZE = 1000
+
 stock_block_durations = load_stock_block_durations()
@@ -4,12 +4,18 @@
 # Source.Python
 from commands import CommandReturn
 from commands.say import SayFilter
+from players.dictionary import PlayerDictionary
 
 # Source.Python Admin
 from admin.core.clients import clients
+from admin.core.executor import executor
 from admin.core.helpers import log_admin_action
+from admin.core.profiler import profiled
+from admin.core.steamid import STEAMID64_BASE
 
 # Included Plugin
+from ..flood import (
+    FLOOD_BLOCK_DURATION, FLOOD_DETECTION_ENABLED, flood_detector)
 from ..models import BlockedChatUser
 from ..strings import plugin_strings
 from .base import (
@@ -23,21 +29,50 @@ from .base import (
 class _BlockedChatUserManager(BlockedCommUserManager):
     model = BlockedChatUser
 
+    def __init__(self):
+        super().__init__()
+
+        # Incremented every time the set of blocked users changes (including
+        # expirations), so that cached verdicts can tell they're stale
+        self.version = 0
+
+    def _on_change(self):
+        self.version += 1
+
 # The singleton object for the _BlockedChatUserManager class.
 blocked_chat_user_manager = _BlockedChatUserManager()
 
 
+class _ChatBlockVerdict:
+    """Cached result of blocked_chat_user_manager.is_blocked for a player."""
+    __slots__ = ('version', 'is_blocked')
+
+    def __init__(self):
+        self.version = -1
+        self.is_blocked = False
+
+# Player index -> _ChatBlockVerdict
+_chat_block_verdicts = PlayerDictionary(lambda index: _ChatBlockVerdict())
+
+# SteamIDs of flooding players whose automatic block is still being written
+_pending_flood_blocks = set()
+
+
 class _BlockChatFeature(BlockCommFeature):
     flag = "admin.admin_comm_management.block_chat"
     blocked_comm_user_manager = blocked_chat_user_manager
 
-    def execute(self, client, player, duration):
-        super().execute(client, player, duration)
+    def execute_many(self, client, players, duration):
+        blocked_players = super().execute_many(client, players, duration)
 
-        log_admin_action(plugin_strings['message chat_blocked'].tokenized(
-            admin_name=client.name,
-            player_name=player.name,
-        ))
+        for player in blocked_players:
+            log_admin_action(
+                plugin_strings['message chat_blocked'].tokenized(
+                    admin_name=client.name,
+                    player_name=player.name,
+                ))
+
+        return blocked_players
 
 # The singleton object of the _BlockChatFeature class.
 block_chat_feature = _BlockChatFeature()
@@ -82,11 +117,58 @@ class UnblockMyChatMenuCommand(UnblockMyCommMenuCommand):
 # >> COMMAND FILTERS
 # =============================================================================
 @SayFilter
+@profiled
 def say_filter(command, index, team_only):
-    client = clients[index]
+    verdict = _chat_block_verdicts[index]
+
+    # Only look the SteamID up again if the blocks have changed since then
+    if verdict.version != blocked_chat_user_manager.version:
+        verdict.is_blocked = blocked_chat_user_manager.is_blocked(
+            clients[index].steamid)
+
+        verdict.version = blocked_chat_user_manager.version
 
-    if blocked_chat_user_manager.is_blocked(client.steamid):
-        client.tell(plugin_strings['error chat_block'])
+    if verdict.is_blocked:
+        clients[index].tell(plugin_strings['error chat_block'])
         return CommandReturn.BLOCK
 
+    if (
+            FLOOD_DETECTION_ENABLED and
+            flood_detector.is_flooding(index, command.arg_string)):
+
+        return _block_flooding_player(index)
+
     return CommandReturn.CONTINUE
+
+
+def _block_flooding_player(index):
+    client = clients[index]
+
+    # Admins who can block chat themselves are never blocked automatically
+    if client.has_permission(block_chat_feature.flag):
+        return CommandReturn.CONTINUE
+
+    # The block is only cached once it's been written to the database, so
+    # start over - otherwise every following message would trip it again
+    flood_detector.reset(index)
+
+    # Don't block them twice if they keep flooding meanwhile
+    steamid = client.steamid
+    if steamid in _pending_flood_blocks:
+        return CommandReturn.BLOCK
+
+    _pending_flood_blocks.add(steamid)
+
+    # Automatic blocks are attributed to the account with ID 0
+    future = blocked_chat_user_manager.save_block_to_database(
+        STEAMID64_BASE, steamid, client.name, FLOOD_BLOCK_DURATION)
+
+    # The manager's own callback caches the block first
+    executor.add_done_callback(
+        future, lambda future: _pending_flood_blocks.discard(steamid))
+
+    log_admin_action(plugin_strings['message chat_flood_blocked'].tokenized(
+        player_name=client.name,
+    ))
+
+    return CommandReturn.BLOCK
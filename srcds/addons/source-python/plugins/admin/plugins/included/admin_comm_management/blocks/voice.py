@@ -3,13 +3,13 @@
 # =============================================================================
 # Source.Python
 from filters.players import PlayerIter
-from listeners import OnClientActive
-from listeners.tick import Delay
-from players.dictionary import PlayerDictionary
+from listeners import OnClientActive, OnClientDisconnect
+from players.entity import Player
 from players.voice import mute_manager
 
 # Source.Python Admin
 from admin.core.helpers import log_admin_action
+from admin.core.profiler import profiled
 
 # Included Plugin
 from ..models import BlockedVoiceUser
@@ -19,25 +19,56 @@ from .base import (
     UnblockCommFeature, UnblockMyCommMenuCommand)
 
 
-# =============================================================================
-# >> FUNCTIONS
-# =============================================================================
-def sync_voice_blocked_players():
-    for player in PlayerIter('human'):
-        if blocked_voice_user_manager.is_blocked(player.steamid):
-            mute_manager.mute_player(player.index)
-        else:
-            mute_manager.unmute_player(player.index)
-
-
 # =============================================================================
 # >> CLASSES
 # =============================================================================
 class _BlockedVoiceUserManager(BlockedCommUserManager):
     model = BlockedVoiceUser
 
+    def __init__(self):
+        super().__init__()
+
+        # Indexes of the players we've muted via mute_manager
+        self._muted_indexes = set()
+
+    def _mute(self, index):
+        if index not in self._muted_indexes:
+            mute_manager.mute_player(index)
+            self._muted_indexes.add(index)
+
+    def _unmute(self, index):
+        if index in self._muted_indexes:
+            mute_manager.unmute_player(index)
+            self._muted_indexes.discard(index)
+
     def _on_change(self):
-        sync_voice_blocked_players()
+        # Only touch mute_manager for those players whose state has changed
+        blocked_indexes = set()
+        for player in PlayerIter('human'):
+            if self.is_blocked(player.steamid):
+                blocked_indexes.add(player.index)
+
+        for index in self._muted_indexes - blocked_indexes:
+            self._unmute(index)
+
+        for index in blocked_indexes - self._muted_indexes:
+            self._mute(index)
+
+    def on_player_activated(self, player):
+        """Mute or unmute the player who has just become active."""
+        if self.is_blocked(player.steamid):
+            self._mute(player.index)
+        else:
+            self._unmute(player.index)
+
+    def on_player_disconnected(self, index):
+        """Make sure the next player to take this index isn't muted."""
+        self._unmute(index)
+
+    def unmute_all(self):
+        """Unmute everybody we've muted, e.g. when the plugin is unloaded."""
+        for index in tuple(self._muted_indexes):
+            self._unmute(index)
 
 # The singleton object for the _BlockedVoiceUserManager class.
 blocked_voice_user_manager = _BlockedVoiceUserManager()
@@ -47,22 +78,17 @@ class _BlockVoiceFeature(BlockCommFeature):
     flag = "admin.admin_comm_management.block_voice"
     blocked_comm_user_manager = blocked_voice_user_manager
 
-    def execute(self, client, player, duration):
-        super().execute(client, player, duration)
+    def execute_many(self, client, players, duration):
+        blocked_players = super().execute_many(client, players, duration)
 
-        if player_unmute_delays[player.index] is not None:
-            if player_unmute_delays[player.index].running:
-                player_unmute_delays[player.index].cancel()
-            player_unmute_delays[player.index] = None
+        for player in blocked_players:
+            log_admin_action(
+                plugin_strings['message voice_blocked'].tokenized(
+                    admin_name=client.name,
+                    player_name=player.name,
+                ))
 
-        if duration >= 0:
-            player_unmute_delays[player.index] = Delay(
-                duration + 0.1, sync_voice_blocked_players)
-
-        log_admin_action(plugin_strings['message voice_blocked'].tokenized(
-            admin_name=client.name,
-            player_name=player.name,
-        ))
+        return blocked_players
 
 # The singleton object of the _BlockVoiceFeature class.
 block_voice_feature = _BlockVoiceFeature()
@@ -103,18 +129,20 @@ class UnblockMyVoiceMenuCommand(UnblockMyCommMenuCommand):
     popup_title = plugin_strings['popup_title unblock_voice']
 
 
-class _PlayerUnmuteDelaysDictionary(PlayerDictionary):
-    def on_automatically_removed(self, index):
-        delay = self[index]
-        delay.cancel()
-
-# The singleton object of the _PlayerUnmuteDelaysDictionary class.
-player_unmute_delays = _PlayerUnmuteDelaysDictionary(lambda index: None)
-
-
 # =============================================================================
 # >> LISTENERS
 # =============================================================================
 @OnClientActive
+@profiled
 def listener_on_client_active(index):
-    sync_voice_blocked_players()
+    player = Player(index)
+    if player.is_fake_client() or player.is_hltv():
+        return
+
+    blocked_voice_user_manager.on_player_activated(player)
+
+
+@OnClientDisconnect
+@profiled
+def listener_on_client_disconnect(index):
+    blocked_voice_user_manager.on_player_disconnected(index)
@@ -0,0 +1,136 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from time import monotonic
+
+# Source.Python
+from players.dictionary import PlayerDictionary
+
+# Source.Python Admin
+from admin.core.plugins import admin_plugins_logger
+
+# Included Plugin
+from .config import plugin_config
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_comm_management_logger = admin_plugins_logger.admin_comm_management
+
+FLOOD_DETECTION_ENABLED = plugin_config.getboolean(
+    'flood', 'enabled', fallback=False)
+
+# More than this many messages within the window is considered flooding
+FLOOD_MAX_MESSAGES = plugin_config.getint('flood', 'max_messages', fallback=5)
+FLOOD_WINDOW = plugin_config.getfloat('flood', 'window_seconds', fallback=3.0)
+
+# More than this many identical messages among the last repeat_history
+# messages is considered flooding, too
+FLOOD_MAX_REPEATS = plugin_config.getint('flood', 'max_repeats', fallback=3)
+FLOOD_REPEAT_HISTORY = plugin_config.getint(
+    'flood', 'repeat_history', fallback=6)
+
+# How long (in seconds) the automatic chat block lasts
+FLOOD_BLOCK_DURATION = plugin_config.getint(
+    'flood', 'block_duration_seconds', fallback=300)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _FloodState:
+    """Recent chat activity of a single player.
+
+    Both buffers are fixed-size rings, so recording a message never costs
+    more than a couple of slot updates.
+    """
+    __slots__ = (
+        'timestamps', 'timestamp_position', 'hashes', 'hash_position',
+        'hash_counts')
+
+    def __init__(self, max_messages, repeat_history):
+        # Times of the last max_messages messages; the slot we're about to
+        # overwrite always holds the oldest of them
+        self.timestamps = [float('-inf')] * max_messages
+        self.timestamp_position = 0
+
+        # Hashes of the last repeat_history messages and how many times each
+        # of them occurs in the ring
+        self.hashes = [None] * repeat_history
+        self.hash_position = 0
+        self.hash_counts = {}
+
+
+class _FloodDetector:
+    """Tell if a player is flooding the chat.
+
+    A player is flooding if they send more than max_messages messages within
+    the window, or if the same message occurs more than max_repeats times
+    among their last repeat_history messages.
+    """
+    def __init__(self, max_messages, window, max_repeats, repeat_history):
+        # Both rings need at least one slot
+        if max_messages < 1 or repeat_history < 1:
+            admin_comm_management_logger.log_message(
+                "Flood detection: max_messages ({}) and repeat_history ({}) "
+                "must be at least 1, raising them to 1".format(
+                    max_messages, repeat_history))
+
+            max_messages = max(max_messages, 1)
+            repeat_history = max(repeat_history, 1)
+
+        self.max_messages = max_messages
+        self.window = window
+        self.max_repeats = max_repeats
+        self.repeat_history = repeat_history
+
+        self._states = PlayerDictionary(
+            lambda index: _FloodState(max_messages, repeat_history))
+
+    def is_flooding(self, index, message):
+        """Record the message and tell if the player is flooding.
+
+        :param int index: Index of the player who has sent the message.
+        :param str message: Text of the message.
+        :rtype: bool
+        """
+        state = self._states[index]
+
+        # Rate: compare against the time of the message sent max_messages
+        # messages ago
+        current_time = monotonic()
+        position = state.timestamp_position
+        too_fast = current_time - state.timestamps[position] < self.window
+
+        state.timestamps[position] = current_time
+        state.timestamp_position = (position + 1) % self.max_messages
+
+        # Repeats: keep a count per hash for the messages in the ring
+        message_hash = hash(message.strip().lower())
+        hash_counts = state.hash_counts
+        position = state.hash_position
+
+        old_hash = state.hashes[position]
+        if old_hash is not None:
+            if hash_counts[old_hash] == 1:
+                del hash_counts[old_hash]
+            else:
+                hash_counts[old_hash] -= 1
+
+        state.hashes[position] = message_hash
+        state.hash_position = (position + 1) % self.repeat_history
+
+        repeats = hash_counts.get(message_hash, 0) + 1
+        hash_counts[message_hash] = repeats
+
+        return too_fast or repeats > self.max_repeats
+
+    def reset(self, index):
+        """Forget the player's recent messages."""
+        self._states.pop(index, None)
+
+# The singleton object of the _FloodDetector class.
+flood_detector = _FloodDetector(
+    FLOOD_MAX_MESSAGES, FLOOD_WINDOW, FLOOD_MAX_REPEATS, FLOOD_REPEAT_HISTORY)
@@ -0,0 +1,58 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Admin
+from admin.core.migrations import (
+    create_index, drop_index, Migration, migration_manager)
+
+# Included Plugin
+from .models import BlockedChatUser, BlockedVoiceUser
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+TABLE_NAMES = (BlockedChatUser.__tablename__, BlockedVoiceUser.__tablename__)
+
+
+# =============================================================================
+# >> MIGRATIONS
+# =============================================================================
+@migration_manager.register
+class _AddIndexes(Migration):
+    scope = "admin_comm_management"
+    version = 1
+
+    def upgrade(self, connection):
+        for table_name in TABLE_NAMES:
+            create_index(
+                connection, table_name, 'ix_' + table_name + '_steamid64',
+                'steamid64')
+
+            create_index(
+                connection, table_name, 'ix_' + table_name + '_expires_at',
+                'expires_at')
+
+    def downgrade(self, connection):
+        for table_name in TABLE_NAMES:
+            drop_index(
+                connection, table_name, 'ix_' + table_name + '_steamid64')
+            drop_index(
+                connection, table_name, 'ix_' + table_name + '_expires_at')
+
+
+@migration_manager.register
+class _AddBlockedByIndexes(Migration):
+    scope = "admin_comm_management"
+    version = 2
+
+    def upgrade(self, connection):
+        for table_name in TABLE_NAMES:
+            create_index(
+                connection, table_name, 'ix_' + table_name + '_blocked_by',
+                'blocked_by')
+
+    def downgrade(self, connection):
+        for table_name in TABLE_NAMES:
+            drop_index(
+                connection, table_name, 'ix_' + table_name + '_blocked_by')
@@ -19,12 +19,12 @@ class _BlockedCommUser(Base):
     __abstract__ = True
 
     id = Column(Integer, primary_key=True)
-    steamid64 = Column(String(32))
+    steamid64 = Column(String(32), index=True)
     name = Column(String(64))
-    blocked_by = Column(String(32))
+    blocked_by = Column(String(32), index=True)
 
     blocked_at = Column(Integer)
-    expires_at = Column(Integer)
+    expires_at = Column(Integer, index=True)
 
     is_unblocked = Column(Boolean)
     unblocked_by = Column(String(32))
@@ -38,7 +38,7 @@ class _BlockedCommUser(Base):
         self.name = name
         self.blocked_by = blocked_by
         self.blocked_at = int(current_time)
-        self.expires_at = int(current_time + duration)
+        self.expires_at = -1 if duration < 0 else int(current_time + duration)
         self.is_unblocked = False
         self.unblocked_by = ""
 
@@ -2,6 +2,7 @@
 # >> IMPORTS
 # =============================================================================
 # Source.Python
+from listeners.tick import Repeat
 from players.helpers import get_client_language
 
 # Source.Python Admin
@@ -11,13 +12,16 @@ from admin.core.frontends.menus import (
 from admin.core.frontends.motd import (
     main_motd, MOTDSection, MOTDPageEntry, PlayerBasedFeaturePage)
 from admin.core.helpers import log_admin_action
+from admin.core.plugins import admin_plugins_logger
+from admin.core.plugins.command import admin_command_manager
 
 # Included Plugin
 from .bans.ip_address import (
-    ban_ip_address_feature, banned_ip_address_manager, BanIPAddressMenuCommand,
-    BanIPAddressPage, lift_ip_address_ban_feature,
-    LiftAnyIPAddressBanMenuCommand, LiftIPAddressBanPage,
-    LiftMyIPAddressBanMenuCommand, remove_bad_ip_address_ban_feature,
+    ban_ip_address_feature, ban_ip_range_feature, banned_ip_address_manager,
+    BanIPAddressMenuCommand, BanIPAddressPage, BanIPRangePage,
+    lift_ip_address_ban_feature, LiftAnyIPAddressBanMenuCommand,
+    LiftIPAddressBanPage, LiftMyIPAddressBanMenuCommand,
+    remove_bad_ip_address_ban_feature,
     RemoveBadIPAddressBanMenuCommand, review_ip_address_ban_feature,
     ReviewIPAddressBanMenuCommand, ReviewIPAddressBanPage)
 from .bans.steamid import (
@@ -27,9 +31,21 @@ from .bans.steamid import (
     LiftMySteamIDBanMenuCommand, remove_bad_steamid_ban_feature,
     RemoveBadSteamIDBanMenuCommand, review_steamid_ban_feature,
     ReviewSteamIDBanMenuCommand, ReviewSteamIDBanPage)
+from .bans.transfer import export_bans, import_bans
+from .config import plugin_config
 from .strings import plugin_strings
 
 
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_kick_ban_logger = admin_plugins_logger.admin_kick_ban
+
+# How often (in seconds) to pull bans changed by other servers, 0 disables
+SYNC_INTERVAL = plugin_config.getfloat(
+    'sync', 'interval_seconds', fallback=0)
+
+
 # =============================================================================
 # >> CLASSES
 # =============================================================================
@@ -93,6 +109,11 @@ menu_section_ip_address.add_entry(BanIPAddressMenuCommand(
     menu_section_ip_address,
     plugin_strings['popup_title ban_ip_address']))
 
+menu_section_ip_address.add_entry(BanIPAddressMenuCommand(
+    ban_ip_range_feature,
+    menu_section_ip_address,
+    plugin_strings['popup_title ban_ip_range']))
+
 menu_section_steamid.add_entry(ReviewSteamIDBanMenuCommand(
     review_steamid_ban_feature,
     menu_section_steamid,
@@ -158,6 +179,10 @@ motd_section_ip_address.add_entry(MOTDPageEntry(
     motd_section_ip_address, BanIPAddressPage,
     plugin_strings['popup_title ban_ip_address'], 'ban_ip_address'))
 
+motd_section_ip_address.add_entry(MOTDPageEntry(
+    motd_section_ip_address, BanIPRangePage,
+    plugin_strings['popup_title ban_ip_range'], 'ban_ip_range'))
+
 motd_section_steamid.add_entry(MOTDPageEntry(
     motd_section_steamid, LiftSteamIDBanPage,
     plugin_strings['popup_title lift_steamid'], 'lift_steamid'))
@@ -180,3 +205,37 @@ motd_section_ip_address.add_entry(MOTDPageEntry(
 # =============================================================================
 banned_steamid_manager.refresh()
 banned_ip_address_manager.refresh()
+
+
+# =============================================================================
+# >> BAN SYNCHRONIZATION
+# =============================================================================
+def _sync_bans():
+    banned_steamid_manager.sync()
+    banned_ip_address_manager.sync()
+
+if SYNC_INTERVAL > 0:
+    _sync_repeat = Repeat(_sync_bans)
+    _sync_repeat.start(SYNC_INTERVAL)
+
+
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@admin_command_manager.server_sub_command(['bans', 'import'])
+def _admin_bans_import(command_info, file_name):
+    import_bans(file_name, admin_kick_ban_logger.log_message)
+
+
+@admin_command_manager.server_sub_command(['bans', 'export'])
+def _admin_bans_export(command_info, file_name):
+    export_bans(file_name, admin_kick_ban_logger.log_message)
+
+
+# =============================================================================
+# >> UNLOAD FUNCTION
+# =============================================================================
+def unload():
+    # Cancel scheduled ban expirations
+    banned_steamid_manager.clear()
+    banned_ip_address_manager.clear()
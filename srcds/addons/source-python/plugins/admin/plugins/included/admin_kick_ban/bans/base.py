@@ -3,15 +3,15 @@
 # =============================================================================
 # Python
 from collections import OrderedDict
+from heapq import nsmallest
 import json
+from operator import attrgetter
 from time import time
 
 # Source.Python
-from listeners.tick import GameThread
 from menus import PagedMenu, PagedOption, SimpleMenu, SimpleOption, Text
 from players.dictionary import PlayerDictionary
 from players.helpers import get_client_language
-from steam import SteamID
 from translations.manager import language_manager
 
 # Site-Package
@@ -19,18 +19,57 @@ from sqlalchemy.sql.expression import and_, or_
 
 # Source.Python Admin
 from admin.core.clients import clients
+from admin.core.executor import executor
+from admin.core.expiry import expiry_scheduler
 from admin.core.features import BaseFeature
 from admin.core.frontends.menus import MenuCommand
 from admin.core.frontends.motd import BaseFeaturePage
-from admin.core.helpers import format_player_name, log_admin_action
-from admin.core.orm import SessionContext
+from admin.core.helpers import (
+    format_player_name, intern_nullable, log_admin_action)
+from admin.core.orm import database_writer, SessionContext
 from admin.core.paths import ADMIN_CFG_PATH, get_server_file
+from admin.core.profiler import profiled
+from admin.core.steamid import get_steamid64
 from admin.core.strings import strings_common
 
 # Included Plugin
+from ..config import plugin_config
 from ..strings import plugin_strings
 
 
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# How many active bans to fetch from the database at once on refresh
+REFRESH_CHUNK_SIZE = 1000
+
+# How many uniqueids to look up at once when checking imported bans for
+# duplicates (some databases limit the number of query parameters)
+IMPORT_LOOKUP_CHUNK_SIZE = 500
+
+# How many reasons/notes of cached bans to keep in memory
+BAN_DETAILS_CACHE_SIZE = plugin_config.getint(
+    'settings', 'ban_details_cache_size', fallback=128)
+
+# How many bans to fetch at once for menus and MOTD pages
+BAN_LIST_PAGE_SIZE = plugin_config.getint(
+    'settings', 'ban_list_page_size', fallback=50)
+
+# Ban attributes that are transferred by import/export
+EXPORT_FIELDS = (
+    'uniqueid', 'name', 'banned_by', 'banned_at', 'expires_at', 'reviewed',
+    'reason', 'notes', 'is_unbanned', 'unbanned_by',
+)
+
+# Values of the options that switch between pages of ban lists
+_PREVIOUS_PAGE = object()
+_NEXT_PAGE = object()
+
+# Rows changed within this many seconds before the last sync are fetched
+# again, to tolerate clock skew and commit delays between servers
+SYNC_OVERLAP = plugin_config.getint('sync', 'overlap_seconds', fallback=5)
+
+
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
@@ -61,6 +100,24 @@ def load_stock_ban_durations():
     return ban_durations_json
 
 
+def _send_with_ban_details(menu_command, index, popup):
+    """Load details of the ban the player has selected in the given menu
+    command, then send the popup that shows them."""
+    banned_player_info = menu_command._selected_bans[index]
+
+    def details_callback(reason, notes):
+
+        # The admin might have left or picked another ban meanwhile
+        if menu_command._selected_bans.get(index) is not banned_player_info:
+            return
+
+        menu_command._selected_ban_details[index] = (reason, notes)
+        clients[index].send_popup(popup)
+
+    menu_command.feature.banned_uniqueid_manager.load_ban_details(
+        banned_player_info, details_callback)
+
+
 def format_ban_duration(seconds):
     if seconds < 0:
         return plugin_strings['duration permanent']
@@ -97,8 +154,13 @@ stock_ban_reasons = load_stock_ban_reasons()
 
 
 class _BannedPlayerInfo:
+    """Ban record. Cached records have reason and notes set to None, use
+    BannedUniqueIDManager.load_ban_details to get them."""
+    __slots__ = ('uniqueid', 'id', 'name', 'banned_by', 'reviewed',
+                 'expires_at', 'reason', 'notes')
+
     def __init__(self, uniqueid, id_, name, banned_by, reviewed, expires_at,
-                 reason, notes):
+                 reason=None, notes=None):
 
         self.uniqueid = uniqueid
         self.id = id_
@@ -112,186 +174,634 @@ class _BannedPlayerInfo:
 stock_ban_durations = load_stock_ban_durations()
 
 
+class _BanDetailsCache(OrderedDict):
+    """Map ban IDs to (reason, notes), forgetting least recently used
+    entries."""
+    def __init__(self, max_size):
+        super().__init__()
+
+        self.max_size = max_size
+
+    def lookup(self, ban_id):
+        details = self.get(ban_id)
+        if details is not None:
+            self.move_to_end(ban_id)
+
+        return details
+
+    def store(self, ban_id, reason, notes):
+        self[ban_id] = (reason, notes)
+        self.move_to_end(ban_id)
+
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
 class BannedUniqueIDManager(dict):
     model = None
 
+    def __init__(self):
+        super().__init__()
+
+        # Reasons and notes of the cached bans that have been shown lately
+        self._ban_details = _BanDetailsCache(BAN_DETAILS_CACHE_SIZE)
+
+        # Secondary indexes, kept in sync with the primary (uniqueid) one
+        self._bans_by_id = {}
+        self._bans_by_admin = {}
+
+        # Scheduled expirations of temporary bans
+        self._expiry_entries = {}
+
+        # Changes made after this timestamp are pulled on the next sync
+        self._sync_watermark = 0
+        self._sync_future = None
+
+    def __setitem__(self, uniqueid, banned_player_info):
+        if uniqueid in self:
+            self._remove_from_indexes(self[uniqueid])
+
+        super().__setitem__(uniqueid, banned_player_info)
+        self._add_to_indexes(banned_player_info)
+        self._schedule_expiry(banned_player_info)
+
+    def __delitem__(self, uniqueid):
+        self._remove_from_indexes(self[uniqueid])
+        super().__delitem__(uniqueid)
+
+    def pop(self, uniqueid, *args):
+        if uniqueid in self:
+            self._remove_from_indexes(self[uniqueid])
+
+        return super().pop(uniqueid, *args)
+
+    def clear(self):
+        super().clear()
+
+        self._bans_by_id.clear()
+        self._bans_by_admin.clear()
+        self._ban_details.clear()
+
+        for expiry_entry in self._expiry_entries.values():
+            expiry_entry.cancel()
+
+        self._expiry_entries.clear()
+
+    def _add_to_indexes(self, banned_player_info):
+        self._bans_by_id[banned_player_info.id] = banned_player_info
+
+        self._bans_by_admin.setdefault(banned_player_info.banned_by, {})[
+            banned_player_info.id] = banned_player_info
+
+    def _remove_from_indexes(self, banned_player_info):
+        self._bans_by_id.pop(banned_player_info.id, None)
+        self._ban_details.pop(banned_player_info.id, None)
+
+        expiry_entry = self._expiry_entries.pop(
+            banned_player_info.uniqueid, None)
+
+        if expiry_entry is not None:
+            expiry_entry.cancel()
+
+        admin_bans = self._bans_by_admin.get(banned_player_info.banned_by)
+        if admin_bans is None:
+            return
+
+        admin_bans.pop(banned_player_info.id, None)
+        if not admin_bans:
+            del self._bans_by_admin[banned_player_info.banned_by]
+
+    def _schedule_expiry(self, banned_player_info):
+        expiry_entry = self._expiry_entries.pop(
+            banned_player_info.uniqueid, None)
+
+        if expiry_entry is not None:
+            expiry_entry.cancel()
+
+        if banned_player_info.expires_at < 0:
+            return
+
+        self._expiry_entries[banned_player_info.uniqueid] = (
+            expiry_scheduler.schedule(
+                banned_player_info.expires_at, self._on_ban_expired,
+                (banned_player_info.uniqueid, )))
+
+    def _on_ban_expired(self, uniqueid):
+        # The entry has already fired, don't let __delitem__ cancel it
+        self._expiry_entries.pop(uniqueid, None)
+
+        banned_player_info = self.pop(uniqueid, None)
+        if banned_player_info is not None:
+            self.on_ban_removed(banned_player_info)
+
+    def on_ban_removed(self, banned_player_info):
+        """Called when a ban leaves the cache because it has expired or
+        because it has been lifted on another server."""
+        pass
+
+    def get_ban_by_id(self, ban_id):
+        return self._bans_by_id.get(ban_id)
+
     def _convert_uniqueid_to_db_format(self, uniqueid):
         raise NotImplementedError
 
+    def _convert_uniqueid_to_key(self, uniqueid):
+        raise NotImplementedError
+
+    def _convert_db_format_to_key(self, uniqueid):
+        raise NotImplementedError
+
     def _convert_steamid_to_db_format(self, steamid):
-        return str(SteamID.parse(steamid).to_uint64())
+        return str(get_steamid64(steamid))
+
+    def convert_uniqueid_to_db_format(self, uniqueid):
+        """Return the given uniqueid in the form it's stored in the database.
+
+        :raise ValueError: If the uniqueid is invalid.
+        """
+        return self._convert_uniqueid_to_db_format(uniqueid)
+
+    def convert_steamid_to_db_format(self, steamid):
+        """Return the given admin SteamID in the form it's stored in the
+        database.
+
+        :raise ValueError: If the SteamID is invalid.
+        """
+        return self._convert_steamid_to_db_format(steamid)
 
     def refresh(self):
         self.clear()
 
+        current_time = int(time())
+        self._sync_watermark = current_time - SYNC_OVERLAP
+        model = self.model
+
         with SessionContext() as session:
-            banned_users = session.query(self.model).all()
+            query = (
+                session
+                .query(
+                    model.uniqueid, model.id, model.name, model.banned_by,
+                    model.reviewed, model.expires_at
+                )
+                .filter_by(is_unbanned=False)
+                .filter(or_(
+                    model.expires_at < 0,
+                    model.expires_at >= current_time
+                ))
+                .yield_per(REFRESH_CHUNK_SIZE)
+            )
 
-            current_time = time()
-            for banned_user in banned_users:
-                if banned_user.is_unbanned:
-                    continue
+            for (uniqueid, id_, name, banned_by, reviewed,
+                    expires_at) in query:
 
-                if 0 <= banned_user.expires_at < current_time:
-                    continue
+                uniqueid = self._convert_db_format_to_key(uniqueid)
+                self[uniqueid] = _BannedPlayerInfo(
+                    uniqueid, id_, name, intern_nullable(banned_by), reviewed,
+                    expires_at)
 
-                self[banned_user.uniqueid] = _BannedPlayerInfo(
-                    banned_user.uniqueid, banned_user.id, banned_user.name,
-                    banned_user.banned_by, banned_user.reviewed,
-                    banned_user.expires_at, banned_user.reason,
-                    banned_user.notes)
+    def sync(self):
+        """Pull bans that have been issued, reviewed or lifted (e.g. by other
+        servers sharing the database) since the last sync."""
+        if self._sync_future is not None:
+            return
 
-    def is_banned(self, uniqueid):
-        uniqueid = self._convert_uniqueid_to_db_format(uniqueid)
+        self._sync_future = executor.submit(
+            self._fetch_changes, (self._sync_watermark, ),
+            callback=self._on_changes_fetched)
+
+    def _fetch_changes(self, since):
+        started_at = int(time())
+        model = self.model
+
+        with SessionContext() as session:
+            rows = (
+                session
+                .query(
+                    model.uniqueid, model.id, model.name, model.banned_by,
+                    model.reviewed, model.expires_at, model.is_unbanned
+                )
+                .filter(model.updated_at >= since)
+                .order_by(model.updated_at)
+                .all()
+            )
+
+        return rows, started_at
+
+    def _on_changes_fetched(self, future):
+        self._sync_future = None
+
+        if future.exception() is not None:
+            return
+
+        rows, started_at = future.result()
+        self._sync_watermark = max(
+            self._sync_watermark, started_at - SYNC_OVERLAP)
+
+        current_time = time()
+        for (uniqueid, id_, name, banned_by, reviewed, expires_at,
+                is_unbanned) in rows:
+
+            uniqueid = self._convert_db_format_to_key(uniqueid)
+            banned_player_info = self.get(uniqueid)
+
+            # Lifted or expired
+            if is_unbanned or 0 <= expires_at < current_time:
+                if (
+                        banned_player_info is not None and
+                        banned_player_info.id == id_):
+
+                    del self[uniqueid]
+                    self.on_ban_removed(banned_player_info)
+
+                continue
+
+            # Reviewed (or simply seen again)
+            if (
+                    banned_player_info is not None and
+                    banned_player_info.id == id_):
+
+                banned_player_info.reviewed = reviewed
+
+                # Reason and notes might have changed as well
+                self._ban_details.pop(id_, None)
+
+                if banned_player_info.expires_at != expires_at:
+                    banned_player_info.expires_at = expires_at
+                    self._schedule_expiry(banned_player_info)
+
+                continue
 
-        if uniqueid not in self:
-            return False
+            # Issued
+            if banned_player_info is None or banned_player_info.id < id_:
+                self[uniqueid] = _BannedPlayerInfo(
+                    uniqueid, id_, name, intern_nullable(banned_by), reviewed,
+                    expires_at)
+
+    def load_ban_details(self, banned_player_info, callback):
+        """Pass reason and notes of the given ban to the callback.
+
+        Cached bans don't keep them in memory, so they're loaded from the
+        database in a worker thread when needed and remembered for a while.
+
+        :param banned_player_info: Ban to load the details of.
+        :param callback: Callable that will be called in the game thread
+        with reason and notes as its arguments. It's called right away if
+        the details are already known.
+        """
+        if banned_player_info.reason is not None:
+            callback(banned_player_info.reason, banned_player_info.notes)
+            return
 
-        if self[uniqueid].expires_at < 0:
-            return True
+        details = self._ban_details.lookup(banned_player_info.id)
+        if details is not None:
+            callback(*details)
+            return
 
-        if self[uniqueid].expires_at < time():
-            del self[uniqueid]
-            return False
+        def details_callback(future):
+            if future.exception() is not None:
+                callback("", "")
+                return
 
-        return True
+            reason, notes = future.result()
+            self._ban_details.store(banned_player_info.id, reason, notes)
+            callback(reason, notes)
+
+        executor.submit(
+            self._fetch_ban_details, (banned_player_info.id, ),
+            callback=details_callback)
+
+    def _fetch_ban_details(self, ban_id):
+        with SessionContext() as session:
+            row = (
+                session
+                .query(self.model.reason, self.model.notes)
+                .filter_by(id=ban_id)
+                .first()
+            )
+
+        return ("", "") if row is None else tuple(row)
+
+    def is_banned(self, uniqueid):
+        # Expired bans are evicted by the expiry scheduler
+        return self._convert_uniqueid_to_key(uniqueid) in self
 
     def save_ban_to_database(self, banned_by, uniqueid, name, duration):
         uniqueid = self._convert_uniqueid_to_db_format(uniqueid)
         banned_by = self._convert_steamid_to_db_format(banned_by)
 
-        with SessionContext() as session:
-            banned_user = self.model(uniqueid, name, banned_by, duration)
+        future = database_writer.submit(
+            self._insert_ban, uniqueid, name, banned_by, duration)
+
+        executor.add_done_callback(future, self._on_ban_inserted)
+        return future
+
+    def _insert_ban(self, session, uniqueid, name, banned_by, duration):
+        banned_user = self.model(uniqueid, name, banned_by, duration)
+
+        session.add(banned_user)
+        session.flush()
+
+        return _BannedPlayerInfo(
+            self._convert_db_format_to_key(uniqueid), banned_user.id, name,
+            intern_nullable(banned_by), False, banned_user.expires_at)
+
+    def _on_ban_inserted(self, future):
+        if future.exception() is not None:
+            return
+
+        banned_player_info = future.result()
+        self[banned_player_info.uniqueid] = banned_player_info
+
+    def save_bans_to_database(self, banned_by, targets, duration):
+        """Ban several players in a single transaction.
+
+        :param banned_by: SteamID of the admin.
+        :param targets: Iterable of (uniqueid, name) tuples.
+        :param int duration: Duration of every ban in seconds.
+        :return: Future that receives the list of inserted bans.
+        :rtype: concurrent.futures.Future
+        """
+        banned_by = self._convert_steamid_to_db_format(banned_by)
+        targets = [
+            (self._convert_uniqueid_to_db_format(uniqueid), name)
+            for uniqueid, name in targets
+        ]
+
+        future = database_writer.submit(
+            self._insert_ban_batch, targets, banned_by, duration)
+
+        executor.add_done_callback(future, self._on_ban_batch_inserted)
+        return future
+
+    def _insert_ban_batch(self, session, targets, banned_by, duration):
+        return [
+            self._insert_ban(session, uniqueid, name, banned_by, duration)
+            for uniqueid, name in targets
+        ]
+
+    def _on_ban_batch_inserted(self, future):
+        if future.exception() is not None:
+            return
+
+        for banned_player_info in future.result():
+            self[banned_player_info.uniqueid] = banned_player_info
 
-            session.add(banned_user)
-            session.commit()
+    def import_bans_to_database(self, rows):
+        """Insert many bans at once, bypassing the cache.
 
-            self[uniqueid] = _BannedPlayerInfo(
-                uniqueid, banned_user.id, name, banned_by, False,
-                banned_user.expires_at, "", "")
+        Bans that are already in the database (same uniqueid and banned_at)
+        are skipped, so the same file can be imported again.
+
+        :param list rows: Dictionaries with the same keys as the model's
+        attributes, uniqueid and banned_by being in database format.
+        :return: Future that receives the number of inserted rows.
+        :rtype: concurrent.futures.Future
+        """
+        return database_writer.submit(self._insert_bans, rows)
+
+    def _insert_bans(self, session, rows):
+        uniqueid_column = self.model.__mapper__.synonyms['uniqueid'].name
+        current_time = int(time())
+
+        existing_bans = self._get_existing_bans(
+            session, set(row['uniqueid'] for row in rows))
+
+        db_rows = []
+        for row in rows:
+            ban = (row['uniqueid'], row['banned_at'])
+            if ban in existing_bans:
+                continue
+
+            existing_bans.add(ban)
+
+            db_row = dict(row)
+            db_row[uniqueid_column] = db_row.pop('uniqueid')
+            db_row['updated_at'] = current_time
+            db_rows.append(db_row)
+
+        if db_rows:
+            session.execute(self.model.__table__.insert(), db_rows)
+
+        return len(db_rows)
+
+    def _get_existing_bans(self, session, uniqueids):
+        """Return a set of (uniqueid, banned_at) of the bans of the given
+        uniqueids that are stored in the database."""
+        model = self.model
+        uniqueids = list(uniqueids)
+
+        existing_bans = set()
+        for i in range(0, len(uniqueids), IMPORT_LOOKUP_CHUNK_SIZE):
+            existing_bans.update(
+                session
+                .query(model.uniqueid, model.banned_at)
+                .filter(model.uniqueid.in_(
+                    uniqueids[i:i + IMPORT_LOOKUP_CHUNK_SIZE]))
+            )
+
+        return existing_bans
+
+    def iter_bans_for_export(self, session):
+        """Iterate over all bans stored in the database.
+
+        :return: Generator of dictionaries with the model's attributes.
+        """
+        model = self.model
+        query = (
+            session
+            .query(
+                model.uniqueid, model.name, model.banned_by, model.banned_at,
+                model.expires_at, model.reviewed, model.reason, model.notes,
+                model.is_unbanned, model.unbanned_by
+            )
+            .order_by(model.id)
+            .yield_per(REFRESH_CHUNK_SIZE)
+        )
+
+        for row in query:
+            yield dict(zip(EXPORT_FIELDS, row))
 
     def remove_ban_from_database(self, ban_id):
-        with SessionContext() as session:
-            banned_user = session.query(
-                self.model).filter_by(id=ban_id).first()
+        return database_writer.submit(self._delete_ban, ban_id)
 
-            if banned_user is not None:
-                session.delete(banned_user)
-                session.commit()
+    def _delete_ban(self, session, ban_id):
+        banned_user = session.query(self.model).filter_by(id=ban_id).first()
+
+        if banned_user is not None:
+            session.delete(banned_user)
+
+    def _filter_bans(self, query, uniqueid=None, banned_by=None,
+                     reviewed=None, expired=None, unbanned=None):
+
+        if uniqueid is not None:
+            uniqueid = self._convert_uniqueid_to_db_format(uniqueid)
+            query = query.filter_by(uniqueid=uniqueid)
+
+        if banned_by is not None:
+            banned_by = self._convert_steamid_to_db_format(banned_by)
+            query = query.filter_by(banned_by=banned_by)
+
+        if reviewed is not None:
+            query = query.filter_by(reviewed=reviewed)
+
+        if expired is not None:
+            current_time = int(time())
+            if expired:
+                query = query.filter(and_(
+                    self.model.expires_at < current_time,
+                    self.model.expires_at >= 0
+                ))
+            else:
+                query = query.filter(or_(
+                    self.model.expires_at >= current_time,
+                    self.model.expires_at < 0
+                ))
+
+        if unbanned is not None:
+            query = query.filter_by(is_unbanned=unbanned)
+
+        return query
 
     def get_all_bans(self, uniqueid=None, banned_by=None, reviewed=None,
-                     expired=None, unbanned=None):
+                     expired=None, unbanned=None, after_id=None, limit=None):
+        """Return bans stored in the database, ordered by their IDs.
 
+        :param int after_id: Only return bans with greater IDs. Pass the ID
+        of the last ban on the previous page to get the next one.
+        :param int limit: Maximum number of bans to return.
+        """
         result = []
 
         with SessionContext() as session:
-            query = session.query(self.model)
-
-            if uniqueid is not None:
-                uniqueid = self._convert_uniqueid_to_db_format(uniqueid)
-                query = query.filter_by(uniqueid=uniqueid)
-
-            if banned_by is not None:
-                banned_by = self._convert_steamid_to_db_format(banned_by)
-                query = query.filter_by(banned_by=banned_by)
-
-            if reviewed is not None:
-                query = query.filter_by(reviewed=reviewed)
-
-            if expired is not None:
-                current_time = int(time())
-                if expired:
-                    query = query.filter(and_(
-                        self.model.expires_at < current_time,
-                        self.model.expires_at >= 0
-                    ))
-                else:
-                    query = query.filter(or_(
-                        self.model.expires_at >= current_time,
-                        self.model.expires_at < 0
-                    ))
-
-            if unbanned is not None:
-                query = query.filter_by(is_unbanned=unbanned)
+            query = self._filter_bans(
+                session.query(self.model), uniqueid, banned_by, reviewed,
+                expired, unbanned)
+
+            if after_id is not None:
+                query = query.filter(self.model.id > after_id)
+
+            query = query.order_by(self.model.id)
+
+            if limit is not None:
+                query = query.limit(limit)
 
             for banned_user in query.all():
                 result.append(_BannedPlayerInfo(
-                    banned_user.uniqueid, banned_user.id, banned_user.name,
+                    self._convert_db_format_to_key(banned_user.uniqueid),
+                    banned_user.id, banned_user.name,
                     banned_user.banned_by, banned_user.reviewed,
                     banned_user.expires_at, banned_user.reason, banned_user.notes
                 ))
 
         return result
 
-    def get_active_bans(self, banned_by=None, reviewed=None):
+    def count_all_bans(self, uniqueid=None, banned_by=None, reviewed=None,
+                       expired=None, unbanned=None):
+        """Return the number of bans get_all_bans would return without
+        a limit."""
+        with SessionContext() as session:
+            return self._filter_bans(
+                session.query(self.model.id), uniqueid, banned_by, reviewed,
+                expired, unbanned).count()
+
+    def get_active_bans(self, banned_by=None, reviewed=None, after_id=None,
+                        limit=None):
+        """Return cached bans.
+
+        :param int after_id: Only return bans with greater IDs.
+        :param int limit: Maximum number of bans to return. When given, the
+        bans with the lowest IDs are returned, in ascending order.
+        """
         if banned_by is not None:
             banned_by = self._convert_steamid_to_db_format(banned_by)
 
-        current_time = time()
+            banned_player_infos = self._bans_by_admin.get(
+                banned_by, {}).values()
+        else:
+            banned_player_infos = self.values()
 
         result = []
-        for banned_player_info in self.values():
-            if (
-                    banned_by is not None and
-                    banned_player_info.banned_by != banned_by):
-
-                continue
-
+        for banned_player_info in banned_player_infos:
             if reviewed is False and banned_player_info.reviewed:
                 continue
 
             if reviewed is True and not banned_player_info.reviewed:
                 continue
 
-            if banned_player_info.expires_at < current_time:
+            if after_id is not None and banned_player_info.id <= after_id:
                 continue
 
             result.append(banned_player_info)
 
+        if limit is not None:
+            result = nsmallest(limit, result, key=attrgetter('id'))
+
         return result
 
     def review_ban(self, ban_id, reason, duration):
-        with SessionContext() as session:
-            banned_user = session.query(
-                self.model).filter_by(id=ban_id).first()
+        future = database_writer.submit(
+            self._review_ban, ban_id, reason, duration)
 
-            if banned_user is None:
-                return
+        executor.add_done_callback(future, self._on_ban_reviewed)
+        return future
 
-            banned_user.review(reason, duration)
-            expires_at = banned_user.expires_at
+    def _review_ban(self, session, ban_id, reason, duration):
+        banned_user = session.query(self.model).filter_by(id=ban_id).first()
 
-            session.commit()
+        if banned_user is None:
+            return None
 
-        for banned_player_info in self.values():
-            if banned_player_info.id != ban_id:
-                continue
+        banned_user.review(reason, duration)
+
+        return ban_id, reason, banned_user.expires_at
 
-            banned_player_info.reviewed = True
-            banned_player_info.expires_at = expires_at
-            banned_player_info.reason = reason
-            break
+    def _on_ban_reviewed(self, future):
+        if future.exception() is not None or future.result() is None:
+            return
+
+        ban_id, reason, expires_at = future.result()
+
+        banned_player_info = self.get_ban_by_id(ban_id)
+        if banned_player_info is None:
+            return
+
+        banned_player_info.reviewed = True
+        banned_player_info.expires_at = expires_at
+
+        # Notes are kept as they were
+        details = self._ban_details.lookup(ban_id)
+        if details is not None:
+            self._ban_details.store(ban_id, reason, details[1])
+
+        self._schedule_expiry(banned_player_info)
 
     def lift_ban(self, ban_id, unbanned_by):
         unbanned_by = self._convert_steamid_to_db_format(unbanned_by)
 
-        with SessionContext() as session:
-            banned_user = session.query(
-                self.model).filter_by(id=ban_id).first()
+        future = database_writer.submit(self._lift_ban, ban_id, unbanned_by)
 
-            if banned_user is None:
-                return
+        executor.add_done_callback(future, self._on_ban_lifted)
+        return future
 
-            banned_user.lift_ban(unbanned_by)
+    def _lift_ban(self, session, ban_id, unbanned_by):
+        banned_user = session.query(self.model).filter_by(id=ban_id).first()
 
-            session.commit()
+        if banned_user is None:
+            return None
 
-        for uniqueid, banned_player_info in self.items():
-            if banned_player_info.id != ban_id:
-                continue
+        banned_user.lift_ban(unbanned_by)
+
+        return ban_id
+
+    def _on_ban_lifted(self, future):
+        if future.exception() is not None or future.result() is None:
+            return
+
+        banned_player_info = self.get_ban_by_id(future.result())
+        if banned_player_info is None:
+            return
 
-            del self[uniqueid]
-            break
+        del self[banned_player_info.uniqueid]
 
 
 class LiftBanFeature(BaseFeature):
@@ -300,10 +810,8 @@ class LiftBanFeature(BaseFeature):
     ws_lift_ban_pages = None
 
     def execute(self, client, banned_player_info):
-        GameThread(
-            target=self.banned_uniqueid_manager.lift_ban,
-            args=(banned_player_info.id, client.steamid)
-        ).start()
+        self.banned_uniqueid_manager.lift_ban(
+            banned_player_info.id, client.steamid)
 
         for ws_lift_ban_page in self.ws_lift_ban_pages:
             ws_lift_ban_page.send_remove_ban_id(banned_player_info.id)
@@ -326,10 +834,12 @@ class _LiftBanMenuCommand(MenuCommand):
             self.popup.parent_menu = parent.popup
 
         @self.popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             self._popups_done(clients[index], option.value)
 
         @self.popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -363,14 +873,17 @@ class LiftAnyBanMenuCommand(_LiftBanMenuCommand):
         super().__init__(feature, parent, title, id_)
 
         self._selected_bans = PlayerDictionary(lambda index: None)
+        self._selected_ban_details = PlayerDictionary(lambda index: ("", ""))
         self.confirm_popup = SimpleMenu()
 
         @self.popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             self._selected_bans[index] = option.value
-            clients[index].send_popup(self.confirm_popup)
+            _send_with_ban_details(self, index, self.confirm_popup)
 
         @self.confirm_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -383,12 +896,14 @@ class LiftAnyBanMenuCommand(_LiftBanMenuCommand):
                 plugin_strings['ban_record admin_steamid'].tokenized(
                     admin_steamid=self._selected_bans[index].banned_by)))
 
+            reason, notes = self._selected_ban_details[index]
+
             popup.append(Text(plugin_strings['ban_record reason'].tokenized(
-                reason=self._selected_bans[index].reason)))
+                reason=reason)))
 
-            if self._selected_bans[index].notes:
+            if notes:
                 popup.append(Text(plugin_strings['ban_record notes'].tokenized(
-                    notes=self._selected_bans[index].notes)))
+                    notes=notes)))
 
             popup.append(Text(
                 plugin_strings['lift_reviewed_ban_confirmation']))
@@ -405,6 +920,7 @@ class LiftAnyBanMenuCommand(_LiftBanMenuCommand):
             ))
 
         @self.confirm_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             if not option.value[1]:
                 return
@@ -427,10 +943,8 @@ class ReviewBanFeature(BaseFeature):
     ws_review_ban_pages = None
 
     def execute(self, client, banned_player_info, reason, duration):
-        GameThread(
-            target=self.banned_uniqueid_manager.review_ban,
-            args=(banned_player_info.id, reason, duration)
-        ).start()
+        self.banned_uniqueid_manager.review_ban(
+            banned_player_info.id, reason, duration)
 
         for ws_review_ban_page in self.ws_review_ban_pages:
             ws_review_ban_page.send_remove_ban_id(banned_player_info.id)
@@ -462,6 +976,7 @@ class ReviewBanMenuCommand(MenuCommand):
         self.duration_popup = PagedMenu(title=self.popup_title)
 
         @self.ban_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             client = clients[index]
             popup.clear()
@@ -475,11 +990,13 @@ class ReviewBanMenuCommand(MenuCommand):
                 ))
 
         @self.ban_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             self._selected_bans[index] = option.value
             clients[index].send_popup(self.reason_popup)
 
         @self.reason_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -495,11 +1012,13 @@ class ReviewBanMenuCommand(MenuCommand):
                 ))
 
         @self.reason_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             self._selected_bans[index] = option.value
             clients[index].send_popup(self.duration_popup)
 
         @self.duration_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -522,6 +1041,7 @@ class ReviewBanMenuCommand(MenuCommand):
                 ))
 
         @self.duration_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             self._popups_done(
                 clients[index],
@@ -550,10 +1070,8 @@ class RemoveBadBanFeature(BaseFeature):
     ws_remove_bad_ban_pages = None
 
     def execute(self, client, banned_player_info):
-        GameThread(
-            target=self.banned_uniqueid_manager.remove_ban_from_database,
-            args=(banned_player_info.id,)
-        ).start()
+        self.banned_uniqueid_manager.remove_ban_from_database(
+            banned_player_info.id)
 
         log_admin_action(plugin_strings['message ban_removed'].tokenized(
             admin_name=client.name,
@@ -568,6 +1086,16 @@ class RemoveBadBanMenuCommand(MenuCommand):
         super().__init__(feature, parent, title, id_)
 
         self._selected_bans = PlayerDictionary(lambda index: None)
+        self._selected_ban_details = PlayerDictionary(lambda index: ("", ""))
+
+        # IDs of the last bans on the previously shown pages (None for the
+        # first page). A new tuple is stored on every page change, so it
+        # also tells whether a loaded page is still the one that's wanted
+        self._page_starts = PlayerDictionary(lambda index: (None, ))
+
+        # Bans on the current page and the total number of bans, loaded
+        # from the database in a worker thread
+        self._ban_pages = PlayerDictionary(lambda index: ((), 0))
 
         self.ban_popup = PagedMenu(title=self.popup_title)
         if parent is not None:
@@ -576,10 +1104,29 @@ class RemoveBadBanMenuCommand(MenuCommand):
         self.remove_popup = SimpleMenu()
 
         @self.ban_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
-            for banned_player_info in self._get_bans(clients[index]):
+            bans, count = self._ban_pages[index]
+
+            popup.description = plugin_strings['ban_list total'].tokenized(
+                count=count)
+
+            # Page controls go first, so they aren't buried under the bans
+            if len(self._page_starts[index]) > 1:
+                popup.append(PagedOption(
+                    text=plugin_strings['ban_list previous_page'],
+                    value=_PREVIOUS_PAGE
+                ))
+
+            if len(bans) == BAN_LIST_PAGE_SIZE:
+                popup.append(PagedOption(
+                    text=plugin_strings['ban_list next_page'],
+                    value=_NEXT_PAGE
+                ))
+
+            for banned_player_info in bans:
                 popup.append(PagedOption(
                     text=plugin_strings['ban_record'].tokenized(
                         id=banned_player_info.uniqueid,
@@ -588,11 +1135,24 @@ class RemoveBadBanMenuCommand(MenuCommand):
                 ))
 
         @self.ban_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
+            if option.value is _PREVIOUS_PAGE:
+                self._page_starts[index] = self._page_starts[index][:-1]
+                self._load_ban_page(clients[index])
+                return
+
+            if option.value is _NEXT_PAGE:
+                bans = self._ban_pages[index][0]
+                self._page_starts[index] += (bans[-1].id, )
+                self._load_ban_page(clients[index])
+                return
+
             self._selected_bans[index] = option.value
-            clients[index].send_popup(self.remove_popup)
+            _send_with_ban_details(self, index, self.remove_popup)
 
         @self.remove_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -605,9 +1165,11 @@ class RemoveBadBanMenuCommand(MenuCommand):
                 plugin_strings['ban_record admin_steamid'].tokenized(
                     admin_steamid=self._selected_bans[index].banned_by)))
 
-            if self._selected_bans[index].notes:
+            notes = self._selected_ban_details[index][1]
+
+            if notes:
                 popup.append(Text(plugin_strings['ban_record notes'].tokenized(
-                    notes=self._selected_bans[index].notes)))
+                    notes=notes)))
 
             popup.append(Text(
                 plugin_strings['remove_bad_ban_confirmation']))
@@ -624,6 +1186,7 @@ class RemoveBadBanMenuCommand(MenuCommand):
             ))
 
         @self.remove_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             if not option.value[1]:
                 return
@@ -639,13 +1202,52 @@ class RemoveBadBanMenuCommand(MenuCommand):
 
         self._parent.select(client)
 
-    def _get_bans(self, client):
+    def _get_bans(self, client, after_id=None):
         # Get expired, unreviewed, unlifted bans
         return self.feature.banned_uniqueid_manager.get_all_bans(
+                unbanned=False, reviewed=False, expired=True,
+                after_id=after_id, limit=BAN_LIST_PAGE_SIZE)
+
+    def _count_bans(self, client):
+        return self.feature.banned_uniqueid_manager.count_all_bans(
                 unbanned=False, reviewed=False, expired=True)
 
+    def _fetch_ban_page(self, client, after_id, count_bans):
+        bans = self._get_bans(client, after_id)
+        return bans, self._count_bans(client) if count_bans else None
+
+    def _load_ban_page(self, client):
+        """Fetch the current page of bans in a worker thread, then send the
+        ban popup. Bans are only counted again on the first page."""
+        index = client.player.index
+        page_starts = self._page_starts[index]
+
+        def page_callback(future):
+
+            # The admin might have left or switched pages meanwhile
+            if self._page_starts.get(index) is not page_starts:
+                return
+
+            if future.exception() is not None:
+                client.tell(strings_common['unavailable'])
+                return
+
+            bans, count = future.result()
+            if count is None:
+                count = self._ban_pages[index][1]
+
+            self._ban_pages[index] = (bans, count)
+            self.ban_popup.set_player_page(index, 0)
+            client.send_popup(self.ban_popup)
+
+        executor.submit(
+            self._fetch_ban_page,
+            (client, page_starts[-1], len(page_starts) == 1),
+            callback=page_callback)
+
     def select(self, client):
-        client.send_popup(self.ban_popup)
+        self._page_starts[client.player.index] = (None, )
+        self._load_ban_page(client)
 
 
 class _BaseBanPage(BaseFeaturePage):
@@ -659,24 +1261,44 @@ class _BaseBanPage(BaseFeaturePage):
             'banId': ban_id,
         })
 
-    def _get_bans(self, client):
+    def _get_bans(self, client, after_id=None, limit=None):
         raise NotImplementedError
 
     def _get_ban_by_id(self, client, ban_id):
-        for banned_player_info in self._get_bans(client):
+        for banned_player_info in self._get_bans(
+                client, after_id=ban_id - 1, limit=1):
+
             if banned_player_info.id == ban_id:
                 return banned_player_info
         return None
 
+    def _get_ban_list_data(self, client, after_id=None):
+        bans = self._get_bans(client, after_id, BAN_LIST_PAGE_SIZE)
+
+        ban_data = []
+        for banned_player_info in bans:
+            ban_data.append({
+                'uniqueid': str(banned_player_info.uniqueid),
+                'banId': banned_player_info.id,
+                'name': banned_player_info.name,
+            })
+
+        # The client should ask for the next page after this ID
+        next_after_id = (
+            bans[-1].id if len(bans) == BAN_LIST_PAGE_SIZE else None)
+
+        return ban_data, next_after_id
+
 
 class LiftBanPage(_BaseBanPage):
     abstract = True
     page_abstract = True
     feature_page_abstract = True
 
-    def _get_bans(self, client):
+    def _get_bans(self, client, after_id=None, limit=None):
         return self.feature.banned_uniqueid_manager.get_active_bans(
-            banned_by=client.steamid, reviewed=False)
+            banned_by=client.steamid, reviewed=False, after_id=after_id,
+            limit=limit)
 
     def on_page_data_received(self, data):
         client = clients[self.index]
@@ -700,18 +1322,13 @@ class LiftBanPage(_BaseBanPage):
             return
 
         if data['action'] == "get-bans":
-            ban_data = []
-
-            for banned_player_info in self._get_bans(client):
-                ban_data.append({
-                    'uniqueid': str(banned_player_info.uniqueid),
-                    'banId': banned_player_info.id,
-                    'name': banned_player_info.name,
-                })
+            ban_data, next_after_id = self._get_ban_list_data(
+                client, data.get('afterId'))
 
             self.send_data({
                 'action': "bans",
                 'bans': ban_data,
+                'nextAfterId': next_after_id,
             })
 
 
@@ -720,9 +1337,10 @@ class ReviewBanPage(_BaseBanPage):
     page_abstract = True
     feature_page_abstract = True
 
-    def _get_bans(self, client):
+    def _get_bans(self, client, after_id=None, limit=None):
         return self.feature.banned_uniqueid_manager.get_active_bans(
-            banned_by=client.steamid, reviewed=False)
+            banned_by=client.steamid, reviewed=False, after_id=after_id,
+            limit=limit)
 
     def on_page_data_received(self, data):
         client = clients[self.index]
@@ -773,17 +1391,23 @@ class ReviewBanPage(_BaseBanPage):
                     'duration-title': duration_title,
                 })
 
-            ban_data = []
-            for banned_player_info in self._get_bans(client):
-                ban_data.append({
-                    'uniqueid': str(banned_player_info.uniqueid),
-                    'banId': banned_player_info.id,
-                    'name': banned_player_info.name,
-                })
+            ban_data, next_after_id = self._get_ban_list_data(client)
 
             self.send_data({
                 'action': "ban-data",
                 'bans': ban_data,
+                'nextAfterId': next_after_id,
                 'reasons': ban_reasons,
                 'durations': ban_durations,
             })
+            return
+
+        if data['action'] == "get-bans":
+            ban_data, next_after_id = self._get_ban_list_data(
+                client, data.get('afterId'))
+
+            self.send_data({
+                'action': "bans",
+                'bans': ban_data,
+                'nextAfterId': next_after_id,
+            })
@@ -1,19 +1,25 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+from ipaddress import ip_address, ip_network
+
 # Source.Python
 from listeners import OnClientConnect
-from listeners.tick import GameThread
 from players.entity import Player
-from players.helpers import get_client_language
+from players.helpers import get_client_language, index_from_edict
 from translations.manager import language_manager
 
 # Source.Python Admin
+from admin.core.clients import connected_clients
 from admin.core.helpers import (
     extract_ip_address, format_player_name, log_admin_action)
+from admin.core.metrics import metrics_registry
+from admin.core.profiler import profiled
 
 # Included Plugin
 from ..config import plugin_config
+from ..ip_trie import IPNetworkTrie
 from ..left_player import (
     LeftPlayerBasedMenuCommand, LeftPlayerBasedFeature,
     LeftPlayerBasedFeaturePage, LeftPlayerIter)
@@ -28,35 +34,141 @@ from .base import (
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
+IP_RANGE_PREFIX_IPV4 = plugin_config.getint(
+    'settings', 'ip_range_prefix_ipv4', fallback=24)
+IP_RANGE_PREFIX_IPV6 = plugin_config.getint(
+    'settings', 'ip_range_prefix_ipv6', fallback=64)
+
 _ws_ban_ip_address_pages = []
+_ws_ban_ip_range_pages = []
 _ws_lift_ip_address_pages = []
 _ws_review_ip_address_ban_pages = []
 
 
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_ip_range(ip_address_):
+    """Return the network (in CIDR notation) that a range ban issued
+    against the given IP address would cover."""
+    address = ip_address(ip_address_)
+    prefix = (
+        IP_RANGE_PREFIX_IPV4 if address.version == 4 else
+        IP_RANGE_PREFIX_IPV6)
+
+    return str(ip_network((address, prefix), strict=False))
+
+
+def _parse_ip_range(uniqueid):
+    if '/' not in uniqueid:
+        return None
+
+    return ip_network(uniqueid, strict=False)
+
+
 # =============================================================================
 # >> CLASSES
 # =============================================================================
 class _BannedIPAddressManager(BannedUniqueIDManager):
     model = BannedIPAddress
 
+    def __init__(self):
+        super().__init__()
+
+        # Range bans (they're kept in the primary dict as well)
+        self._banned_ip_ranges = IPNetworkTrie()
+
+    def __setitem__(self, uniqueid, banned_player_info):
+        super().__setitem__(uniqueid, banned_player_info)
+
+        ip_range = _parse_ip_range(uniqueid)
+        if ip_range is not None:
+            self._banned_ip_ranges[ip_range] = banned_player_info
+
+    def __delitem__(self, uniqueid):
+        super().__delitem__(uniqueid)
+
+        ip_range = _parse_ip_range(uniqueid)
+        if ip_range is not None:
+            del self._banned_ip_ranges[ip_range]
+
+    def pop(self, uniqueid, *args):
+        if uniqueid in self:
+            ip_range = _parse_ip_range(uniqueid)
+            if ip_range is not None:
+                del self._banned_ip_ranges[ip_range]
+
+        return super().pop(uniqueid, *args)
+
+    def clear(self):
+        super().clear()
+        self._banned_ip_ranges.clear()
+
+    def is_banned(self, uniqueid):
+        # A range is banned if a ban on it or on a wider range is in effect
+        ip_range = _parse_ip_range(uniqueid)
+        if ip_range is not None:
+            return self._banned_ip_ranges.get_network(ip_range) is not None
+
+        if super().is_banned(uniqueid):
+            return True
+
+        if not self._banned_ip_ranges:
+            return False
+
+        try:
+            address = ip_address(uniqueid)
+        except ValueError:
+            return False
+
+        return self._banned_ip_ranges.get(address) is not None
+
     def _convert_uniqueid_to_db_format(self, uniqueid):
+        ip_range = _parse_ip_range(uniqueid)
+        if ip_range is None:
+            return uniqueid
+
+        return str(ip_range)
+
+    def _convert_uniqueid_to_key(self, uniqueid):
+        return self._convert_uniqueid_to_db_format(uniqueid)
+
+    def _convert_db_format_to_key(self, uniqueid):
         return uniqueid
 
+    def on_ban_removed(self, banned_player_info):
+        for ws_lift_ban_page in _ws_lift_ip_address_pages:
+            ws_lift_ban_page.send_remove_ban_id(banned_player_info.id)
+
+        for ws_review_ban_page in _ws_review_ip_address_ban_pages:
+            ws_review_ban_page.send_remove_ban_id(banned_player_info.id)
+
 # The singleton object for the _BannedIPAddressManager class.
 banned_ip_address_manager = _BannedIPAddressManager()
 
+metrics_registry.gauge(
+    "bans.ip_address.cache_size", lambda: len(banned_ip_address_manager))
+metrics_registry.gauge(
+    "bans.ip_address.details_cache_size",
+    lambda: len(banned_ip_address_manager._ban_details))
+
 
 class _BanIPAddressFeature(LeftPlayerBasedFeature):
     flag = "admin.admin_kick_ban.ban_ip_address"
     allow_execution_on_self = False
+    ws_ban_pages = _ws_ban_ip_address_pages
+
+    @staticmethod
+    def get_uniqueid(left_player):
+        return extract_ip_address(left_player.address)
 
     def execute(self, client, left_player):
         if left_player.is_fake_client() or left_player.is_hltv():
             client.tell(plugin_strings['error bot_cannot_ban'])
             return
 
-        ip_address = extract_ip_address(left_player.address)
-        if banned_ip_address_manager.is_banned(ip_address):
+        uniqueid = self.get_uniqueid(left_player)
+        if banned_ip_address_manager.is_banned(uniqueid):
             client.tell(plugin_strings['error already_ban_in_effect'])
             return
 
@@ -73,13 +185,11 @@ class _BanIPAddressFeature(LeftPlayerBasedFeature):
 
         duration = int(plugin_config['settings']['default_ban_time_seconds'])
 
-        GameThread(
-            target=banned_ip_address_manager.save_ban_to_database,
-            args=(client.steamid, ip_address, left_player.name, duration)
-        ).start()
+        banned_ip_address_manager.save_ban_to_database(
+            client.steamid, uniqueid, left_player.name, duration)
 
-        for ws_ban_ip_address_page in _ws_ban_ip_address_pages:
-            ws_ban_ip_address_page.send_remove_id(left_player)
+        for ws_ban_page in self.ws_ban_pages:
+            ws_ban_page.send_remove_id(left_player)
 
         log_admin_action(plugin_strings['message banned'].tokenized(
             admin_name=client.name,
@@ -90,21 +200,33 @@ class _BanIPAddressFeature(LeftPlayerBasedFeature):
 ban_ip_address_feature = _BanIPAddressFeature()
 
 
+class _BanIPRangeFeature(_BanIPAddressFeature):
+    flag = "admin.admin_kick_ban.ban_ip_range"
+    ws_ban_pages = _ws_ban_ip_range_pages
+
+    @staticmethod
+    def get_uniqueid(left_player):
+        return get_ip_range(extract_ip_address(left_player.address))
+
+# The singleton object of the _BanIPRangeFeature class.
+ban_ip_range_feature = _BanIPRangeFeature()
+
+
 class BanIPAddressMenuCommand(LeftPlayerBasedMenuCommand):
     base_filter = 'human'
     allow_multiple_choices = False
 
-    @staticmethod
-    def render_player_name(left_player):
+    def render_player_name(self, left_player):
         return plugin_strings['player_name'].tokenized(
             name=format_player_name(left_player.name),
-            id=extract_ip_address(left_player.address)
+            id=self.feature.get_uniqueid(left_player)
         )
 
     def _iter(self):
         for left_player in LeftPlayerIter(self.base_filter):
-            ip_address = extract_ip_address(left_player.address)
-            if banned_ip_address_manager.is_banned(ip_address):
+            if banned_ip_address_manager.is_banned(
+                    self.feature.get_uniqueid(left_player)):
+
                 continue
 
             yield left_player
@@ -165,14 +287,15 @@ class BanIPAddressPage(LeftPlayerBasedFeaturePage):
         super().__init__(index, page_request_type)
 
         if self.is_websocket:
-            _ws_ban_ip_address_pages.append(self)
+            self.feature.ws_ban_pages.append(self)
 
     def filter(self, left_player):
         if not super().filter(left_player):
             return False
 
-        ip_address = extract_ip_address(left_player.address)
-        if banned_ip_address_manager.is_banned(ip_address):
+        if banned_ip_address_manager.is_banned(
+                self.feature.get_uniqueid(left_player)):
+
             return False
 
         return True
@@ -180,8 +303,13 @@ class BanIPAddressPage(LeftPlayerBasedFeaturePage):
     def on_error(self, error):
         super().on_error(error)
 
-        if self.is_websocket and self in _ws_ban_ip_address_pages:
-            _ws_ban_ip_address_pages.remove(self)
+        if self.is_websocket and self in self.feature.ws_ban_pages:
+            self.feature.ws_ban_pages.remove(self)
+
+
+class BanIPRangePage(BanIPAddressPage):
+    page_id = "ban_ip_range"
+    feature = ban_ip_range_feature
 
 
 class LiftIPAddressBanPage(LiftBanPage):
@@ -226,8 +354,9 @@ class ReviewIPAddressBanPage(ReviewBanPage):
 # >> LISTENERS
 # =============================================================================
 @OnClientConnect
+@profiled
 def listener_on_client_connect(
-        allow_connect, index, name, address, reject_message, max_reject_len):
+        allow_connect, edict, name, address, reject_message, max_reject_len):
 
     ip_address = extract_ip_address(address)
     if not banned_ip_address_manager.is_banned(ip_address):
@@ -235,6 +364,11 @@ def listener_on_client_connect(
 
     allow_connect.set_bool(False)
 
+    # Rejected clients never disconnect, so they have to be forgotten now
+    connected_clients.on_client_disconnect(index_from_edict(edict))
+
+    metrics_registry.counter("bans.ip_address.connect_rejections").increment()
+
     reason = plugin_strings['default_ban_reason'].get_string(
         language_manager.default)
     reason = reason.encode('utf-8')[:max_reject_len].decode('utf-8', 'ignore')
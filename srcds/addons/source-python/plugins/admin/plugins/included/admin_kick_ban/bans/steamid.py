@@ -2,15 +2,17 @@
 # >> IMPORTS
 # =============================================================================
 # Source.Python
-from engines.server import server
 from listeners import OnNetworkidValidated
-from listeners.tick import GameThread
 from players.entity import Player
 from players.helpers import get_client_language
 
 # Source.Python Admin
 from admin.core import admin_core_logger
+from admin.core.clients import connected_clients
 from admin.core.helpers import format_player_name, log_admin_action
+from admin.core.metrics import metrics_registry
+from admin.core.profiler import profiled
+from admin.core.steamid import get_steamid64
 
 # Custom Package
 try:
@@ -41,12 +43,7 @@ from .base import (
 # >> FUNCTIONS
 # =============================================================================
 def find_client(steamid):
-    for x in range(server.num_clients):
-        client = server.get_client(x)
-        if client.steamid == steamid:
-            return client
-
-    return None
+    return connected_clients.get_client_by_steamid(steamid)
 
 
 # =============================================================================
@@ -66,9 +63,28 @@ class _BannedSteamIDManager(BannedUniqueIDManager):
     def _convert_uniqueid_to_db_format(self, uniqueid):
         return self._convert_steamid_to_db_format(uniqueid)
 
+    def _convert_uniqueid_to_key(self, uniqueid):
+        return get_steamid64(uniqueid)
+
+    def _convert_db_format_to_key(self, uniqueid):
+        return int(uniqueid)
+
+    def on_ban_removed(self, banned_player_info):
+        for ws_lift_ban_page in _ws_lift_steamid_pages:
+            ws_lift_ban_page.send_remove_ban_id(banned_player_info.id)
+
+        for ws_review_ban_page in _ws_review_steamid_ban_pages:
+            ws_review_ban_page.send_remove_ban_id(banned_player_info.id)
+
 # The singleton object for the _BannedSteamIDManager class.
 banned_steamid_manager = _BannedSteamIDManager()
 
+metrics_registry.gauge(
+    "bans.steamid.cache_size", lambda: len(banned_steamid_manager))
+metrics_registry.gauge(
+    "bans.steamid.details_cache_size",
+    lambda: len(banned_steamid_manager._ban_details))
+
 
 class _BanSteamIDFeature(LeftPlayerBasedFeature):
     flag = "admin.admin_kick_ban.ban_steamid"
@@ -96,15 +112,8 @@ class _BanSteamIDFeature(LeftPlayerBasedFeature):
 
         duration = int(plugin_config['settings']['default_ban_time_seconds'])
 
-        GameThread(
-            target=banned_steamid_manager.save_ban_to_database,
-            args=(
-                client.steamid,
-                left_player.steamid,
-                left_player.name,
-                duration
-            )
-        ).start()
+        banned_steamid_manager.save_ban_to_database(
+            client.steamid, left_player.steamid, left_player.name, duration)
 
         for ws_ban_steamid_page in _ws_ban_steamid_pages:
             ws_ban_steamid_page.send_remove_id(left_player)
@@ -252,6 +261,7 @@ class ReviewSteamIDBanPage(ReviewBanPage):
 # >> LISTENERS
 # =============================================================================
 @OnNetworkidValidated
+@profiled
 def listener_on_networkid_validated(name, steamid):
     if not banned_steamid_manager.is_banned(steamid):
         return
@@ -267,8 +277,12 @@ def listener_on_networkid_validated(name, steamid):
 # >> CONNECT FILTERS
 # =============================================================================
 @ConnectFilter
+@profiled
 def connect_filter(client):
     if banned_steamid_manager.is_banned(client.steamid):
+        metrics_registry.counter(
+            "bans.steamid.connect_rejections").increment()
+
         return plugin_strings['default_ban_reason']
 
     return None
@@ -0,0 +1,294 @@
+"""Bulk import and export of bans.
+
+Supported formats:
+
+* ``.cfg`` - engine's banned_user.cfg ("banid <minutes> <steamid>") and
+  banned_ip.cfg ("addip <minutes> <ip address>"). Exports only contain
+  active permanent bans, as the engine doesn't know about the rest.
+* ``.csv`` - comma separated values with a header row.
+* ``.jsonl`` - one JSON object per line.
+
+CSV and JSONL rows have a "type" field ("steamid" or "ip_address") plus
+the fields listed in EXPORT_FIELDS. Only "type" and "uniqueid" are
+required on import.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import csv
+from ipaddress import ip_address, ip_network
+import json
+from time import time
+
+# Source.Python
+from paths import GAME_PATH
+
+# Source.Python Admin
+from admin.core.executor import executor
+from admin.core.orm import SessionContext
+from admin.core.steamid import STEAMID64_BASE
+
+# Included Plugin
+from .base import EXPORT_FIELDS
+from .ip_address import banned_ip_address_manager
+from .steamid import banned_steamid_manager
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# How many bans are inserted in one transaction
+IMPORT_BATCH_SIZE = 5000
+
+_managers = {
+    'steamid': banned_steamid_manager,
+    'ip_address': banned_ip_address_manager,
+}
+
+_cfg_commands = {
+    'banid': 'steamid',
+    'addip': 'ip_address',
+}
+
+_true_values = ('1', 'true', 'yes')
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def import_bans(file_name, report):
+    """Import bans from the given file in a worker thread.
+
+    :param str file_name: Path to the file (relative to the game directory).
+    :param report: Callable that receives progress messages. It's called
+    in the game thread.
+    """
+    path = GAME_PATH / file_name
+    if not path.isfile():
+        report("File not found: {}".format(path))
+        return
+
+    def callback(future):
+        if future.exception() is not None:
+            report("Import from {} has failed: {}".format(
+                path, future.exception()))
+
+            return
+
+        imported, skipped = future.result()
+
+        banned_steamid_manager.refresh()
+        banned_ip_address_manager.refresh()
+
+        report("Imported {} bans from {} ({} skipped)".format(
+            imported, path, skipped))
+
+    executor.submit(_import_bans, (path, report), callback=callback)
+
+
+def export_bans(file_name, report):
+    """Export bans to the given file in a worker thread.
+
+    :param str file_name: Path to the file (relative to the game directory).
+    :param report: Callable that receives progress messages. It's called
+    in the game thread.
+    """
+    path = GAME_PATH / file_name
+
+    def callback(future):
+        if future.exception() is not None:
+            report("Export to {} has failed: {}".format(
+                path, future.exception()))
+
+            return
+
+        report("Exported {} bans to {}".format(future.result(), path))
+
+    executor.submit(_export_bans, (path, ), callback=callback)
+
+
+def _import_bans(path, report):
+    imported = skipped = 0
+    batches = {ban_type: [] for ban_type in _managers}
+
+    def flush():
+        nonlocal imported, skipped
+
+        futures = []
+        for ban_type, rows in batches.items():
+            if rows:
+                futures.append((
+                    _managers[ban_type].import_bans_to_database(rows),
+                    len(rows)
+                ))
+
+                batches[ban_type] = []
+
+        # Bans that are already in the database are skipped
+        for future, rows_number in futures:
+            inserted = future.result()
+            imported += inserted
+            skipped += rows_number - inserted
+
+        executor.sync_execution(report, (
+            "{} bans imported so far...".format(imported), ))
+
+    with open(path, encoding='utf-8', newline='') as f:
+        for raw_row in _read_rows(path, f):
+            try:
+                ban_type, row = _normalize_row(raw_row)
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+
+            batches[ban_type].append(row)
+
+            if sum(map(len, batches.values())) >= IMPORT_BATCH_SIZE:
+                flush()
+
+    flush()
+    return imported, skipped
+
+
+def _read_rows(path, f):
+    extension = path.ext.lower()
+
+    if extension == '.cfg':
+
+        # The engine doesn't store when the bans were issued. Use the file's
+        # modification time, so that importing the same file again doesn't
+        # duplicate them.
+        banned_at = int(path.mtime)
+
+        for line in f:
+            words = line.split()
+            if len(words) != 3 or words[0].lower() not in _cfg_commands:
+                continue
+
+            try:
+                minutes = float(words[1])
+            except ValueError:
+                continue
+
+            yield {
+                'type': _cfg_commands[words[0].lower()],
+                'uniqueid': words[2],
+                'banned_at': banned_at,
+                'expires_at': (
+                    -1 if minutes <= 0 else int(time() + minutes * 60)),
+                'reviewed': True,
+                'reason': "Imported from {}".format(path.name),
+            }
+
+    elif extension == '.csv':
+        yield from csv.DictReader(f)
+
+    elif extension in ('.jsonl', '.json'):
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+    else:
+        raise ValueError("Unsupported file format: {}".format(extension))
+
+
+def _normalize_row(raw_row):
+    ban_type = raw_row['type']
+    manager = _managers[ban_type]
+
+    uniqueid = str(raw_row['uniqueid']).strip()
+    if ban_type == 'ip_address':
+        if '/' in uniqueid:
+            ip_network(uniqueid, strict=False)
+        else:
+            ip_address(uniqueid)
+
+    banned_by = raw_row.get('banned_by') or ""
+    if banned_by:
+        banned_by = manager.convert_steamid_to_db_format(banned_by)
+
+    return ban_type, {
+        'uniqueid': manager.convert_uniqueid_to_db_format(uniqueid),
+        'name': raw_row.get('name') or "",
+        'banned_by': banned_by,
+        'banned_at': _to_int(raw_row.get('banned_at'), int(time())),
+        'expires_at': _to_int(raw_row.get('expires_at'), -1),
+        'reviewed': _to_bool(raw_row.get('reviewed', True)),
+        'reason': raw_row.get('reason') or "",
+        'notes': raw_row.get('notes') or "",
+        'is_unbanned': _to_bool(raw_row.get('is_unbanned', False)),
+        'unbanned_by': raw_row.get('unbanned_by') or "",
+    }
+
+
+def _to_int(value, default):
+    # 0 is a valid timestamp, only missing values (None in JSONL, empty
+    # strings in CSV) fall back to the default
+    if value is None or value == "":
+        return default
+
+    return int(value)
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in _true_values
+
+    return bool(value)
+
+
+def _export_bans(path):
+    extension = path.ext.lower()
+    exported = 0
+
+    with open(path, 'w', encoding='utf-8', newline='') as f, \
+            SessionContext() as session:
+
+        if extension == '.cfg':
+            if 'ip' in path.namebase.lower():
+                ban_type, command = 'ip_address', 'addip'
+            else:
+                ban_type, command = 'steamid', 'banid'
+
+            for row in _managers[ban_type].iter_bans_for_export(session):
+                if row['is_unbanned'] or row['expires_at'] >= 0:
+                    continue
+
+                uniqueid = row['uniqueid']
+                if ban_type == 'ip_address':
+
+                    # The engine only bans exact addresses
+                    if '/' in uniqueid:
+                        continue
+                else:
+                    account_id = int(uniqueid) - STEAMID64_BASE
+                    uniqueid = "STEAM_0:{}:{}".format(
+                        account_id % 2, account_id // 2)
+
+                f.write("{} 0 {}\n".format(command, uniqueid))
+                exported += 1
+
+            return exported
+
+        if extension == '.csv':
+            writer = csv.DictWriter(f, ('type', ) + EXPORT_FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+
+        elif extension in ('.jsonl', '.json'):
+            def write(row):
+                f.write(json.dumps(row) + "\n")
+
+        else:
+            raise ValueError("Unsupported file format: {}".format(extension))
+
+        for ban_type, manager in _managers.items():
+            for row in manager.iter_bans_for_export(session):
+                row['type'] = ban_type
+                write(row)
+                exported += 1
+
+    return exported
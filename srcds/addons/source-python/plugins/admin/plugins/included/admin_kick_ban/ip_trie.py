@@ -0,0 +1,113 @@
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class _TrieNode:
+    __slots__ = ('children', 'value')
+
+    def __init__(self):
+        self.children = [None, None]
+        self.value = None
+
+
+class IPNetworkTrie:
+    """Binary trie that maps IPv4/IPv6 networks to values.
+
+    Both insertion and lookup walk one node per prefix bit, so the cost
+    doesn't depend on how many networks are stored.
+    """
+    def __init__(self):
+        self._roots = {4: _TrieNode(), 6: _TrieNode()}
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __setitem__(self, network, value):
+        """Store the value for the given network.
+
+        :param network: ipaddress.IPv4Network or ipaddress.IPv6Network.
+        """
+        node = self._roots[network.version]
+        for bit in self._iter_bits(
+                network.network_address, network.prefixlen):
+
+            if node.children[bit] is None:
+                node.children[bit] = _TrieNode()
+
+            node = node.children[bit]
+
+        if node.value is None:
+            self._length += 1
+
+        node.value = value
+
+    def __delitem__(self, network):
+        path = [self._roots[network.version]]
+        bits = list(self._iter_bits(
+            network.network_address, network.prefixlen))
+
+        for bit in bits:
+            node = path[-1].children[bit]
+            if node is None:
+                raise KeyError(network)
+
+            path.append(node)
+
+        if path[-1].value is None:
+            raise KeyError(network)
+
+        path[-1].value = None
+        self._length -= 1
+
+        # Prune the nodes that don't lead anywhere anymore
+        for bit in reversed(bits):
+            node = path.pop()
+            if node.value is not None or any(node.children):
+                break
+
+            path[-1].children[bit] = None
+
+    def get(self, address, default=None):
+        """Return the value of the most specific network that contains the
+        given address.
+
+        :param address: ipaddress.IPv4Address or ipaddress.IPv6Address.
+        """
+        return self._lookup(address, address.max_prefixlen, default)
+
+    def get_network(self, network, default=None):
+        """Return the value of the most specific network that contains the
+        whole given network (including the network itself).
+
+        :param network: ipaddress.IPv4Network or ipaddress.IPv6Network.
+        """
+        return self._lookup(
+            network.network_address, network.prefixlen, default)
+
+    def _lookup(self, address, length, default):
+        node = self._roots[address.version]
+        result = node.value
+
+        for bit in self._iter_bits(address, length):
+            node = node.children[bit]
+            if node is None:
+                break
+
+            if node.value is not None:
+                result = node.value
+
+        return default if result is None else result
+
+    def clear(self):
+        self._roots = {4: _TrieNode(), 6: _TrieNode()}
+        self._length = 0
+
+    @staticmethod
+    def _iter_bits(address, length):
+        value = int(address)
+        for shift in range(
+                address.max_prefixlen - 1,
+                address.max_prefixlen - 1 - length,
+                -1):
+
+            yield (value >> shift) & 1
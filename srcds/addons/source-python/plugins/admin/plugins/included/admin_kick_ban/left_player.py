@@ -11,6 +11,7 @@ from admin.core.clients import RemoteClient
 from admin.core.features import BaseFeature
 from admin.core.frontends.menus import BasePlayerBasedMenuCommand
 from admin.core.frontends.motd import BasePlayerBasedFeaturePage
+from admin.core.profiler import profiled
 
 # Included Plugin
 from .config import plugin_config
@@ -192,6 +193,7 @@ class LeftPlayerBasedFeaturePage(BasePlayerBasedFeaturePage):
 # >> LISTENERS
 # =============================================================================
 @OnClientActive
+@profiled
 def listener_on_client_active(index):
     left_player = LeftPlayer(index, disconnected=False)
     for ws_left_player_based_page in _ws_left_player_based_pages:
@@ -202,6 +204,7 @@ def listener_on_client_active(index):
 
 
 @OnClientDisconnect
+@profiled
 def listener_on_client_disconnect(index):
     try:
         left_player = LeftPlayer(index, disconnected=True)
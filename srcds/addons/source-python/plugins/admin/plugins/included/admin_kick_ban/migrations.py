@@ -0,0 +1,71 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+from sqlalchemy import Column, Integer, column, table, update
+
+# Source.Python Admin
+from admin.core.migrations import (
+    add_missing_column, create_index, drop_column, drop_index, Migration,
+    migration_manager)
+
+# Included Plugin
+from .models import BannedIPAddress, BannedSteamID
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Table names mapped to the name of their uniqueid column
+TABLES = (
+    (BannedSteamID.__tablename__, 'steamid64'),
+    (BannedIPAddress.__tablename__, 'ip_address'),
+)
+
+
+# =============================================================================
+# >> MIGRATIONS
+# =============================================================================
+@migration_manager.register
+class _AddIndexes(Migration):
+    scope = "admin_kick_ban"
+    version = 1
+
+    def upgrade(self, connection):
+        for table_name, uniqueid_column in TABLES:
+            for column_name in (uniqueid_column, 'banned_by', 'expires_at'):
+                create_index(
+                    connection, table_name,
+                    'ix_' + table_name + '_' + column_name, column_name)
+
+    def downgrade(self, connection):
+        for table_name, uniqueid_column in TABLES:
+            for column_name in (uniqueid_column, 'banned_by', 'expires_at'):
+                drop_index(
+                    connection, table_name,
+                    'ix_' + table_name + '_' + column_name)
+
+
+@migration_manager.register
+class _AddUpdatedAt(Migration):
+    scope = "admin_kick_ban"
+    version = 2
+
+    def upgrade(self, connection):
+        for table_name, uniqueid_column in TABLES:
+            if add_missing_column(
+                    connection, table_name, Column('updated_at', Integer)):
+
+                table_ = table(
+                    table_name, column('banned_at'), column('updated_at'))
+
+                connection.execute(update(table_).values(
+                    updated_at=table_.c.banned_at))
+
+            create_index(
+                connection, table_name, 'ix_' + table_name + '_updated_at',
+                'updated_at')
+
+    def downgrade(self, connection):
+        for table_name, uniqueid_column in TABLES:
+            drop_column(connection, table_name, 'updated_at')
@@ -6,6 +6,7 @@ from time import time
 
 # Site-Package
 from sqlalchemy import Boolean, Column, Integer, String, Text
+from sqlalchemy.orm import synonym
 
 # Source.Python Admin
 from admin.core.config import config
@@ -20,11 +21,11 @@ class _BannedUser(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(64))
-    banned_by = Column(String(32))
+    banned_by = Column(String(32), index=True)
     reviewed = Column(Boolean)
 
     banned_at = Column(Integer)
-    expires_at = Column(Integer)
+    expires_at = Column(Integer, index=True)
 
     is_unbanned = Column(Boolean)
     unbanned_by = Column(String(32))
@@ -32,6 +33,9 @@ class _BannedUser(Base):
     reason = Column(Text)
     notes = Column(Text)
 
+    # Last time the row has changed, used to sync bans between servers
+    updated_at = Column(Integer, index=True)
+
     def __init__(self, uniqueid, name, banned_by, duration):
         super().__init__()
 
@@ -42,45 +46,36 @@ class _BannedUser(Base):
         self.banned_by = banned_by
         self.reviewed = False
         self.banned_at = int(current_time)
-        self.expires_at = int(current_time + duration)
+        self.expires_at = -1 if duration < 0 else int(current_time + duration)
         self.is_unbanned = False
         self.unbanned_by = ""
         self.reason = ""
         self.notes = ""
+        self.updated_at = int(current_time)
 
     def review(self, reason, duration):
         self.reviewed = True
-        self.expires_at = int(time() + duration)
+        self.expires_at = -1 if duration < 0 else int(time() + duration)
         self.reason = reason
+        self.updated_at = int(time())
 
     def lift_ban(self, unbanned_by):
         self.is_unbanned = True
         self.unbanned_by = unbanned_by
+        self.updated_at = int(time())
 
 
 class BannedSteamID(_BannedUser):
     __tablename__ = config['database']['prefix'] + "banned_steamid"
 
-    steamid64 = Column(String(32))
-
-    def get_uniqueid(self):
-        return self.steamid64
-
-    def set_uniqueid(self, uniqueid):
-        self.steamid64 = uniqueid
+    steamid64 = Column(String(32), index=True)
 
-    uniqueid = property(get_uniqueid, set_uniqueid)
+    uniqueid = synonym('steamid64')
 
 
 class BannedIPAddress(_BannedUser):
     __tablename__ = config['database']['prefix'] + "banned_ip_address"
 
-    ip_address = Column(String(48))
-
-    def get_uniqueid(self):
-        return self.ip_address
-
-    def set_uniqueid(self, uniqueid):
-        self.ip_address = uniqueid
+    ip_address = Column(String(48), index=True)
 
-    uniqueid = property(get_uniqueid, set_uniqueid)
+    uniqueid = synonym('ip_address')
@@ -14,6 +14,7 @@ from admin.core.frontends.motd import (
     main_motd, MOTDSection, MOTDPageEntry, PlayerBasedFeaturePage)
 from admin.core.helpers import log_admin_action
 from admin.core.plugins.strings import PluginStrings
+from admin.core.profiler import profiled
 
 
 # =============================================================================
@@ -145,6 +146,7 @@ motd_resurrect_page_entry = motd_section.add_entry(MOTDPageEntry(
 # >> EVENTS
 # =============================================================================
 @Event('player_death')
+@profiled
 def on_player_death(ev):
     player = Player.from_userid(ev['userid'])
     for ws_slay_page in _ws_slay_pages:
@@ -158,6 +160,7 @@ def on_player_death(ev):
 
 
 @Event('player_spawn')
+@profiled
 def on_player_spawn(ev):
     player = Player.from_userid(ev['userid'])
     for ws_slay_page in _ws_slay_pages:
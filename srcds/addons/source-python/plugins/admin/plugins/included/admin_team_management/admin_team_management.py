@@ -13,6 +13,7 @@ from admin.core.frontends.menus import (
     main_menu, MenuSection, PlayerBasedMenuCommand)
 from admin.core.helpers import log_admin_action
 from admin.core.plugins.strings import PluginStrings
+from admin.core.profiler import profiled
 
 
 # =============================================================================
@@ -139,6 +140,7 @@ delayed_move_to_ct_menu_command = menu_section.add_entry(
 # >> EVENTS
 # =============================================================================
 @Event('round_end')
+@profiled
 def on_round_end(ev):
     for index, team in delayed_swaps.items():
         if team is None:
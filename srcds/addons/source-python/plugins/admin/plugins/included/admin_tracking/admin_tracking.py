@@ -10,14 +10,13 @@ from time import localtime, strftime, time
 from commands import CommandReturn
 from events import Event
 from listeners import OnClientActive
-from listeners.tick import GameThread
 from menus import PagedMenu, PagedOption, SimpleMenu, Text
 from players.dictionary import PlayerDictionary
 from players.entity import Player
-from steam import SteamID
 
 # Source.Python Admin
-from admin.core.clients import clients
+from admin.core.clients import clients, connected_clients
+from admin.core.executor import executor
 from admin.core.helpers import extract_ip_address, format_player_name
 from admin.core.features import (
     BaseFeature, BasePlayerBasedFeature, PlayerBasedFeature)
@@ -26,14 +25,23 @@ from admin.core.frontends.commands import (
 from admin.core.frontends.menus import (
     main_menu, MenuSection, PlayerBasedMenuCommand)
 from admin.core.helpers import chat_message, console_message
-from admin.core.orm import SessionContext
+from admin.core.orm import database_writer, SessionContext
 from admin.core.paths import ADMIN_CFG_PATH, get_server_file
+from admin.core.plugins import admin_plugins_logger
 from admin.core.plugins.strings import PluginStrings
+from admin.core.profiler import profiled
+from admin.core.steamid import get_steamid64
 
 # Included Plugin
 from .models import TrackedPlayerRecord as DB_Record
 
 
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+admin_tracking_logger = admin_plugins_logger.admin_tracking
+
+
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================
@@ -52,27 +60,58 @@ def _remove_old_database_records():
         session.commit()
 
 
-def _get_records_for_steamid(steamid):
+def _get_records_for_steamid(steamid, callback):
+    """Collect all records for the given SteamID.
+
+    Live records are collected right away, the database is queried in a
+    worker thread. Then the callback is called in the game thread with the
+    complete list of records.
+
+    :raise ValueError: If the given SteamID is invalid.
+    """
     records = []
-    steamid64 = str(SteamID.parse(steamid).to_uint64())
+    steamid64 = str(get_steamid64(steamid))
 
     # Firstly, add live records (if player is on the server)
-    for tracked_player in tracked_players.values():
-        if tracked_player.steamid == steamid64:
-            for record in reversed(tracked_player):
-                records.append(_TrackRecordReport(
-                    steamid64,
-                    record.ip_address,
-                    record.name,
-                    record.seen_at,
-                    live=True
-                ))
-
-            break
+    index = connected_clients.get_index_by_steamid(steamid64)
+    tracked_player = None if index is None else tracked_players.get(index)
+    if tracked_player is not None and tracked_player.steamid == steamid64:
+        for record in reversed(tracked_player):
+            records.append(_TrackRecordReport(
+                steamid64,
+                record.ip_address,
+                record.name,
+                record.seen_at,
+                live=True
+            ))
 
     # Secondly, add records from the database
-    with SessionContext() as session:
+    def db_records_callback(future):
+        callback(records + _get_db_records_result(future))
+
+    executor.submit(
+        _get_db_records_for_steamid, (steamid64, ),
+        callback=db_records_callback)
+
+
+def _get_db_records_result(future):
+    """Return the records loaded from the database, or an empty list if
+    loading has failed - so that the admin still gets the live records
+    instead of a popup that never goes away."""
+    if future.exception() is not None:
+        admin_tracking_logger.log_message(
+            "Couldn't load tracking records from the database: {}".format(
+                future.exception()))
+
+        return []
 
+    return future.result()
+
+
+def _get_db_records_for_steamid(steamid64):
+    records = []
+
+    with SessionContext() as session:
         db_records = (
             session
             .query(DB_Record)
@@ -93,12 +132,19 @@ def _get_records_for_steamid(steamid):
     return records
 
 
-def _get_records_for_ip_address(ip_address):
+def _get_records_for_ip_address(ip_address, callback):
+    """Collect all records for the given IP address.
+
+    Live records are collected right away, the database is queried in a
+    worker thread. Then the callback is called in the game thread with the
+    complete list of records.
+    """
     records = []
     seen_steamids = []
 
     # Firstly, add live records (if player is on the server)
-    for tracked_player in tracked_players.values():
+    for index in connected_clients.get_indexes_by_ip_address(ip_address):
+        tracked_player = tracked_players.get(index)
         if not tracked_player:
             continue
 
@@ -118,6 +164,24 @@ def _get_records_for_ip_address(ip_address):
         ))
 
     # Secondly, add records from the database
+    def db_records_callback(future):
+        for db_record in _get_db_records_result(future):
+            if db_record.steamid in seen_steamids:
+                continue
+
+            seen_steamids.append(db_record.steamid)
+            records.append(db_record)
+
+        callback(records)
+
+    executor.submit(
+        _get_db_records_for_ip_address, (ip_address, ),
+        callback=db_records_callback)
+
+
+def _get_db_records_for_ip_address(ip_address):
+    records = []
+
     with SessionContext() as session:
         db_records = (
             session
@@ -128,11 +192,6 @@ def _get_records_for_ip_address(ip_address):
         )
 
     for db_record in db_records:
-        if db_record.steamid64 in seen_steamids:
-            continue
-
-        seen_steamids.append(db_record.steamid64)
-
         records.append(_TrackRecordReport(
             db_record.steamid64,
             db_record.ip_address,
@@ -180,7 +239,7 @@ class _TrackedPlayer(list):
                 'BOT' in self.player.steamid
         ):
 
-            self.steamid = str(SteamID.parse(self.player.steamid).to_uint64())
+            self.steamid = str(get_steamid64(self.player.steamid))
 
     def track(self, name=None):
         if self.steamid is None:
@@ -194,49 +253,52 @@ class _TrackedPlayer(list):
 
     def save_to_database(self):
         if self.steamid is None:
-            return
+            return None
 
-        with SessionContext() as session:
-            db_record = (
-                session
-                .query(DB_Record)
-                .filter_by(steamid64=self.steamid)
-                .order_by(DB_Record.seen_at.desc())
-                .first()
-            )
+        future = database_writer.submit(
+            self._save_records, self.steamid, self[:])
 
-            if db_record is None:
-                last_name = last_ip_address = ""
-            else:
-                last_name = db_record.name
-                last_ip_address = db_record.ip_address
+        self.clear()
+        return future
 
-            for record in self:
-                if (
-                        record.name == last_name and
-                        record.ip_address == last_ip_address
-                ):
-                    continue
+    @staticmethod
+    def _save_records(session, steamid, records):
+        db_record = (
+            session
+            .query(DB_Record)
+            .filter_by(steamid64=steamid)
+            .order_by(DB_Record.seen_at.desc())
+            .first()
+        )
 
-                db_record = DB_Record()
-                db_record.steamid64 = self.steamid
-                db_record.name = record.name
-                db_record.ip_address = record.ip_address
-                db_record.seen_at = record.seen_at
+        if db_record is None:
+            last_name = last_ip_address = ""
+        else:
+            last_name = db_record.name
+            last_ip_address = db_record.ip_address
 
-                session.add(db_record)
+        for record in records:
+            if (
+                    record.name == last_name and
+                    record.ip_address == last_ip_address
+            ):
+                continue
 
-                last_name, last_ip_address = record.name, record.ip_address
+            db_record = DB_Record()
+            db_record.steamid64 = steamid
+            db_record.name = record.name
+            db_record.ip_address = record.ip_address
+            db_record.seen_at = record.seen_at
 
-            session.commit()
+            session.add(db_record)
 
-        self.clear()
+            last_name, last_ip_address = record.name, record.ip_address
 
 
 class _TrackedPlayerDictionary(PlayerDictionary):
     def on_automatically_removed(self, index):
         tracked_player = self[index]
-        GameThread(target=tracked_player.save_to_database).start()
+        tracked_player.save_to_database()
 
 
 class _TrackRecordReport:
@@ -269,6 +331,7 @@ class _TrackPopupFeature(PlayerBasedFeature):
         self.dummy_popup.append(Text(plugin_strings['processing']))
 
         @self.record_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.clear()
 
@@ -292,6 +355,7 @@ class _TrackPopupFeature(PlayerBasedFeature):
                 ))
 
         @self.record_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             client = clients[index]
 
@@ -299,6 +363,7 @@ class _TrackPopupFeature(PlayerBasedFeature):
             client.send_popup(self.track_popup)
 
         @self.track_popup.register_build_callback
+        @profiled
         def build_callback(popup, index):
             popup.title = plugin_strings['record_title'].tokenized(
                 id=self._selected_records[index][0],
@@ -330,27 +395,35 @@ class _TrackPopupFeature(PlayerBasedFeature):
             ))
 
         @self.track_popup.register_select_callback
+        @profiled
         def select_callback(popup, index, option):
             client = clients[index]
             if option.value[0] == _TrackPopupOption.SEARCH_BY_IP:
                 client.send_popup(self.dummy_popup)
 
-                GameThread(
-                    target=self._show_players_for_ip_address,
-                    args=(client, option.value[1], )
-                ).start()
+                self._show_players_for_ip_address(client, option.value[1])
 
-    def _show_records_for_steamid(self, client, steamid):
-        self._records_to_show = _get_records_for_steamid(steamid)
+    def _show_records(self, client, records):
+        # The admin might have left while the records were being loaded
+        if clients.get(client.player.index) is not client:
+            return
+
+        self._records_to_show = records
         _last_shown_records[client.player.index] = self._records_to_show[:]
 
         client.send_popup(self.record_popup)
 
+    def _show_records_for_steamid(self, client, steamid):
+        def callback(records):
+            self._show_records(client, records)
+
+        _get_records_for_steamid(steamid, callback)
+
     def _show_players_for_ip_address(self, client, ip_address):
-        self._records_to_show = _get_records_for_ip_address(ip_address)
-        _last_shown_records[client.player.index] = self._records_to_show[:]
+        def callback(records):
+            self._show_records(client, records)
 
-        client.send_popup(self.record_popup)
+        _get_records_for_ip_address(ip_address, callback)
 
     def execute(self, client, player):
         if (
@@ -364,10 +437,7 @@ class _TrackPopupFeature(PlayerBasedFeature):
 
         client.send_popup(self.dummy_popup)
 
-        GameThread(
-            target=self._show_records_for_steamid,
-            args=(client, player.steamid)
-        ).start()
+        self._show_records_for_steamid(client, player.steamid)
 
 # The singleton object of the _TrackPopupFeature class.
 track_popup_feature = _TrackPopupFeature()
@@ -381,6 +451,10 @@ class _TrackPopupMenuCommand(PlayerBasedMenuCommand):
 class _TextReportsMixin:
     @classmethod
     def _show_records(cls, client, message_func, records, start, end):
+        # The admin might have left while the records were being loaded
+        if clients.get(client.player.index) is not client:
+            return
+
         if records:
             message_func(plugin_strings['result_count'].tokenized(
                 count=len(records), start=start, end=end))
@@ -411,17 +485,19 @@ class _TextReportsMixin:
 
         limit = int(plugin_config['text']['records_to_show_per_request'])
 
+        def callback(records):
+            records = records[start_record_num-1:start_record_num+limit-1]
+
+            cls._show_records(
+                client, message_func, records, start_record_num,
+                min(start_record_num + len(records),
+                    start_record_num + limit) - 1
+            )
+
         try:
-            records = _get_records_for_steamid(steamid)[
-                      start_record_num-1:start_record_num+limit-1]
+            _get_records_for_steamid(steamid, callback)
         except ValueError:
             message_func(plugin_strings['invalid_steamid'])
-            return
-
-        cls._show_records(
-            client, message_func, records, start_record_num,
-            min(start_record_num + len(records), start_record_num + limit) - 1
-        )
 
     @classmethod
     def _show_records_for_ip_address(
@@ -429,13 +505,16 @@ class _TextReportsMixin:
 
         limit = int(plugin_config['text']['records_to_show_per_request'])
 
-        records = _get_records_for_ip_address(ip_address)[
-                  start_record_num - 1:start_record_num + limit - 1]
+        def callback(records):
+            records = records[start_record_num-1:start_record_num+limit-1]
 
-        cls._show_records(
-            client, message_func, records, start_record_num,
-            min(start_record_num + len(records), start_record_num + limit) - 1
-        )
+            cls._show_records(
+                client, message_func, records, start_record_num,
+                min(start_record_num + len(records),
+                    start_record_num + limit) - 1
+            )
+
+        _get_records_for_ip_address(ip_address, callback)
 
 
 class _TrackSteamIDTextFeature(_TextReportsMixin, BasePlayerBasedFeature):
@@ -450,10 +529,8 @@ class _TrackSteamIDTextFeature(_TextReportsMixin, BasePlayerBasedFeature):
     def execute(self, client, message_func, steamid, start_record_num):
         message_func(plugin_strings['processing'])
 
-        GameThread(
-            target=self._show_records_for_steamid,
-            args=(client, message_func, steamid, start_record_num)
-        ).start()
+        self._show_records_for_steamid(
+            client, message_func, steamid, start_record_num)
 
 # The singleton object of the _TrackSteamIDTextFeature class.
 track_steamid_text_feature = _TrackSteamIDTextFeature()
@@ -512,10 +589,8 @@ class _TrackIPAddressTextFeature(_TextReportsMixin, BaseFeature):
     def execute(self, client, message_func, ip_address, start_record_num):
         message_func(plugin_strings['processing'])
 
-        GameThread(
-            target=self._show_records_for_ip_address,
-            args=(client, message_func, ip_address, start_record_num)
-        ).start()
+        self._show_records_for_ip_address(
+            client, message_func, ip_address, start_record_num)
 
 # The singleton object of the _TrackIPAddressTextFeature class.
 track_ip_address_text_feature = _TrackIPAddressTextFeature()
@@ -739,6 +814,7 @@ _remove_old_database_records()
 # >> LISTENERS
 # =============================================================================
 @OnClientActive
+@profiled
 def listener_on_client_active(index):
     tracked_player = tracked_players[index]
     tracked_player.track()
@@ -748,6 +824,7 @@ def listener_on_client_active(index):
 # >> EVENTS
 # =============================================================================
 @Event('player_changename')
+@profiled
 def on_player_changename(ev):
     tracked_player = tracked_players.from_userid(ev['userid'])
     tracked_player.track(ev['newname'])
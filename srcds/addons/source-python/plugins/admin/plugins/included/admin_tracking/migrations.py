@@ -0,0 +1,44 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Admin
+from admin.core.migrations import (
+    create_index, drop_index, Migration, migration_manager)
+
+# Included Plugin
+from .models import TrackedPlayerRecord
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+TABLE_NAME = TrackedPlayerRecord.__tablename__
+
+
+# =============================================================================
+# >> MIGRATIONS
+# =============================================================================
+@migration_manager.register
+class _AddIndexes(Migration):
+    scope = "admin_tracking"
+    version = 1
+
+    def upgrade(self, connection):
+        create_index(
+            connection, TABLE_NAME, 'ix_' + TABLE_NAME + '_seen_at',
+            'seen_at')
+
+        create_index(
+            connection, TABLE_NAME, 'ix_' + TABLE_NAME + '_steamid64_seen_at',
+            'steamid64', 'seen_at', descending=('seen_at', ))
+
+        create_index(
+            connection, TABLE_NAME,
+            'ix_' + TABLE_NAME + '_ip_address_seen_at',
+            'ip_address', 'seen_at', descending=('seen_at', ))
+
+    def downgrade(self, connection):
+        for suffix in (
+                '_seen_at', '_steamid64_seen_at', '_ip_address_seen_at'):
+
+            drop_index(connection, TABLE_NAME, 'ix_' + TABLE_NAME + suffix)
@@ -2,7 +2,7 @@
 # >> IMPORTS
 # =============================================================================
 # Site-Package
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 
 # Source.Python Admin
 from admin.core.config import config
@@ -19,4 +19,15 @@ class TrackedPlayerRecord(Base):
     steamid64 = Column(String(32))
     name = Column(String(64))
     ip_address = Column(String(48))
-    seen_at = Column(Integer)
+    seen_at = Column(Integer, index=True)
+
+    __table_args__ = (
+        Index(
+            'ix_' + __tablename__ + '_steamid64_seen_at',
+            steamid64, seen_at.desc()
+        ),
+        Index(
+            'ix_' + __tablename__ + '_ip_address_seen_at',
+            ip_address, seen_at.desc()
+        ),
+    )
@@ -0,0 +1 @@
+"""Tests for Source.Python Admin that run outside of a game server."""
@@ -0,0 +1,23 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+import pytest
+
+# Tests
+from . import sp_stubs
+
+
+# Source.Python has to be faked before anything imports the admin package
+sp_stubs.install()
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def delays():
+    """Give the test control over pending Delay instances."""
+    sp_stubs.Delay.pending.clear()
+    yield sp_stubs
+    sp_stubs.Delay.pending.clear()
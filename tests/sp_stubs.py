@@ -0,0 +1,266 @@
+"""Minimal stand-ins for Source.Python modules.
+
+Only what the tested code actually needs is faked with working behaviour
+(delays, player dictionaries, SteamID parsing, paths). Everything else
+resolves to permissive stub classes that can be called, subclassed, used as
+decorators or context managers and return more stubs for any attribute.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+import re
+import sys
+import tempfile
+from threading import Thread
+from types import ModuleType, SimpleNamespace
+
+# Site-Package
+from path import Path
+
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+REPO_PATH = Path(__file__).parent.parent
+SP_PATH = REPO_PATH / "srcds" / "addons" / "source-python"
+PLUGINS_PATH = SP_PATH / "plugins"
+
+# Top-level Source.Python packages that get stubbed
+SP_PACKAGES = {
+    'auth', 'commands', 'config', 'core', 'engines', 'entities', 'events',
+    'filters', 'listeners', 'loggers', 'menus', 'messages', 'paths',
+    'players', 'plugins', 'steam', 'translations',
+}
+
+STEAMID64_BASE = 76561197960265728
+
+
+# =============================================================================
+# >> GENERIC STUBS
+# =============================================================================
+def _is_decorated_callback(args, kwargs):
+    return (
+        len(args) == 1 and not kwargs and callable(args[0]) and
+        not isinstance(args[0], type))
+
+
+class _StubMeta(type):
+    def __call__(cls, *args, **kwargs):
+        # Decorators (listeners, filters, commands) leave callbacks alone
+        if _is_decorated_callback(args, kwargs):
+            return args[0]
+
+        return super().__call__(*args, **kwargs)
+
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        return make_stub(name)
+
+    def __iter__(cls):
+        return iter(())
+
+
+class Stub(metaclass=_StubMeta):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        return make_stub(name)
+
+    def __call__(self, *args, **kwargs):
+        if _is_decorated_callback(args, kwargs):
+            return args[0]
+
+        return make_stub('result')()
+
+    def __getitem__(self, key):
+        return make_stub('item')()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+
+def make_stub(name):
+    return _StubMeta(name, (Stub, ), {})
+
+
+class _StubModule(ModuleType):
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        stub = make_stub(name)
+        setattr(self, name, stub)
+        return stub
+
+
+class _StubFinder(MetaPathFinder, Loader):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] not in SP_PACKAGES:
+            return None
+
+        return ModuleSpec(fullname, self, is_package=True)
+
+    def create_module(self, spec):
+        module = _StubModule(spec.name)
+        module.__path__ = []
+        return module
+
+    def exec_module(self, module):
+        pass
+
+
+# =============================================================================
+# >> WORKING FAKES
+# =============================================================================
+class Delay:
+    """Delay that only fires when the test calls fire_delays()."""
+    pending = []
+
+    def __init__(self, delay, callback, args=(), kwargs=None,
+                 cancel_on_level_end=False):
+
+        self.delay = delay
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.running = True
+
+        Delay.pending.append(self)
+
+    def cancel(self):
+        self.running = False
+
+    def __call__(self):
+        self.running = False
+        return self.callback(*self.args, **self.kwargs)
+
+
+def fire_delays():
+    """Call all running delays in order. Delays they schedule are left
+    pending."""
+    delays = list(Delay.pending)
+    Delay.pending.clear()
+
+    for delay in delays:
+        if delay.running:
+            delay()
+
+
+class Repeat:
+    def __init__(self, callback, args=(), kwargs=None,
+                 cancel_on_level_end=False):
+
+        self.callback = callback
+
+    def start(self, interval, limit=0, execute_on_start=False):
+        pass
+
+    def stop(self):
+        pass
+
+
+class GameThread(Thread):
+    pass
+
+
+class PlayerDictionary(dict):
+    def __init__(self, factory=None, *args, **kwargs):
+        super().__init__()
+        self._factory = factory
+
+    def __missing__(self, index):
+        value = self[index] = self._factory(index)
+        return value
+
+
+class SteamID:
+    """Parses the forms core.steamid doesn't handle itself."""
+    _regex = re.compile(r'^U:1:(\d+)$')
+
+    def __init__(self, account_id):
+        self.account_id = account_id
+
+    @classmethod
+    def parse(cls, steamid):
+        match = cls._regex.match(steamid)
+        if match is None:
+            raise ValueError("Invalid SteamID: {}".format(steamid))
+
+        return cls(int(match.group(1)))
+
+    def to_uint64(self):
+        return STEAMID64_BASE + self.account_id
+
+
+class _CommandManager:
+    """Replaces admin.core.plugins.command, which loads sub-plugins."""
+    def server_sub_command(self, commands):
+        return lambda callback: callback
+
+
+# =============================================================================
+# >> INSTALLATION
+# =============================================================================
+def _set_module_attrs(name, **attrs):
+    module = __import__(name, fromlist=['*'])
+    for attr_name, value in attrs.items():
+        setattr(module, attr_name, value)
+
+
+def install():
+    """Make Source.Python and the admin package importable."""
+    sys.meta_path.insert(0, _StubFinder())
+    sys.path.insert(0, str(PLUGINS_PATH))
+
+    temp_path = Path(tempfile.mkdtemp(prefix="spa_tests_"))
+
+    _set_module_attrs(
+        'paths',
+        CFG_PATH=REPO_PATH / "srcds" / "cfg" / "source-python",
+        GAME_PATH=temp_path,
+        LOG_PATH=temp_path / "logs",
+        PLUGIN_DATA_PATH=temp_path / "data",
+        PLUGIN_PATH=PLUGINS_PATH,
+        SOUND_PATH=temp_path / "sound",
+        TRANSLATION_PATH=SP_PATH.parent.parent / "resource" / "source-python" /
+        "translations",
+    )
+    (temp_path / "data" / "admin").makedirs_p()
+
+    _set_module_attrs('listeners.tick', Delay=Delay, Repeat=Repeat,
+                      GameThread=GameThread)
+    # An empty server
+    _set_module_attrs(
+        'engines.server', global_vars=SimpleNamespace(max_clients=0))
+    _set_module_attrs('players.dictionary', PlayerDictionary=PlayerDictionary)
+    _set_module_attrs('steam', SteamID=SteamID)
+    _set_module_attrs(
+        'plugins.manager',
+        plugin_manager=SimpleNamespace(
+            get_plugin_info=lambda name: SimpleNamespace(
+                name="admin", version="tests", author="tests")))
+
+    # Sub-plugin discovery needs a real server, so skip it
+    command_module = ModuleType('admin.core.plugins.command')
+    command_module.admin_command_manager = _CommandManager()
+    sys.modules['admin.core.plugins.command'] = command_module
+
+    strings_module = ModuleType('admin.core.plugins.strings')
+    strings_module.PluginStrings = make_stub('PluginStrings')
+    sys.modules['admin.core.plugins.strings'] = strings_module
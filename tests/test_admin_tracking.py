@@ -0,0 +1,66 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import importlib
+from types import SimpleNamespace
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.executor import executor
+from admin.core.orm import Base, engine
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture(scope='module')
+def admin_tracking():
+    # The plugin cleans up old records on load, so its table must exist
+    importlib.import_module(
+        'admin.plugins.included.admin_tracking.models')
+
+    Base.metadata.create_all(engine)
+
+    return importlib.import_module(
+        'admin.plugins.included.admin_tracking.admin_tracking')
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_failed_db_read_still_calls_back(admin_tracking, monkeypatch):
+    def broken_read(steamid64):
+        raise RuntimeError("MySQL server has gone away")
+
+    monkeypatch.setattr(
+        admin_tracking, '_get_db_records_for_steamid', broken_read)
+
+    results = []
+    admin_tracking._get_records_for_steamid("[U:1:2]", results.append)
+
+    executor.stop()
+    executor.process_completions()
+
+    assert results == [[]]
+
+
+def test_records_arriving_after_the_admin_left_are_dropped(
+        admin_tracking, monkeypatch):
+
+    popups = []
+    client = SimpleNamespace(
+        player=SimpleNamespace(index=5), send_popup=popups.append)
+
+    monkeypatch.setattr(admin_tracking, 'clients', {5: client})
+    monkeypatch.setattr(admin_tracking, '_last_shown_records', {})
+    admin_tracking.track_popup_feature._show_records(client, [])
+    assert popups == [admin_tracking.track_popup_feature.record_popup]
+
+    # The admin has disconnected while the records were being loaded
+    popups.clear()
+    monkeypatch.setattr(admin_tracking, 'clients', {})
+    admin_tracking.track_popup_feature._show_records(client, [])
+    assert popups == []
@@ -0,0 +1,101 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from sys import intern
+import tracemalloc
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.steamid import STEAMID64_BASE
+from admin.plugins.included.admin_kick_ban.bans.base import _BannedPlayerInfo
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+BANS_NUMBER = 20000
+ADMINS_NUMBER = 20
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+class _LegacyBannedPlayerInfo:
+    """The record layout that was used before the cache got keyed by ints:
+    a plain object with an attribute dict."""
+    def __init__(self, uniqueid, id_, name, banned_by, reviewed, expires_at,
+                 reason, notes):
+
+        self.uniqueid = uniqueid
+        self.id = id_
+        self.name = name
+        self.banned_by = banned_by
+        self.reviewed = reviewed
+        self.expires_at = expires_at
+        self.reason = reason
+        self.notes = notes
+
+
+def _iter_rows():
+    """Yield rows the way the database driver returns them: every string is
+    a separate object."""
+    for x in range(BANS_NUMBER):
+        yield (
+            str(STEAMID64_BASE + x), x, "Player {}".format(x),
+            str(STEAMID64_BASE + 10 ** 6 + x % ADMINS_NUMBER), True, -1,
+        )
+
+
+def _build_legacy_cache():
+    cache = {}
+    for uniqueid, id_, name, banned_by, reviewed, expires_at in _iter_rows():
+        cache[uniqueid] = _LegacyBannedPlayerInfo(
+            uniqueid, id_, name, banned_by, reviewed, expires_at, "", "")
+
+    return cache
+
+
+def _build_cache():
+    cache = {}
+    for uniqueid, id_, name, banned_by, reviewed, expires_at in _iter_rows():
+        uniqueid = int(uniqueid)
+        cache[uniqueid] = _BannedPlayerInfo(
+            uniqueid, id_, name, intern(banned_by), reviewed, expires_at)
+
+    return cache
+
+
+def _get_traced_size(build):
+    """Return how many bytes the object returned by build keeps allocated.
+    """
+    tracemalloc.start()
+    try:
+        result = build()
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_int_keyed_slotted_cache_is_smaller():
+    legacy_size = _get_traced_size(_build_legacy_cache)
+    size = _get_traced_size(_build_cache)
+
+    assert size < legacy_size * 0.75
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+@pytest.mark.parametrize('build', [_build_legacy_cache, _build_cache])
+def test_benchmark_cache_memory(benchmark, build):
+    benchmark.extra_info['traced_bytes'] = _get_traced_size(build)
+    benchmark.extra_info['bytes_per_ban'] = (
+        benchmark.extra_info['traced_bytes'] / BANS_NUMBER)
+
+    benchmark.pedantic(build, rounds=3)
@@ -0,0 +1,127 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import tracemalloc
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.executor import executor
+from admin.core.steamid import STEAMID64_BASE
+from admin.plugins.included.admin_kick_ban.bans import base, steamid
+from admin.plugins.included.admin_kick_ban.bans.base import _BannedPlayerInfo
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+BANS_NUMBER = 5000
+DETAILS_LENGTH = 1000
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def _wait_for_callbacks():
+    executor.stop()
+
+    # Completions are processed within a tick budget, take as many ticks as
+    # needed
+    while executor._completions:
+        executor.process_completions()
+
+
+def _fetch_ban_details(ban_id):
+    return "r" * DETAILS_LENGTH + str(ban_id), "n" * DETAILS_LENGTH
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def manager(monkeypatch):
+    manager = steamid._BannedSteamIDManager()
+    monkeypatch.setattr(manager, '_fetch_ban_details', _fetch_ban_details)
+
+    for x in range(BANS_NUMBER):
+        manager[STEAMID64_BASE + x] = _BannedPlayerInfo(
+            STEAMID64_BASE + x, x, "Player", "76561197960265729", True, -1)
+
+    return manager
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_details_are_loaded_in_the_background(manager):
+    results = []
+    manager.load_ban_details(manager.get_ban_by_id(7), (
+        lambda reason, notes: results.append((reason, notes))))
+
+    # The callback is only called in the game thread
+    assert results == []
+
+    _wait_for_callbacks()
+
+    assert results == [_fetch_ban_details(7)]
+
+
+def test_loaded_details_are_remembered(manager, monkeypatch):
+    manager.load_ban_details(manager.get_ban_by_id(7), lambda *args: None)
+    _wait_for_callbacks()
+
+    def fail(ban_id):
+        raise AssertionError("Details were fetched again")
+
+    monkeypatch.setattr(manager, '_fetch_ban_details', fail)
+
+    results = []
+    manager.load_ban_details(manager.get_ban_by_id(7), (
+        lambda reason, notes: results.append(reason)))
+
+    assert results == [_fetch_ban_details(7)[0]]
+
+
+def test_failed_load_gives_empty_details(manager, monkeypatch):
+    def fail(ban_id):
+        raise RuntimeError("MySQL server has gone away")
+
+    monkeypatch.setattr(manager, '_fetch_ban_details', fail)
+
+    results = []
+    manager.load_ban_details(manager.get_ban_by_id(7), (
+        lambda reason, notes: results.append((reason, notes))))
+
+    _wait_for_callbacks()
+
+    assert results == [("", "")]
+
+
+def test_details_memory_is_bounded(manager):
+    """Regression test: shown reasons and notes must not pile up in memory.
+    """
+    tracemalloc.start()
+    try:
+        for x in range(BANS_NUMBER):
+            manager.load_ban_details(
+                manager.get_ban_by_id(x), lambda *args: None)
+
+            # Don't let the completion queue grow
+            if x % 100 == 99:
+                _wait_for_callbacks()
+
+        _wait_for_callbacks()
+        details_size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert len(manager._ban_details) == base.BAN_DETAILS_CACHE_SIZE
+    assert all(
+        banned_player_info.reason is None
+        for banned_player_info in manager.values())
+
+    # Only the cached details may stay, plus some slack for the bookkeeping
+    assert details_size < (
+        base.BAN_DETAILS_CACHE_SIZE * DETAILS_LENGTH * 2 * 1.5 + 256 * 1024)
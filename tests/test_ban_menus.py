@@ -0,0 +1,122 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from types import SimpleNamespace
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.executor import executor
+from admin.plugins.included.admin_kick_ban.bans import base
+from admin.plugins.included.admin_kick_ban.bans.base import (
+    _BannedPlayerInfo, RemoveBadBanMenuCommand)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+BANS_NUMBER = 120
+PLAYER_INDEX = 3
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def _wait_for_callbacks():
+    executor.stop()
+
+    # Completions are processed within a tick budget, take as many ticks as
+    # needed
+    while executor._completions:
+        executor.process_completions()
+
+
+class _FakeBanManager:
+    def __init__(self):
+        self.queries = []
+        self.bans = [
+            _BannedPlayerInfo(x, x, "Player", "76561197960265729", False, 0)
+            for x in range(1, BANS_NUMBER + 1)
+        ]
+
+    def get_all_bans(self, after_id=None, limit=None, **kwargs):
+        self.queries.append('page')
+        bans = [ban for ban in self.bans if after_id is None or
+                ban.id > after_id]
+
+        return bans[:limit]
+
+    def count_all_bans(self, **kwargs):
+        self.queries.append('count')
+        return len(self.bans)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.player = SimpleNamespace(index=PLAYER_INDEX)
+        self.popups = []
+
+    def send_popup(self, popup):
+        self.popups.append(popup)
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def menu_command():
+    feature = SimpleNamespace(banned_uniqueid_manager=_FakeBanManager())
+    return RemoveBadBanMenuCommand(feature, None, "Remove Bad Ban")
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_page_and_count_are_loaded_once(menu_command):
+    client = _FakeClient()
+    menu_command.select(client)
+
+    # Nothing is queried or sent from the game thread
+    assert client.popups == []
+
+    _wait_for_callbacks()
+
+    bans, count = menu_command._ban_pages[PLAYER_INDEX]
+    assert len(bans) == base.BAN_LIST_PAGE_SIZE
+    assert count == BANS_NUMBER
+    assert client.popups == [menu_command.ban_popup]
+    assert sorted(menu_command.feature.banned_uniqueid_manager.queries) == [
+        'count', 'page']
+
+
+def test_next_page_keeps_the_count(menu_command):
+    client = _FakeClient()
+    menu_command.select(client)
+    _wait_for_callbacks()
+
+    manager = menu_command.feature.banned_uniqueid_manager
+    manager.queries.clear()
+
+    last_id = menu_command._ban_pages[PLAYER_INDEX][0][-1].id
+    menu_command._page_starts[PLAYER_INDEX] += (last_id, )
+    menu_command._load_ban_page(client)
+    _wait_for_callbacks()
+
+    bans, count = menu_command._ban_pages[PLAYER_INDEX]
+    assert bans[0].id == last_id + 1
+    assert count == BANS_NUMBER
+    assert manager.queries == ['page']
+
+
+def test_stale_page_is_dropped(menu_command):
+    client = _FakeClient()
+    menu_command.select(client)
+
+    # The admin switches pages (or leaves) before the page arrives
+    del menu_command._page_starts[PLAYER_INDEX]
+    _wait_for_callbacks()
+
+    assert PLAYER_INDEX not in menu_command._ban_pages
+    assert client.popups == []
@@ -0,0 +1,44 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Source.Python Admin
+from admin.core import clients
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+class _AllowConnect:
+    def __init__(self, value):
+        self.value = value
+
+    def get_bool(self):
+        return self.value
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_client_is_registered_on_connect(monkeypatch):
+    monkeypatch.setattr(clients, 'index_from_edict', lambda edict: edict)
+
+    clients.listener_on_client_connect(
+        _AllowConnect(True), 7, "Player", "10.0.0.7:27005", None, 0)
+
+    try:
+        assert 7 in clients.connected_clients
+        assert clients.connected_clients.get_indexes_by_ip_address(
+            "10.0.0.7") == (7, )
+    finally:
+        clients.listener_on_client_disconnect(7)
+
+    assert 7 not in clients.connected_clients
+
+
+def test_already_rejected_client_is_not_registered(monkeypatch):
+    monkeypatch.setattr(clients, 'index_from_edict', lambda edict: edict)
+
+    clients.listener_on_client_connect(
+        _AllowConnect(False), 8, "Player", "10.0.0.8:27005", None, 0)
+
+    assert 8 not in clients.connected_clients
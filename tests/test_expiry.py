@@ -0,0 +1,135 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core import expiry
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def clock(monkeypatch):
+    class _Clock:
+        now = 1000.0
+
+        def __call__(self):
+            return self.now
+
+    clock = _Clock()
+    monkeypatch.setattr(expiry, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def scheduler(delays, clock):
+    return expiry._ExpiryScheduler()
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_callbacks_are_called_in_order(delays, clock, scheduler):
+    called = []
+    scheduler.schedule(1020, called.append, ("second", ))
+    scheduler.schedule(1010, called.append, ("first", ))
+    scheduler.schedule(1030, called.append, ("third", ))
+
+    clock.now = 1025
+    delays.fire_delays()
+
+    assert called == ["first", "second"]
+
+    clock.now = 1031
+    scheduler._expire()
+
+    assert called == ["first", "second", "third"]
+    assert len(scheduler) == 0
+
+
+def test_entry_is_not_expired_at_its_own_timestamp(delays, clock, scheduler):
+    called = []
+    scheduler.schedule(1010, called.append, (1, ))
+
+    clock.now = 1010
+    scheduler._expire()
+
+    assert called == []
+
+
+def test_cancelled_entry_is_skipped(delays, clock, scheduler):
+    called = []
+    entry = scheduler.schedule(1010, called.append, (1, ))
+    scheduler.cancel(entry)
+
+    clock.now = 1020
+    delays.fire_delays()
+
+    assert called == []
+
+
+def test_single_delay_for_earliest_entry(delays, clock, scheduler):
+    scheduler.schedule(1020, print)
+    scheduler.schedule(1030, print)
+
+    running = [delay for delay in delays.Delay.pending if delay.running]
+    assert len(running) == 1
+    assert running[0].delay == pytest.approx(20 + expiry.EXPIRY_MARGIN)
+
+    scheduler.schedule(1010, print)
+
+    running = [delay for delay in delays.Delay.pending if delay.running]
+    assert len(running) == 1
+    assert running[0].delay == pytest.approx(10 + expiry.EXPIRY_MARGIN)
+
+
+def test_failing_callback_doesnt_stop_the_others(delays, clock, scheduler):
+    called = []
+
+    def fail():
+        raise RuntimeError
+
+    scheduler.schedule(1010, fail)
+    scheduler.schedule(1011, called.append, (1, ))
+
+    clock.now = 1020
+    scheduler._expire()
+
+    assert called == [1]
+
+
+def test_heap_is_compacted_when_mostly_cancelled(delays, clock, scheduler):
+    entries = [
+        scheduler.schedule(1010 + x, print)
+        for x in range(expiry.COMPACT_MIN_SIZE * 2)
+    ]
+
+    # Cancel from the end, so that the entries don't reach the heap's top
+    for entry in reversed(entries[1:]):
+        entry.cancel()
+
+    assert len(scheduler) <= expiry.COMPACT_MIN_SIZE * 2 * (
+        1 - expiry.COMPACT_RATIO)
+
+    entries[0].cancel()
+    clock.now = 2000
+    delays.fire_delays()
+
+    assert len(scheduler) == 0
+    assert scheduler._cancelled_number == 0
+
+
+def test_compaction_keeps_pending_entries(delays, clock, scheduler):
+    called = []
+    for x in range(expiry.COMPACT_MIN_SIZE * 2):
+        entry = scheduler.schedule(1010 + x, called.append, (x, ))
+        if x % 4:
+            entry.cancel()
+
+    clock.now = 2000
+    scheduler._expire()
+
+    assert called == list(range(0, expiry.COMPACT_MIN_SIZE * 2, 4))
@@ -0,0 +1,98 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core import features
+from admin.core.metrics import metrics_registry
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def _get_calls(flag, method_name):
+    return metrics_registry.counter(
+        "feature.{}.{}.calls".format(flag, method_name)).value
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def metrics_enabled(monkeypatch):
+    monkeypatch.setattr(features, 'FEATURE_METRICS_ENABLED', True)
+
+    yield
+
+    for name in tuple(metrics_registry):
+        if name.startswith("feature.test."):
+            del metrics_registry[name]
+
+
+@pytest.fixture
+def feature_classes(metrics_enabled):
+    class _BanFeature(features.PlayerBasedFeature):
+        flag = "test.ban"
+
+        def execute(self, client, player):
+            return "banned"
+
+    class _BanRangeFeature(_BanFeature):
+        flag = "test.ban_range"
+
+    class _BanAgainFeature(_BanFeature):
+        pass
+
+    return _BanFeature, _BanRangeFeature, _BanAgainFeature
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_calls_are_counted_under_the_class_flag(feature_classes):
+    ban_feature_class, ban_range_feature_class, _ = feature_classes
+
+    assert ban_feature_class().execute(None, None) == "banned"
+    assert ban_range_feature_class().execute(None, None) == "banned"
+    assert ban_range_feature_class().execute(None, None) == "banned"
+
+    assert _get_calls("test.ban", 'execute') == 1
+    assert _get_calls("test.ban_range", 'execute') == 2
+
+
+def test_inherited_flag_is_counted_once(feature_classes):
+    _, _, ban_again_feature_class = feature_classes
+
+    ban_again_feature_class().execute(None, None)
+
+    assert _get_calls("test.ban", 'execute') == 1
+
+
+def test_methods_inherited_from_abstract_classes_are_measured(
+        feature_classes):
+
+    ban_feature_class, _, _ = feature_classes
+
+    ban_feature_class.allow_execution_on_equal_priority = True
+    ban_feature_class().filter(None, None)
+
+    assert _get_calls("test.ban", 'filter') == 1
+
+
+def test_execute_many_is_measured(metrics_enabled):
+    class _BlockFeature(features.BaseFeature):
+        flag = "test.block"
+
+        def execute(self, client, player):
+            self.execute_many(client, (player, ))
+
+        def execute_many(self, client, players):
+            pass
+
+    _BlockFeature().execute(None, None)
+    _BlockFeature().execute_many(None, ())
+
+    assert _get_calls("test.block", 'execute') == 1
+    assert _get_calls("test.block", 'execute_many') == 2
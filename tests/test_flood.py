@@ -0,0 +1,173 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.executor import executor
+from admin.core.steamid import STEAMID64_BASE
+from admin.plugins.included.admin_comm_management import flood
+from admin.plugins.included.admin_comm_management.blocks import chat
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_detector(monkeypatch, max_messages=3, window=2.0, max_repeats=2,
+                   repeat_history=4):
+
+    clock = _Clock()
+    monkeypatch.setattr(flood, 'monotonic', clock)
+
+    return flood._FloodDetector(
+        max_messages, window, max_repeats, repeat_history), clock
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_too_many_messages_within_window(monkeypatch):
+    detector, clock = _make_detector(monkeypatch)
+
+    for i in range(3):
+        assert not detector.is_flooding(1, "message {}".format(i))
+        clock.now += 0.1
+
+    assert detector.is_flooding(1, "message 3")
+
+
+def test_slow_messages_are_fine(monkeypatch):
+    detector, clock = _make_detector(monkeypatch)
+
+    for i in range(20):
+        assert not detector.is_flooding(1, "message {}".format(i))
+        clock.now += 1.0
+
+
+def test_repeated_messages(monkeypatch):
+    detector, clock = _make_detector(monkeypatch)
+
+    assert not detector.is_flooding(1, "spam")
+    clock.now += 10
+    assert not detector.is_flooding(1, "  SPAM ")
+    clock.now += 10
+    assert detector.is_flooding(1, "Spam")
+
+
+def test_repeats_leave_the_history(monkeypatch):
+    detector, clock = _make_detector(monkeypatch)
+
+    for message in ("spam", "a", "spam", "b", "c", "d", "spam", "e"):
+        assert not detector.is_flooding(1, message)
+        clock.now += 10
+
+
+def test_players_are_tracked_separately(monkeypatch):
+    detector, clock = _make_detector(monkeypatch)
+
+    for index in range(1, 5):
+        assert not detector.is_flooding(index, "hello")
+        assert not detector.is_flooding(index, "hello")
+
+
+def test_reset(monkeypatch):
+    detector, clock = _make_detector(monkeypatch)
+
+    detector.is_flooding(1, "spam")
+    detector.is_flooding(1, "spam")
+    detector.reset(1)
+
+    assert not detector.is_flooding(1, "spam")
+
+
+@pytest.mark.parametrize('max_messages, repeat_history', [
+    (0, 4),
+    (3, 0),
+    (-2, -5),
+])
+def test_ring_sizes_below_one_are_raised(
+        monkeypatch, max_messages, repeat_history):
+
+    detector, clock = _make_detector(
+        monkeypatch, max_messages=max_messages,
+        repeat_history=repeat_history)
+
+    assert detector.max_messages >= 1
+    assert detector.repeat_history >= 1
+
+    for i in range(5):
+        detector.is_flooding(1, "message")
+        clock.now += 10
+
+
+def test_flooding_player_is_blocked_once(monkeypatch):
+    futures = []
+
+    def save_block_to_database(blocked_by, steamid, name, duration):
+        futures.append(Future())
+        return futures[-1]
+
+    monkeypatch.setattr(
+        chat.blocked_chat_user_manager, 'save_block_to_database',
+        save_block_to_database)
+
+    monkeypatch.setattr(chat, 'clients', {1: SimpleNamespace(
+        name="Player", steamid=str(STEAMID64_BASE + 1),
+        has_permission=lambda permission: False)})
+
+    monkeypatch.setattr(chat, 'log_admin_action', lambda message: None)
+    monkeypatch.setattr(chat, '_pending_flood_blocks', set())
+
+    # The player keeps flooding before the block gets written
+    chat._block_flooding_player(1)
+    chat._block_flooding_player(1)
+    assert len(futures) == 1
+
+    futures[0].set_result(None)
+    executor.process_completions()
+    assert not chat._pending_flood_blocks
+
+    chat._block_flooding_player(1)
+    assert len(futures) == 2
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+@pytest.mark.parametrize('repeat_history', [6, 600])
+def test_benchmark_message_cost(benchmark, monkeypatch, repeat_history):
+    detector, clock = _make_detector(
+        monkeypatch, max_messages=5, window=3.0, max_repeats=3,
+        repeat_history=repeat_history)
+
+    messages = ["chat line number {}".format(i) for i in range(1000)]
+    state = {'i': 0}
+
+    def check_message():
+        i = state['i'] = state['i'] + 1
+        clock.now += 1.0
+        return detector.is_flooding(1 + i % 64, messages[i % 1000])
+
+    # Fill the rings, so that the steady state (with evictions) is measured
+    for i in range(repeat_history * 64):
+        check_message()
+
+    benchmark(check_message)
+
+    # The cost doesn't depend on the history length, and stays within a
+    # few microseconds per chat line
+    if benchmark.stats is not None:
+        assert benchmark.stats.stats.mean < 20e-6
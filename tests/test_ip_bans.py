@@ -0,0 +1,156 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from ipaddress import ip_network
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.clients import connected_clients
+from admin.plugins.included.admin_kick_ban.bans import ip_address
+from admin.plugins.included.admin_kick_ban.bans.base import _BannedPlayerInfo
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+RANGES_NUMBER = 100000
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+class _AllowConnect:
+    def __init__(self):
+        self.value = True
+
+    def get_bool(self):
+        return self.value
+
+    def set_bool(self, value):
+        self.value = value
+
+
+class _RejectMessage:
+    value = None
+
+    def set_string_array(self, value):
+        self.value = value
+
+
+def _ban(manager, uniqueid, id_):
+    manager[uniqueid] = _BannedPlayerInfo(
+        uniqueid, id_, "Player", "76561197960265729", True, -1)
+
+
+def _get_ip_range(x):
+    # 1.0.0.0/24, 1.0.1.0/24, ...
+    return str(ip_network(((1 << 24) + (x << 8), 24)))
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def manager():
+    return ip_address._BannedIPAddressManager()
+
+
+@pytest.fixture(scope='module')
+def crowded_manager():
+    manager = ip_address._BannedIPAddressManager()
+    for x in range(RANGES_NUMBER):
+        _ban(manager, _get_ip_range(x), x)
+
+    return manager
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_exact_ban(manager):
+    _ban(manager, "10.0.0.1", 1)
+
+    assert manager.is_banned("10.0.0.1")
+    assert not manager.is_banned("10.0.0.2")
+
+
+def test_range_ban_covers_its_addresses(manager):
+    _ban(manager, "10.0.0.0/24", 1)
+
+    assert manager.is_banned("10.0.0.1")
+    assert manager.is_banned("10.0.0.0/24")
+    assert not manager.is_banned("10.0.1.1")
+
+
+def test_range_inside_a_banned_range_is_banned(manager):
+    _ban(manager, "1.2.0.0/16", 1)
+
+    assert manager.is_banned("1.2.3.0/24")
+    assert not manager.is_banned("1.0.0.0/8")
+
+
+def test_lifted_range_ban_no_longer_matches(manager):
+    _ban(manager, "2001:db8::/64", 1)
+    assert manager.is_banned("2001:db8::1")
+
+    del manager["2001:db8::/64"]
+    assert not manager.is_banned("2001:db8::1")
+
+
+def test_range_key_is_normalized(manager):
+    assert manager._convert_uniqueid_to_key("10.0.0.7/24") == "10.0.0.0/24"
+
+
+def test_connect_of_unbanned_address_is_allowed(monkeypatch, manager):
+    _ban(manager, "10.0.0.0/24", 1)
+    monkeypatch.setattr(ip_address, 'banned_ip_address_manager', manager)
+
+    allow_connect = _AllowConnect()
+    ip_address.listener_on_client_connect(
+        allow_connect, 1, "Player", "10.0.1.1:27005", None, 0)
+
+    assert allow_connect.value
+
+
+def test_rejected_client_is_forgotten(monkeypatch, manager):
+    _ban(manager, "10.0.0.1", 1)
+    monkeypatch.setattr(ip_address, 'banned_ip_address_manager', manager)
+    monkeypatch.setattr(ip_address, 'index_from_edict', lambda edict: edict)
+
+    # The core listener has already registered the client
+    connected_clients.on_client_connect(5, "10.0.0.1")
+
+    allow_connect = _AllowConnect()
+    ip_address.listener_on_client_connect(
+        allow_connect, 5, "Player", "10.0.0.1:27005", _RejectMessage(), 64)
+
+    assert not allow_connect.value
+    assert 5 not in connected_clients
+    assert connected_clients.get_indexes_by_ip_address("10.0.0.1") == ()
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+def test_benchmark_connect_not_banned(benchmark, monkeypatch, crowded_manager):
+    monkeypatch.setattr(
+        ip_address, 'banned_ip_address_manager', crowded_manager)
+
+    allow_connect = _AllowConnect()
+    benchmark(
+        ip_address.listener_on_client_connect,
+        allow_connect, 1, "Player", "200.0.0.1:27005", None, 0)
+
+    assert allow_connect.value
+
+
+@pytest.mark.parametrize('address', [
+    # Addresses from the first and the last of the range bans
+    "1.0.0.1",
+    _get_ip_range(RANGES_NUMBER - 1)[:-4] + "1",
+])
+def test_benchmark_is_banned_by_range(benchmark, crowded_manager, address):
+    assert benchmark(crowded_manager.is_banned, address)
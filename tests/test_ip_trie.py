@@ -0,0 +1,102 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from ipaddress import ip_address, ip_network
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.plugins.included.admin_kick_ban.ip_trie import IPNetworkTrie
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_most_specific_network_wins():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.0.0.0/8")] = "wide"
+    trie[ip_network("10.1.0.0/16")] = "narrow"
+
+    assert trie.get(ip_address("10.1.2.3")) == "narrow"
+    assert trie.get(ip_address("10.2.2.3")) == "wide"
+    assert trie.get(ip_address("11.0.0.1")) is None
+    assert trie.get(ip_address("11.0.0.1"), "default") == "default"
+
+
+def test_network_is_matched_by_wider_networks_only():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.0.0.0/8")] = "wide"
+    trie[ip_network("10.1.2.0/28")] = "narrow"
+
+    assert trie.get_network(ip_network("10.1.2.0/24")) == "wide"
+    assert trie.get_network(ip_network("10.1.2.0/28")) == "narrow"
+    assert trie.get_network(ip_network("10.0.0.0/7")) is None
+
+
+def test_single_address_network():
+    trie = IPNetworkTrie()
+    trie[ip_network("192.168.0.1/32")] = 1
+
+    assert trie.get(ip_address("192.168.0.1")) == 1
+    assert trie.get(ip_address("192.168.0.2")) is None
+
+
+def test_ipv4_and_ipv6_are_kept_apart():
+    trie = IPNetworkTrie()
+    trie[ip_network("0.0.0.0/0")] = 4
+    trie[ip_network("2001:db8::/32")] = 6
+
+    assert trie.get(ip_address("1.2.3.4")) == 4
+    assert trie.get(ip_address("2001:db8::1")) == 6
+    assert trie.get(ip_address("2001:db9::1")) is None
+
+
+def test_len_counts_networks():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.0.0.0/8")] = 1
+    trie[ip_network("10.0.0.0/8")] = 2
+    trie[ip_network("10.0.0.0/16")] = 3
+
+    assert len(trie) == 2
+
+
+def test_delete_keeps_wider_network():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.0.0.0/8")] = "wide"
+    trie[ip_network("10.1.0.0/16")] = "narrow"
+
+    del trie[ip_network("10.1.0.0/16")]
+
+    assert trie.get(ip_address("10.1.2.3")) == "wide"
+    assert len(trie) == 1
+
+
+def test_delete_prunes_empty_nodes():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.1.0.0/16")] = 1
+
+    del trie[ip_network("10.1.0.0/16")]
+
+    assert trie._roots[4].children == [None, None]
+
+
+def test_delete_missing_network_raises_key_error():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.0.0.0/8")] = 1
+
+    with pytest.raises(KeyError):
+        del trie[ip_network("10.1.0.0/16")]
+
+    with pytest.raises(KeyError):
+        del trie[ip_network("10.0.0.0/7")]
+
+
+def test_clear():
+    trie = IPNetworkTrie()
+    trie[ip_network("10.0.0.0/8")] = 1
+    trie.clear()
+
+    assert len(trie) == 0
+    assert trie.get(ip_address("10.0.0.1")) is None
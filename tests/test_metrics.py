@@ -0,0 +1,130 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core import metrics
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_histogram_percentiles_are_within_growth_factor():
+    histogram = metrics.Histogram()
+    for i in range(1, 1001):
+        histogram.observe(i / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.max == 1.0
+    assert histogram.mean == pytest.approx(0.5005)
+
+    for percent in (50, 90, 99):
+        expected = percent / 100
+        assert expected <= histogram.percentile(percent) < expected * 1.25
+
+
+def test_histogram_small_and_large_values():
+    histogram = metrics.Histogram(buckets_number=10)
+    histogram.observe(0)
+    histogram.observe(1e6)
+
+    assert histogram.buckets[0] == 1
+    assert histogram.buckets[-1] == 1
+    assert histogram.percentile(50) == histogram.bounds[0]
+    assert histogram.percentile(100) == 1e6
+
+
+def test_empty_histogram():
+    histogram = metrics.Histogram()
+
+    assert histogram.percentile(99) == 0.0
+    assert histogram.mean == 0.0
+
+
+def test_histogram_clear():
+    histogram = metrics.Histogram()
+    histogram.observe(1)
+    histogram.clear()
+
+    assert histogram.count == 0
+    assert not any(histogram.buckets)
+
+
+def test_counter_last_minute(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metrics, 'time', lambda: now[0])
+
+    counter = metrics.Counter()
+    counter.increment()
+    now[0] += 30
+    counter.increment(2)
+
+    assert counter.value == 3
+    assert counter.last_minute == 3
+
+    now[0] += 45
+    assert counter.last_minute == 2
+
+    now[0] += 60
+    assert counter.last_minute == 0
+    assert counter.value == 3
+    assert counter.rate_per_minute == pytest.approx(3 * 60 / 135)
+
+
+def test_registry_returns_the_same_metric():
+    registry = metrics._MetricsRegistry()
+
+    assert registry.counter("a") is registry.counter("a")
+    assert registry.histogram("b") is registry.histogram("b")
+
+
+def test_registry_gauge_is_replaced():
+    registry = metrics._MetricsRegistry()
+    registry.gauge("queue", lambda: 1)
+    registry.gauge("queue", lambda: 2)
+
+    assert registry["queue"].value == 2
+
+
+def test_snapshot(tmp_path):
+    registry = metrics._MetricsRegistry()
+    registry.counter("calls").increment(5)
+    registry.gauge("queue", lambda: 7)
+    registry.histogram("latency").observe(0.5)
+
+    path = str(tmp_path / "metrics.json")
+    registry.write_snapshot(path)
+
+    with open(path) as f:
+        snapshot = json.load(f)
+
+    assert snapshot['counters'] == {'calls': 5}
+    assert snapshot['gauges'] == {'queue': 7}
+    assert snapshot['histograms']['latency']['count'] == 1
+    assert snapshot['histograms']['latency']['sum'] == 0.5
+    assert set(snapshot['histograms']['latency']['percentiles']) == {
+        '50', '90', '99'}
+
+
+def test_clear_all_keeps_metrics():
+    registry = metrics._MetricsRegistry()
+    registry.counter("calls").increment()
+    registry.clear_all()
+
+    assert registry.counter("calls").value == 0
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+def test_benchmark_histogram_observe(benchmark):
+    benchmark(metrics.Histogram().observe, 0.000123)
+
+
+def test_benchmark_counter_increment(benchmark):
+    benchmark(metrics.Counter().increment)
@@ -0,0 +1,92 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+# Source.Python Admin
+from admin.core.migrations import create_index, migration_manager
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def _get_migration(scope, version):
+    for migration in migration_manager[scope]:
+        if migration.version == version:
+            return migration
+
+    raise LookupError(version)
+
+
+def _get_index_names(connection, table_name):
+    return set(
+        index['name'] for index in inspect(connection).get_indexes(table_name))
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def connection():
+    """Connection to a database with the comm tables as they were before
+    any migrations."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        for kind in ('chat', 'voice'):
+            connection.execute(text(
+                "CREATE TABLE spa_blocked_{}_user ("
+                "id INTEGER PRIMARY KEY, steamid64 VARCHAR(32), "
+                "name VARCHAR(64), blocked_by VARCHAR(32), "
+                "blocked_at INTEGER, expires_at INTEGER, "
+                "is_unblocked BOOLEAN, unblocked_by VARCHAR(32))".format(
+                    kind)))
+
+        yield connection
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_each_version_creates_its_own_indexes(connection):
+    table_name = 'spa_blocked_chat_user'
+
+    _get_migration('admin_comm_management', 1).upgrade(connection)
+    assert _get_index_names(connection, table_name) == {
+        'ix_spa_blocked_chat_user_steamid64',
+        'ix_spa_blocked_chat_user_expires_at',
+    }
+
+    _get_migration('admin_comm_management', 2).upgrade(connection)
+    assert 'ix_spa_blocked_chat_user_blocked_by' in _get_index_names(
+        connection, table_name)
+
+
+def test_downgrade_drops_only_its_own_indexes(connection):
+    table_name = 'spa_blocked_voice_user'
+    for version in (1, 2):
+        _get_migration('admin_comm_management', version).upgrade(connection)
+
+    _get_migration('admin_comm_management', 2).downgrade(connection)
+    assert _get_index_names(connection, table_name) == {
+        'ix_spa_blocked_voice_user_steamid64',
+        'ix_spa_blocked_voice_user_expires_at',
+    }
+
+    _get_migration('admin_comm_management', 1).downgrade(connection)
+    assert not _get_index_names(connection, table_name)
+
+
+def test_existing_index_is_kept(connection):
+    assert create_index(
+        connection, 'spa_blocked_chat_user', 'ix_test', 'steamid64')
+
+    assert not create_index(
+        connection, 'spa_blocked_chat_user', 'ix_test', 'steamid64')
+
+
+def test_index_on_missing_column_is_an_error(connection):
+    with pytest.raises(ValueError):
+        create_index(
+            connection, 'spa_blocked_chat_user', 'ix_test', 'no_such_column')
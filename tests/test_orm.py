@@ -0,0 +1,109 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from threading import Thread
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core import orm
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+class _LostConnection(Exception):
+    pass
+
+
+class _BrokenSessionContext:
+    def __enter__(self):
+        raise _LostConnection("MySQL server has gone away")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def writer():
+    writer = orm._DatabaseWriter(100)
+    yield writer
+    writer.stop()
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_results_are_delivered(writer):
+    futures = [writer.submit(lambda session, x: x * 2, x) for x in range(5)]
+
+    assert [future.result(timeout=5) for future in futures] == [
+        0, 2, 4, 6, 8]
+
+
+def test_failing_operation_doesnt_fail_the_others(writer):
+    def fail(session):
+        raise ValueError
+
+    futures = [
+        writer.submit(lambda session: 1),
+        writer.submit(fail),
+        writer.submit(lambda session: 3),
+    ]
+
+    assert futures[0].result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=5)
+
+    assert futures[2].result(timeout=5) == 3
+
+
+def test_writer_survives_failing_session(monkeypatch, writer):
+    monkeypatch.setattr(orm, 'SessionContext', _BrokenSessionContext)
+
+    future = writer.submit(lambda session: 1)
+    with pytest.raises(_LostConnection):
+        future.result(timeout=5)
+
+    monkeypatch.undo()
+
+    assert writer.submit(lambda session: 2).result(timeout=5) == 2
+
+
+@pytest.mark.filterwarnings(
+    "ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_writer_thread_is_restarted(writer):
+    def kill_thread(session):
+        raise SystemExit
+
+    writer.submit(kill_thread)
+    thread = writer._thread
+    thread.join(timeout=5)
+
+    assert writer._thread is None
+    assert writer.submit(lambda session: 2).result(timeout=5) == 2
+
+
+def test_stop_waits_for_pending_writes(writer):
+    future = writer.submit(lambda session: 1)
+    writer.stop()
+
+    assert future.result(timeout=0) == 1
+    assert writer._thread is None
+
+
+def test_exiting_thread_keeps_its_replacement(writer):
+    replacement = Thread()
+    writer._thread = replacement
+
+    # An old thread that only exits now must not forget the new one
+    writer._queue.put(None)
+    writer._run()
+
+    assert writer._thread is replacement
+    writer._thread = None
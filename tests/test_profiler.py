@@ -0,0 +1,188 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from pstats import Stats
+from threading import Thread
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core import profiler as profiler_module
+from admin.core.profiler import _Profiler, get_plugin_name
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def profiler():
+    profiler = _Profiler()
+    profiler.start()
+    return profiler
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+@pytest.mark.parametrize('module_name, plugin_name', [
+    ("admin.plugins.included.admin_kick_ban.bans.base", "admin_kick_ban"),
+    ("admin.plugins.custom.my_plugin", "my_plugin"),
+    ("admin.core.executor", "core"),
+    ("admin.plugins", "core"),
+])
+def test_get_plugin_name(module_name, plugin_name):
+    assert get_plugin_name(module_name) == plugin_name
+
+
+def test_wrapped_callback_is_recorded_per_plugin(profiler):
+    callback = profiler.wrap(
+        lambda: 42, "admin.plugins.included.admin_kick_ban.bans.base")
+
+    assert callback() == 42
+    assert callback() == 42
+
+    profiler.end_tick()
+
+    assert profiler.ticks == 1
+    assert profiler._tick_histograms['admin_kick_ban'].count == 1
+    (plugin_name, histogram), = profiler._call_histograms.values()
+    assert plugin_name == "admin_kick_ban"
+    assert histogram.count == 2
+
+
+def test_nested_calls_are_counted_once_per_tick(profiler):
+    def inner():
+        pass
+
+    def outer():
+        wrapped_inner()
+
+    wrapped_inner = profiler.wrap(inner, "admin.core")
+    outer = profiler.wrap(outer, "admin.core")
+
+    outer()
+    profiler.end_tick()
+
+    assert len(profiler._call_histograms) == 2
+    assert profiler._tick_histograms['core'].count == 1
+    assert profiler._depth == 0
+
+
+def test_exceptions_are_propagated(profiler):
+    def fail():
+        raise RuntimeError
+
+    callback = profiler.wrap(fail, "admin.core")
+    with pytest.raises(RuntimeError):
+        callback()
+
+    assert profiler._depth == 0
+
+
+def test_stopped_profiler_records_nothing(profiler):
+    callback = profiler.wrap(lambda: None, "admin.core")
+    profiler.stop()
+
+    callback()
+    profiler.end_tick()
+
+    assert profiler.ticks == 0
+    assert not profiler._call_histograms
+
+
+def test_wraps_keeps_signature(profiler):
+    def callback(command_info, duration: float):
+        pass
+
+    assert profiler.wrap(callback).__wrapped__ is callback
+
+
+def test_report(profiler):
+    profiler.wrap(lambda: None, "admin.core")()
+    profiler.end_tick()
+
+    lines = list(profiler.iter_report_lines())
+
+    assert lines[0].startswith("Profiled 1 ticks")
+    assert any(line.startswith("core") for line in lines)
+
+
+def test_report_before_start():
+    assert list(_Profiler().iter_report_lines()) == [
+        "Profiler hasn't been started"]
+
+
+def test_capture(delays, profiler):
+    def work():
+        return sum(range(100))
+
+    captured = []
+    profiler.start_capture(1, captured.extend)
+
+    assert profiler.capturing
+    assert profiler.wrap(work)() == 4950
+    assert profiler.call_captured(work) == 4950
+
+    delays.fire_delays()
+
+    assert not profiler.capturing
+    assert len(captured) == 1
+    assert Stats(*captured).total_calls > 0
+
+
+def test_capture_ignores_other_threads(delays, profiler):
+    def work():
+        return sum(range(100))
+
+    captured = []
+    profiler.start_capture(1, captured.extend)
+
+    results = []
+    thread = Thread(
+        target=lambda: results.append(profiler.call_captured(work)))
+
+    thread.start()
+    thread.join()
+
+    delays.fire_delays()
+
+    assert results == [4950]
+    assert captured == []
+
+
+def test_capture_ending_during_a_call_waits_for_it(delays, profiler):
+    captured = []
+
+    def work():
+        # The capture window ends while this call is in flight
+        delays.fire_delays()
+        assert captured == []
+        return 42
+
+    profiler.start_capture(1, captured.extend)
+
+    assert profiler.call_captured(work) == 42
+    assert not profiler.capturing
+    assert len(captured) == 1
+    assert any(
+        function_name == 'work'
+        for _, _, function_name in Stats(*captured).stats)
+
+
+def test_disabled_profiler_returns_callbacks_untouched(monkeypatch):
+    monkeypatch.setattr(profiler_module, 'PROFILER_ENABLED', False)
+
+    def callback():
+        pass
+
+    assert profiler_module.profiled(callback) is callback
+    assert profiler_module.profiled(module="admin.core")(callback) is callback
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+def test_benchmark_wrapped_callback(benchmark, profiler):
+    benchmark(profiler.wrap(lambda: None, "admin.core"))
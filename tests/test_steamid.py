@@ -0,0 +1,39 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.steamid import get_steamid64, STEAMID64_BASE
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+@pytest.mark.parametrize('steamid', [
+    "STEAM_0:1:11101",
+    "STEAM_1:1:11101",
+    "[U:1:22203]",
+    "76561197960287931",
+    76561197960287931,
+])
+def test_all_forms_give_the_same_steamid64(steamid):
+    assert get_steamid64(steamid) == STEAMID64_BASE + 22203
+
+
+def test_fallback_parser_is_used_for_other_forms():
+    assert get_steamid64("U:1:22203") == STEAMID64_BASE + 22203
+
+
+@pytest.mark.parametrize('steamid', ["", "STEAM_2:0:1", "[U:1:]", "BOT"])
+def test_invalid_steamid_raises_value_error(steamid):
+    with pytest.raises(ValueError):
+        get_steamid64(steamid)
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+def test_benchmark_cached_steamid2(benchmark):
+    benchmark(get_steamid64, "STEAM_1:1:11101")
@@ -0,0 +1,91 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import Future
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.steamid import STEAMID64_BASE
+from admin.plugins.included.admin_kick_ban.bans import steamid
+from admin.plugins.included.admin_kick_ban.bans.base import _BannedPlayerInfo
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+BANS_NUMBER = 10000
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+def _ban(manager, steamid64, id_):
+    manager[steamid64] = _BannedPlayerInfo(
+        steamid64, id_, "Player", "76561197960265729", True, -1)
+
+
+def _create_manager(bans_number):
+    manager = steamid._BannedSteamIDManager()
+    for x in range(bans_number):
+        _ban(manager, STEAMID64_BASE + x * 2, x)
+
+    return manager
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+@pytest.mark.parametrize('steamid_', [
+    "STEAM_0:0:21",
+    "STEAM_1:0:21",
+    "[U:1:42]",
+    "U:1:42",
+    "76561197960265770",
+    76561197960265770,
+])
+def test_every_form_of_a_banned_steamid_is_found(steamid_):
+    manager = _create_manager(100)
+
+    assert manager.is_banned(steamid_)
+
+
+def test_added_ban_is_found():
+    manager = _create_manager(0)
+    _ban(manager, STEAMID64_BASE + 1, 1)
+
+    assert manager.is_banned("STEAM_1:1:0")
+
+
+def test_lifted_ban_is_not_found():
+    manager = _create_manager(1)
+    del manager[STEAMID64_BASE]
+
+    assert not manager.is_banned("STEAM_1:0:0")
+
+
+def test_synced_ban_without_admin():
+    manager = _create_manager(0)
+
+    # banned_by is NULL for bans that were imported or added by hand
+    future = Future()
+    future.set_result(([
+        (str(STEAMID64_BASE), 1, "Player", None, False, -1, False),
+    ], 0))
+
+    manager._on_changes_fetched(future)
+
+    assert manager[STEAMID64_BASE].banned_by is None
+    assert manager.is_banned("STEAM_1:0:0")
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+@pytest.mark.parametrize('steamid_', ["STEAM_1:1:5", "[U:1:11]"])
+def test_benchmark_is_banned_negative(benchmark, steamid_):
+    manager = _create_manager(BANS_NUMBER)
+
+    assert not benchmark(manager.is_banned, steamid_)
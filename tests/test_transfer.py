@@ -0,0 +1,98 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Site-Package
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+# Source.Python Admin
+from admin.core.steamid import STEAMID64_BASE
+from admin.plugins.included.admin_kick_ban.bans import transfer
+from admin.plugins.included.admin_kick_ban.bans.steamid import (
+    banned_steamid_manager)
+from admin.plugins.included.admin_kick_ban.models import BannedSteamID
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    BannedSteamID.__table__.create(engine)
+
+    with Session(engine) as session:
+        yield session
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_row_is_normalized():
+    ban_type, row = transfer._normalize_row({
+        'type': 'steamid',
+        'uniqueid': "STEAM_0:1:1",
+        'banned_by': "[U:1:2]",
+        'banned_at': "100",
+        'expires_at': "",
+        'reviewed': "false",
+    })
+
+    assert ban_type == 'steamid'
+    assert row['uniqueid'] == str(STEAMID64_BASE + 3)
+    assert row['banned_by'] == str(STEAMID64_BASE + 2)
+    assert row['banned_at'] == 100
+    assert row['expires_at'] == -1
+    assert row['reviewed'] is False
+
+
+def test_zero_timestamps_are_kept():
+    ban_type, row = transfer._normalize_row({
+        'type': 'steamid',
+        'uniqueid': "STEAM_0:1:1",
+        'banned_at': 0,
+        'expires_at': "0",
+    })
+
+    assert row['banned_at'] == 0
+    assert row['expires_at'] == 0
+
+
+@pytest.mark.parametrize('raw_row', [
+    {'type': 'steamid', 'uniqueid': "BOT"},
+    {'type': 'ip_address', 'uniqueid': "300.0.0.1"},
+    {'type': 'unknown', 'uniqueid': "1.2.3.4"},
+    {'uniqueid': "1.2.3.4"},
+])
+def test_invalid_row_is_rejected(raw_row):
+    with pytest.raises((KeyError, ValueError)):
+        transfer._normalize_row(raw_row)
+
+
+def test_reimported_bans_are_skipped(session):
+    rows = [
+        transfer._normalize_row({
+            'type': 'steamid',
+            'uniqueid': STEAMID64_BASE + x,
+            'banned_at': 100,
+        })[1] for x in range(3)
+    ]
+
+    assert banned_steamid_manager._insert_bans(session, rows) == 3
+
+    # The same ban issued again later isn't a duplicate
+    rows.append(dict(rows[0], banned_at=200))
+
+    assert banned_steamid_manager._insert_bans(session, rows) == 1
+    assert session.query(BannedSteamID).count() == 4
+
+
+def test_duplicates_within_one_batch_are_skipped(session):
+    row = transfer._normalize_row({
+        'type': 'steamid',
+        'uniqueid': STEAMID64_BASE,
+        'banned_at': 100,
+    })[1]
+
+    assert banned_steamid_manager._insert_bans(session, [row, row]) == 1
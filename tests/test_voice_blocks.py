@@ -0,0 +1,174 @@
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from types import SimpleNamespace
+
+# Site-Package
+import pytest
+
+# Source.Python Admin
+from admin.core.steamid import STEAMID64_BASE
+from admin.plugins.included.admin_comm_management.blocks import voice
+from admin.plugins.included.admin_comm_management.blocks.base import (
+    _BlockedCommUserInfo)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+PLAYERS_NUMBER = 64
+
+
+# =============================================================================
+# >> HELPERS
+# =============================================================================
+class _MuteManager:
+    """Count calls and remember who is muted."""
+    def __init__(self):
+        self.calls = 0
+        self.muted = set()
+
+    def mute_player(self, index):
+        self.calls += 1
+        self.muted.add(index)
+
+    def unmute_player(self, index):
+        self.calls += 1
+        self.muted.discard(index)
+
+
+def _create_players():
+    return [
+        SimpleNamespace(index=x, steamid=str(STEAMID64_BASE + x))
+        for x in range(1, PLAYERS_NUMBER + 1)
+    ]
+
+
+def _block(manager, player):
+    steamid64 = int(player.steamid)
+    manager[steamid64] = _BlockedCommUserInfo(
+        steamid64, player.index, "Player", "76561197960265729", -1)
+
+    manager._on_change()
+
+
+def _unblock(manager, player):
+    del manager[int(player.steamid)]
+    manager._on_change()
+
+
+def _resync_everybody(manager, players, mute_manager):
+    """What every change used to cost: a call for each human player."""
+    for player in players:
+        if manager.is_blocked(player.steamid):
+            mute_manager.mute_player(player.index)
+        else:
+            mute_manager.unmute_player(player.index)
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def players(monkeypatch):
+    players = _create_players()
+    monkeypatch.setattr(voice, 'PlayerIter', lambda *args: players)
+    return players
+
+
+@pytest.fixture
+def mute_manager(monkeypatch):
+    mute_manager = _MuteManager()
+    monkeypatch.setattr(voice, 'mute_manager', mute_manager)
+    return mute_manager
+
+
+@pytest.fixture
+def manager(players, mute_manager):
+    return voice._BlockedVoiceUserManager()
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_block_mutes_only_the_blocked_player(manager, players, mute_manager):
+    _block(manager, players[5])
+
+    assert mute_manager.muted == {players[5].index}
+    assert mute_manager.calls == 1
+
+
+def test_unblock_unmutes_only_the_unblocked_player(
+        manager, players, mute_manager):
+
+    _block(manager, players[5])
+    _block(manager, players[6])
+    _unblock(manager, players[5])
+
+    assert mute_manager.muted == {players[6].index}
+    assert mute_manager.calls == 3
+
+
+def test_unrelated_change_costs_nothing(manager, players, mute_manager):
+    _block(manager, players[5])
+    manager._on_change()
+
+    assert mute_manager.calls == 1
+
+
+def test_activated_player_is_muted(manager, players, mute_manager):
+    _block(manager, players[5])
+    mute_manager.muted.clear()
+    manager._muted_indexes.clear()
+
+    manager.on_player_activated(players[5])
+    manager.on_player_activated(players[6])
+
+    assert mute_manager.muted == {players[5].index}
+
+
+def test_disconnected_player_is_unmuted(manager, players, mute_manager):
+    _block(manager, players[5])
+    manager.on_player_disconnected(players[5].index)
+
+    assert not mute_manager.muted
+
+
+def test_unmute_all(manager, players, mute_manager):
+    for player in players[:3]:
+        _block(manager, player)
+
+    manager.unmute_all()
+
+    assert not mute_manager.muted
+
+
+# =============================================================================
+# >> BENCHMARKS
+# =============================================================================
+def test_benchmark_block_and_unblock(benchmark, manager, players):
+    def block_and_unblock():
+        mute_manager = _MuteManager()
+        voice.mute_manager = mute_manager
+
+        for player in players[:8]:
+            _block(manager, player)
+
+        for player in players[:8]:
+            _unblock(manager, player)
+
+        return mute_manager.calls
+
+    calls = benchmark(block_and_unblock)
+
+    # Compare with a full resync after each of these 16 changes
+    resync_mute_manager = _MuteManager()
+    for x in range(16):
+        _resync_everybody(manager, players, resync_mute_manager)
+
+    benchmark.extra_info['mute_manager_calls'] = calls
+    benchmark.extra_info['full_resync_calls'] = resync_mute_manager.calls
+
+    assert calls == 16
+    assert resync_mute_manager.calls == 16 * PLAYERS_NUMBER